@@ -0,0 +1,89 @@
+"""
+Micro-benchmark of the --filter evaluation. Compares parsing the filter expression again for every result, as the
+FuzzResFilter did before, with evaluating the formula it compiles once.
+
+The results are synthetic and differ in their payload, status code and body, so that |unique() keeps some of them.
+
+Usage: python benchmarks/bench_complexfilter.py [--results 100000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from wenum.externals.reqresp import Response  # noqa: E402
+from wenum.filters.complexfilter import FuzzResFilter  # noqa: E402
+from wenum.fuzzobjects import FuzzResult, FPayloadManager, FuzzWord, FuzzWordType  # noqa: E402
+from wenum.fuzzrequest import FuzzRequest  # noqa: E402
+
+FILTERS = [
+    "c=200",
+    "c!=404 and (w>10 or l<3)",
+    "not (c=404 or c=403) and content~'admin'",
+    "FUZZ|lower()~'adm' or url=~'/api/v[0-9]+'",
+    "c=200 and content|u()",
+]
+
+
+def make_results(amount: int) -> list[FuzzResult]:
+    random.seed(0)
+    words = ["admin", "login", "api/v1", "backup", "static", "Admin", "config", "index"]
+    results = []
+    for i in range(amount):
+        word = f"{random.choice(words)}{i % 100}"
+        fuzz_request = FuzzRequest()
+        fuzz_request.url = f"http://example.com/{word}"
+        response = Response()
+        body = f"<html><body>{word}</body></html>\n" * random.randint(1, 8)
+        response.parse_curl_response(f"HTTP/1.1 {random.choice([200, 301, 403, 404])} X\r\n\r\n", body.encode())
+        fuzz_request._request.response = response
+        fuzz_result = FuzzResult(history=fuzz_request)
+        fuzz_result.payload_man = FPayloadManager()
+        fuzz_result.payload_man.add({"full_marker": "FUZZ", "word": "FUZZ", "index": None, "field": None},
+                                    FuzzWord(word, FuzzWordType.WORD))
+        results.append(fuzz_result)
+    return results
+
+
+def run_parsed(filter_string: str, results: list[FuzzResult]) -> tuple[float, int]:
+    ffilter = FuzzResFilter(filter_string)
+    start = time.perf_counter()
+    shown = 0
+    for fuzz_result in results:
+        ffilter.stack = []
+        if ffilter.finalformula.parseString(filter_string, parseAll=True)[0](fuzz_result):
+            shown += 1
+    return time.perf_counter() - start, shown
+
+
+def run_compiled(filter_string: str, results: list[FuzzResult]) -> tuple[float, int]:
+    ffilter = FuzzResFilter(filter_string)
+    start = time.perf_counter()
+    shown = 0
+    for fuzz_result in results:
+        if not ffilter.is_filtered(fuzz_result):
+            shown += 1
+    return time.perf_counter() - start, shown
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--results", type=int, default=100000)
+    args = parser.parse_args()
+
+    results = make_results(args.results)
+    print(f"{args.results} results")
+    print(f"{'filter':<46}{'parsed (s)':>12}{'compiled (s)':>14}{'speedup':>10}")
+    for filter_string in FILTERS:
+        parsed_time, parsed_shown = run_parsed(filter_string, results)
+        compiled_time, compiled_shown = run_compiled(filter_string, results)
+        if parsed_shown != compiled_shown:
+            raise SystemExit(f"Results differ for {filter_string}: {parsed_shown} != {compiled_shown}")
+        print(f"{filter_string:<46}{parsed_time:>12.2f}{compiled_time:>14.2f}{parsed_time / compiled_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
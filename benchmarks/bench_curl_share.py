@@ -0,0 +1,57 @@
+"""
+Shows the effect of the CurlShare the curl handles use for DNS lookups, TLS sessions and connections.
+
+wenum is run against a local stand-in HTTPS server twice: once with keep-alive, where the handles can reuse the
+shared connections, and once with a server that closes the connection after every response, which forces a new
+connection (and TLS handshake, resumed from the shared session cache) for every request. The connection statistics
+are read from the debug log of wenum.
+
+Usage: python benchmarks/bench_curl_share.py [--requests 2000] [--threads 40]
+"""
+import argparse
+import os
+import re
+import tempfile
+
+from bench_event_loop import run_wenum
+from stand_in_server import StandInServer
+
+CONNECTIONS_REGEX = re.compile(r"Connections opened: (\d+), transfers reusing a connection: (\d+)")
+
+
+def read_connection_stats(debug_log: str) -> tuple[int, int]:
+    """
+    Return the amount of opened connections and of transfers reusing a connection logged by the HttpPool
+    """
+    with open(debug_log) as log:
+        match = CONNECTIONS_REGEX.search(log.read())
+    if not match:
+        raise RuntimeError("No connection statistics in the debug log")
+    return int(match.group(1)), int(match.group(2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=40)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        wordlist = os.path.join(work_dir, "wordlist.txt")
+        with open(wordlist, "w") as wordlist_file:
+            wordlist_file.write("\n".join(f"word{i}" for i in range(args.requests)))
+
+        print(f"{args.requests} requests over TLS, {args.threads} connections")
+        print(f"{'server':<14}{'wall (s)':>10}{'req/s':>10}{'opened':>10}{'reused':>10}")
+        for name, close_connections in [("keep-alive", False), ("close", True)]:
+            server = StandInServer(tls=True, close_connections=close_connections)
+            server.start_background()
+            debug_log = os.path.join(work_dir, f"{name}.log")
+            wall_time, _ = run_wenum(server.url, wordlist, args.threads, ["-l", debug_log])
+            server.shutdown()
+            opened, reused = read_connection_stats(debug_log)
+            print(f"{name:<14}{wall_time:>10.2f}{args.requests / wall_time:>10.1f}{opened:>10}{reused:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Compares the polling loop of the HttpPool with the event loop (--event-loop) against a slow local stand-in server.
+
+For every loop, wenum is run as a subprocess on a generated wordlist. The CPU time consumed by the wenum process
+is put into relation with the wall clock time, which shows how much CPU is burned while waiting on the target.
+
+Usage: python benchmarks/bench_event_loop.py [--requests 2000] [--delay 0.2] [--threads 40]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from stand_in_server import StandInServer
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+
+def run_wenum(url: str, wordlist: str, threads: int, extra_args: list[str]) -> tuple[float, float]:
+    """
+    Run wenum against the url and return the wall clock time and the CPU time it took
+    """
+    env = dict(os.environ, PYTHONPATH=SRC_DIR)
+    command = [sys.executable, "-m", "wenum", "-u", f"{url}/FUZZ", "-w", wordlist, "-n", "-q",
+               "-t", str(threads)] + extra_args
+    start = time.monotonic()
+    process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    _, status, rusage = os.wait4(process.pid, 0)
+    wall_time = time.monotonic() - start
+    if status:
+        raise RuntimeError(f"wenum exited with status {status}")
+    return wall_time, rusage.ru_utime + rusage.ru_stime
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--delay", type=float, default=0.2, help="Response delay of the stand-in server")
+    parser.add_argument("--threads", type=int, default=40)
+    args = parser.parse_args()
+
+    server = StandInServer(delay=args.delay)
+    server.start_background()
+
+    with tempfile.NamedTemporaryFile("w", suffix=".txt") as wordlist:
+        wordlist.write("\n".join(f"word{i}" for i in range(args.requests)))
+        wordlist.flush()
+
+        print(f"{args.requests} requests, {args.threads} connections, {args.delay}s response delay")
+        print(f"{'loop':<12}{'wall (s)':>10}{'cpu (s)':>10}{'cpu/wall':>10}{'req/s':>10}")
+        for name, extra_args in [("polling", []), ("event", ["--event-loop"])]:
+            wall_time, cpu_time = run_wenum(server.url, wordlist.name, args.threads, extra_args)
+            print(f"{name:<12}{wall_time:>10.2f}{cpu_time:>10.2f}{cpu_time / wall_time:>10.0%}"
+                  f"{args.requests / wall_time:>10.1f}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Micro-benchmark of preparing a curl handle for a request, i.e. ReqRespRequestFactory.to_http_object and
+HttpPool.apply_extra_options. Compares a handle on which every option is set for every request (as if the handle was
+new) with a reused handle, on which only the options that changed since the previous request are set.
+
+Usage: python benchmarks/bench_handle_preparation.py [--iterations 50000]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import pycurl  # noqa: E402
+
+from wenum.factories.reqresp_factory import ReqRespRequestFactory  # noqa: E402
+from wenum.fuzzrequest import FuzzRequest  # noqa: E402
+from wenum.httppool import HttpPool  # noqa: E402
+
+
+def build_requests(amount: int, method: str, data: str = None) -> list[FuzzRequest]:
+    requests = []
+    for i in range(amount):
+        fuzz_request = FuzzRequest()
+        fuzz_request.url = f"http://127.0.0.1:8090/word{i}"
+        fuzz_request.headers.request = {"User-Agent": "wenum", "Accept": "*/*", "Cookie": "session=3f2a9c"}
+        fuzz_request.method = method
+        if data:
+            fuzz_request.params.post = data
+        requests.append(fuzz_request)
+    return requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50000)
+    args = parser.parse_args()
+
+    curl_h = pycurl.Curl()
+
+    def prepare(requests, reset):
+        for fuzz_request in requests:
+            if reset:
+                curl_h.applied_options = None
+            ReqRespRequestFactory.to_http_object(fuzz_request, curl_h)
+            HttpPool.apply_extra_options(curl_h, "http://127.0.0.1:8080", 40)
+
+    print(f"{'requests':<10}{'all options (us)':>18}{'delta only (us)':>18}{'speedup':>10}")
+    for name, requests in [("GET", build_requests(100, "GET")), ("POST", build_requests(100, "POST", "a=1&b=2"))]:
+        number = args.iterations // len(requests)
+        full = timeit.timeit(lambda: prepare(requests, True), number=number)
+        delta = timeit.timeit(lambda: prepare(requests, False), number=number)
+        print(f"{name:<10}{full / args.iterations * 1e6:>18.2f}{delta / args.iterations * 1e6:>18.2f}"
+              f"{full / delta:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Micro-benchmark of the response header parsing. Compares Response.parse_response, which walks the header block with
+the TextParser, with Response.parse_curl_response, which uses the single-pass header parser.
+
+Usage: python benchmarks/bench_header_parser.py [--iterations 20000]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from wenum.externals.reqresp import Response  # noqa: E402
+
+HEADER_SETS = {
+    "nginx 404": (
+        "HTTP/1.1 404 Not Found\r\n"
+        "Server: nginx/1.18.0\r\n"
+        "Date: Mon, 12 Oct 2026 10:00:00 GMT\r\n"
+        "Content-Type: text/html\r\n"
+        "Content-Length: 153\r\n"
+        "Connection: keep-alive\r\n\r\n"
+    ),
+    "100 continue": (
+        "HTTP/1.1 100 Continue\r\n\r\n"
+        "HTTP/1.1 200 OK\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        "Content-Length: 27\r\n\r\n"
+    ),
+    "proxy, cdn": (
+        "HTTP/1.1 200 Connection established\r\n\r\n"
+        "HTTP/2 200 \r\n"
+        "content-type: text/html; charset=UTF-8\r\n"
+        "cache-control: private, max-age=0\r\n"
+        "strict-transport-security: max-age=31536000; includeSubDomains\r\n"
+        "content-security-policy: default-src 'self'; script-src 'self' 'unsafe-inline' https://cdn.example.com; "
+        "img-src * data:\r\n"
+        "x-frame-options: SAMEORIGIN\r\n"
+        "x-content-type-options: nosniff\r\n"
+        "set-cookie: session=3f2a9c; Path=/; HttpOnly; Secure\r\n"
+        "set-cookie: tracking=abc123; Path=/; Max-Age=31536000\r\n"
+        "set-cookie: consent=0; Path=/\r\n"
+        "vary: Accept-Encoding, Cookie\r\n"
+        "via: 1.1 varnish\r\n"
+        "x-cache: MISS\r\n"
+        "x-served-by: cache-fra-etou8220043-FRA\r\n"
+        "age: 0\r\n"
+        "date: Mon, 12 Oct 2026 10:00:00 GMT\r\n\r\n"
+    ),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    body = b"<html><body>Not found</body></html>"
+    print(f"{'header set':<16}{'TextParser (us)':>18}{'single-pass (us)':>18}{'speedup':>10}")
+    for name, raw_header in HEADER_SETS.items():
+        response = Response()
+        old = timeit.timeit(lambda: response.parse_response(raw_header, rawbody=body), number=args.iterations)
+        new = timeit.timeit(lambda: response.parse_curl_response(raw_header, body), number=args.iterations)
+        print(f"{name:<16}{old / args.iterations * 1e6:>18.2f}{new / args.iterations * 1e6:>18.2f}"
+              f"{old / new:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
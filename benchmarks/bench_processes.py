@@ -0,0 +1,63 @@
+"""
+Compares the throughput of the in-process HttpPool with the worker processes (--processes) against a local
+stand-in server.
+
+All words of the generated wordlist hit /found, so that every response carries a body of --body-size bytes which
+has to be parsed and measured. The stand-in server runs in its own process, so that it does not compete with wenum
+for the GIL. On hosts with few cores the server itself may become the limit.
+
+Usage: python benchmarks/bench_processes.py [--requests 5000] [--body-size 20000] [--processes 1 2 4]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench_event_loop import run_wenum
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def start_server(body_size: int, port: int) -> subprocess.Popen:
+    server = subprocess.Popen([sys.executable, os.path.join(BENCHMARK_DIR, "stand_in_server.py"),
+                               "--port", str(port), "--body-size", str(body_size)],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    # Give the server a moment to bind
+    time.sleep(1)
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--body-size", type=int, default=20000, help="Size of the response bodies")
+    parser.add_argument("--threads", type=int, default=40)
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4],
+                        help="Amounts of worker processes to compare")
+    parser.add_argument("--port", type=int, default=8731)
+    args = parser.parse_args()
+
+    server = start_server(args.body_size, args.port)
+    url = f"http://127.0.0.1:{args.port}"
+
+    try:
+        with tempfile.NamedTemporaryFile("w", suffix=".txt") as wordlist:
+            wordlist.write("\n".join(f"found{i}" for i in range(args.requests)))
+            wordlist.flush()
+
+            print(f"{args.requests} requests, {args.threads} connections, {args.body_size} bytes per body, "
+                  f"{os.cpu_count()} cores")
+            print(f"{'mode':<16}{'wall (s)':>10}{'cpu (s)':>10}{'req/s':>10}")
+            runs = [("in-process", [])] + [(f"{n} processes", ["--processes", str(n)]) for n in args.processes]
+            for name, extra_args in runs:
+                wall_time, cpu_time = run_wenum(url, wordlist.name, args.threads, extra_args)
+                print(f"{name:<16}{wall_time:>10.2f}{cpu_time:>10.2f}{args.requests / wall_time:>10.1f}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Compares the throughput of the curl transport with the asyncio transport (--transport asyncio) against a local
+stand-in server.
+
+The server answers after --delay seconds, so the throughput depends on how many connections are kept busy at once.
+Each transport is run with every amount of --threads. The stand-in server runs in its own process, so that it
+does not compete with wenum for the GIL.
+
+Usage: python benchmarks/bench_transport.py [--requests 3000] [--delay 0.05] [--threads 40 400]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench_event_loop import run_wenum
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def start_server(delay: float, port: int) -> subprocess.Popen:
+    server = subprocess.Popen([sys.executable, os.path.join(BENCHMARK_DIR, "stand_in_server.py"),
+                               "--port", str(port), "--delay", str(delay)],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    # Give the server a moment to bind
+    time.sleep(1)
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--delay", type=float, default=0.05, help="Response delay of the stand-in server")
+    parser.add_argument("--threads", type=int, nargs="+", default=[40, 400],
+                        help="Amounts of concurrent connections to compare")
+    parser.add_argument("--port", type=int, default=8732)
+    args = parser.parse_args()
+
+    server = start_server(args.delay, args.port)
+    url = f"http://127.0.0.1:{args.port}"
+
+    try:
+        with tempfile.NamedTemporaryFile("w", suffix=".txt") as wordlist:
+            wordlist.write("\n".join(f"found{i}" for i in range(args.requests)))
+            wordlist.flush()
+
+            print(f"{args.requests} requests, {args.delay}s response delay, {os.cpu_count()} cores")
+            print(f"{'transport':<16}{'threads':>8}{'wall (s)':>10}{'cpu (s)':>10}{'req/s':>10}")
+            runs = [("curl", []), ("curl event loop", ["--event-loop"]), ("asyncio", ["--transport", "asyncio"])]
+            for threads in args.threads:
+                for name, extra_args in runs:
+                    wall_time, cpu_time = run_wenum(url, wordlist.name, threads, extra_args)
+                    print(f"{name:<16}{threads:>8}{wall_time:>10.2f}{cpu_time:>10.2f}"
+                          f"{args.requests / wall_time:>10.1f}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Local stand-in HTTP server used by the benchmarks. Answers every request after an optional delay, which makes it
+possible to imitate slow targets without depending on anything outside the machine.
+
+Can be started standalone, e.g. python stand_in_server.py --port 8090 --delay 0.2
+With --tls, it serves HTTPS with a throwaway self-signed certificate created with the openssl command line tool.
+"""
+import argparse
+import os
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+NOT_FOUND_BODY = b"<html><head><title>404 Not Found</title></head><body><h1>Not Found</h1></body></html>\n"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    Handles every path the same way: sleeps for the configured delay and responds with a 404 page.
+    Paths starting with /found respond with a 200 and a bigger body.
+    """
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        if self.path.startswith("/found"):
+            code, body = 200, self.server.found_body
+        else:
+            code, body = 404, NOT_FOUND_BODY
+        self.send_response(code)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if self.server.close_connections:
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    do_HEAD = do_GET
+    do_POST = do_GET
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Avoid connection resets when many handles connect at the same time
+    request_queue_size = 1024
+
+    def __init__(self, port: int = 0, delay: float = 0, body_size: int = 2048, tls: bool = False,
+                 close_connections: bool = False):
+        super().__init__(("127.0.0.1", port), StandInHandler)
+        self.delay = delay
+        self.found_body = (b"lorem ipsum dolor sit amet\n" * (body_size // 27 + 1))[:body_size]
+        # Answer with Connection: close, which forces the clients to open a new connection for every request
+        self.close_connections = close_connections
+        self.tls = tls
+        if tls:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            with tempfile.TemporaryDirectory() as cert_dir:
+                context.load_cert_chain(*create_self_signed_cert(cert_dir))
+            self.socket = context.wrap_socket(self.socket, server_side=True)
+
+    @property
+    def url(self) -> str:
+        return f"{'https' if self.tls else 'http'}://127.0.0.1:{self.server_address[1]}"
+
+    def start_background(self) -> threading.Thread:
+        """
+        Serve in a daemon thread and return it
+        """
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+
+def create_self_signed_cert(directory: str) -> tuple[str, str]:
+    """
+    Create a self-signed certificate for 127.0.0.1 in the directory and return the paths of the certificate and key
+    """
+    cert_file, key_file = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1", "-subj", "/CN=127.0.0.1",
+                    "-keyout", key_file, "-out", cert_file], check=True, capture_output=True)
+    return cert_file, key_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in HTTP server for benchmarks")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--delay", type=float, default=0, help="Seconds to wait before answering each request")
+    parser.add_argument("--body-size", type=int, default=2048, help="Size of the body of /found responses")
+    parser.add_argument("--tls", action="store_true", help="Serve HTTPS with a self-signed certificate")
+    parser.add_argument("--close", action="store_true", help="Close the connection after every response")
+    args = parser.parse_args()
+
+    server = StandInServer(args.port, args.delay, args.body_size, args.tls, args.close)
+    print(f"Serving on {server.url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
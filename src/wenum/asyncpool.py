@@ -0,0 +1,538 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import functools
+import socket
+import ssl
+import time
+from io import BytesIO
+from threading import Thread
+from typing import TYPE_CHECKING, Optional
+from urllib.parse import unquote, urlparse, ParseResult
+
+if TYPE_CHECKING:
+    from wenum.runtime_session import FuzzSession
+from .externals.reqresp import Response
+from .fuzzobjects import FuzzResult
+from .fuzzrequest import FuzzRequest
+from .helpers.metrics import ContentMetrics, StreamingBody
+from .helpers.timing import CURL_TIMES
+from .httppool import HttpPool
+
+# libcurl error codes the failed transfers are reported with, so that the retries, their backoff and the adaptive
+# concurrency treat them the same way as with the curl transport. See https://curl.haxx.se/libcurl/c/libcurl-errors.html
+CURLE_UNSUPPORTED_PROTOCOL = 1
+CURLE_COULDNT_RESOLVE_PROXY = 5
+CURLE_COULDNT_RESOLVE_HOST = 6
+CURLE_COULDNT_CONNECT = 7
+CURLE_WEIRD_SERVER_REPLY = 8
+CURLE_PARTIAL_FILE = 18
+CURLE_OPERATION_TIMEDOUT = 28
+CURLE_SSL_CONNECT_ERROR = 35
+CURLE_GOT_NOTHING = 52
+CURLE_SEND_ERROR = 55
+CURLE_RECV_ERROR = 56
+CURLE_FILESIZE_EXCEEDED = 63
+
+# Same limit as the curl transport sets with MAXFILESIZE
+MAX_RESPONSE_SIZE = 200000000
+# Maximum size of the status line and headers of a response
+MAX_HEADER_SIZE = 1024 * 1024
+# Port libcurl connects to if the proxy URL does not name one
+DEFAULT_PROXY_PORT = 1080
+# Amount of bytes read from a connection at once
+READ_SIZE = 65536
+# Responses to these never have a body
+BODYLESS_CODES = (204, 304)
+
+
+@functools.lru_cache(maxsize=None)
+def proxy_authorization(proxy: str) -> Optional[str]:
+    """
+    Value of the Proxy-Authorization header for the credentials in the proxy URL, or None if it has none
+    """
+    parsed_proxy = urlparse(proxy)
+    if parsed_proxy.username is None:
+        return None
+    credentials = f"{unquote(parsed_proxy.username)}:{unquote(parsed_proxy.password or '')}"
+    return "Basic " + base64.b64encode(credentials.encode("utf-8")).decode("ascii")
+
+
+class TransferError(Exception):
+    """
+    Failed transfer, carrying the matching libcurl error code
+    """
+
+    def __init__(self, errno: int, message: str):
+        super().__init__(message)
+        self.errno = errno
+        # Amount of connections the transfer opened before failing
+        self.num_connects = 0
+
+
+class Connection:
+    """
+    Connection to a host or proxy which may be kept alive for further requests
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    def usable(self) -> bool:
+        """
+        Whether the connection has not been closed by the other side while it was idle
+        """
+        return not self.reader.at_eof() and not self.writer.is_closing()
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class ConnectionPool:
+    """
+    Idle keep-alive connections, grouped by the host (and proxy) they lead to
+    """
+
+    def __init__(self, max_idle_per_host: int):
+        self.max_idle_per_host = max_idle_per_host
+        self.idle: dict[tuple, list[Connection]] = {}
+
+    def acquire(self, key: tuple) -> Optional[Connection]:
+        """
+        Take an idle connection for the key, or None if there is no usable one
+        """
+        connections = self.idle.get(key)
+        while connections:
+            connection = connections.pop()
+            if connection.usable():
+                return connection
+            connection.close()
+        return None
+
+    def release(self, key: tuple, connection: Connection) -> None:
+        connections = self.idle.setdefault(key, [])
+        if len(connections) < self.max_idle_per_host and connection.usable():
+            connections.append(connection)
+        else:
+            connection.close()
+
+    def close(self) -> None:
+        for connections in self.idle.values():
+            for connection in connections:
+                connection.close()
+        self.idle.clear()
+
+
+class AsyncHttpClient:
+    """
+    Minimal HTTP/1.1 client on top of asyncio streams, sending the requests the way the curl transport does: The
+    headers of the request are sent as they are, redirects are not followed, certificates are not verified, and
+    --ip overrides the address connected to. HTTP proxies are supported, HTTPS targets are tunneled through them.
+    """
+
+    def __init__(self, max_idle_per_host: int, body_limit: Optional[int] = None, compressed: bool = False):
+        self.pool = ConnectionPool(max_idle_per_host)
+        self.body_limit = body_limit
+        self.compressed = compressed
+        # Resolved addresses of the hosts. libcurl caches them as well
+        self.addresses: dict[tuple[str, int], tuple] = {}
+        self.ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        self.ssl_context.check_hostname = False
+        self.ssl_context.verify_mode = ssl.CERT_NONE
+
+    def close(self) -> None:
+        self.pool.close()
+
+    async def send(self, fuzz_request: FuzzRequest,
+                   proxy: Optional[str] = None) -> tuple[Response, Optional[ContentMetrics], dict[str, float], int]:
+        """
+        Send the request and return the parsed response, the metrics of its body if they could be calculated while
+        receiving it, the points in time of the transfer (see wenum.helpers.timing) and the amount of connections
+        that have been opened. Raises TransferError if the transfer failed
+        """
+        url = urlparse(fuzz_request._request.complete_url)
+        scheme = url.scheme.lower()
+        if scheme not in ("http", "https"):
+            raise TransferError(CURLE_UNSUPPORTED_PROTOCOL, f"Protocol \"{scheme}\" not supported")
+        port = url.port or (443 if scheme == "https" else 80)
+        connect_host, connect_port = url.hostname, port
+        if fuzz_request.ip:
+            ip, ip_port = fuzz_request.ip.split(":")
+            connect_host, connect_port = ip, int(ip_port)
+        key = (scheme, url.hostname, port, connect_host, connect_port, proxy)
+
+        start = time.monotonic()
+        timings = dict.fromkeys(CURL_TIMES, 0.0)
+        num_connects = 0
+        try:
+            # A keep-alive connection may have been closed by the server just before being reused. In that case the
+            # request is sent again on a new connection, as libcurl does
+            for attempt in range(2):
+                connection = self.pool.acquire(key) if attempt == 0 else None
+                reused = connection is not None
+                if connection is None:
+                    connection = await self._connect(key, timings, start)
+                    num_connects += 1
+                timings["pretransfer"] = time.monotonic() - start
+                try:
+                    raw_header, body, keep_alive = await self._exchange(connection, fuzz_request, url, proxy,
+                                                                        timings, start)
+                except TransferError as e:
+                    connection.close()
+                    if reused and e.errno in (CURLE_GOT_NOTHING, CURLE_SEND_ERROR):
+                        continue
+                    raise
+                except BaseException:
+                    connection.close()
+                    raise
+                break
+        except TransferError as e:
+            e.num_connects = num_connects
+            raise
+
+        if keep_alive:
+            self.pool.release(key, connection)
+        else:
+            connection.close()
+        timings["total"] = time.monotonic() - start
+
+        response = Response()
+        response.parse_curl_response(raw_header.decode("utf-8", errors="surrogateescape"), body.getvalue())
+        return response, body.content_metrics(), timings, num_connects
+
+    async def _resolve(self, host: str, port: int, is_proxy: bool) -> tuple:
+        address = self.addresses.get((host, port))
+        if address is None:
+            try:
+                infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            except socket.gaierror as e:
+                errno = CURLE_COULDNT_RESOLVE_PROXY if is_proxy else CURLE_COULDNT_RESOLVE_HOST
+                raise TransferError(errno, f"Could not resolve {'proxy' if is_proxy else 'host'}: {host} ({e})")
+            family, _, proto, _, sockaddr = infos[0]
+            address = (family, proto, sockaddr)
+            self.addresses[(host, port)] = address
+        return address
+
+    async def _connect(self, key: tuple, timings: dict[str, float], start: float) -> Connection:
+        """
+        Open a connection for the key, through the proxy if there is one
+        """
+        scheme, host, port, connect_host, connect_port, proxy = key
+        if proxy:
+            parsed_proxy = urlparse(proxy)
+            connect_host, connect_port = parsed_proxy.hostname, parsed_proxy.port or DEFAULT_PROXY_PORT
+        family, proto, sockaddr = await self._resolve(connect_host, connect_port, bool(proxy))
+        timings["namelookup"] = time.monotonic() - start
+
+        loop = asyncio.get_running_loop()
+        sock = socket.socket(family, socket.SOCK_STREAM, proto)
+        try:
+            sock.setblocking(False)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            try:
+                await loop.sock_connect(sock, sockaddr)
+            except OSError as e:
+                raise TransferError(CURLE_COULDNT_CONNECT,
+                                    f"Failed to connect to {connect_host} port {connect_port}: {e.strerror or e}")
+            timings["connect"] = time.monotonic() - start
+
+            if scheme != "https":
+                reader, writer = await asyncio.open_connection(sock=sock, limit=MAX_HEADER_SIZE)
+                return Connection(reader, writer)
+
+            if proxy:
+                await self._open_tunnel(sock, host, port, proxy_authorization(proxy))
+            try:
+                reader, writer = await asyncio.open_connection(sock=sock, ssl=self.ssl_context, server_hostname=host,
+                                                               limit=MAX_HEADER_SIZE)
+            except (ssl.SSLError, OSError) as e:
+                raise TransferError(CURLE_SSL_CONNECT_ERROR, f"TLS handshake with {host} failed: {e}")
+            timings["appconnect"] = time.monotonic() - start
+            return Connection(reader, writer)
+        except BaseException:
+            sock.close()
+            raise
+
+    @staticmethod
+    async def _open_tunnel(sock: socket.socket, host: str, port: int, authorization: Optional[str]) -> None:
+        """
+        Ask the HTTP proxy connected to through sock for a tunnel to the host
+        """
+        loop = asyncio.get_running_loop()
+        authority = f"{host}:{port}"
+        lines = [f"CONNECT {authority} HTTP/1.1", f"Host: {authority}"]
+        if authorization:
+            lines.append(f"Proxy-Authorization: {authorization}")
+        try:
+            await loop.sock_sendall(sock, ("\r\n".join(lines) + "\r\n\r\n").encode())
+            reply = b""
+            while b"\r\n\r\n" not in reply:
+                chunk = await loop.sock_recv(sock, 4096)
+                if not chunk or len(reply) > MAX_HEADER_SIZE:
+                    raise TransferError(CURLE_RECV_ERROR, "Proxy CONNECT aborted")
+                reply += chunk
+        except OSError as e:
+            raise TransferError(CURLE_RECV_ERROR, f"Proxy CONNECT failed: {e}")
+        status_line = reply.split(b"\r\n", 1)[0].split()
+        if len(status_line) < 2 or not status_line[1].startswith(b"2"):
+            raise TransferError(CURLE_RECV_ERROR,
+                                f"Received HTTP code {status_line[1].decode() if len(status_line) > 1 else '?'} "
+                                f"from proxy after CONNECT")
+
+    def _build_request(self, fuzz_request: FuzzRequest, url: ParseResult, proxy: Optional[str]) -> bytes:
+        request = fuzz_request._request
+        if proxy and url.scheme.lower() == "http":
+            target = request.complete_url
+        else:
+            target = url._replace(scheme="", netloc="", fragment="").geturl()
+            if not target.startswith("/"):
+                target = "/" + target
+
+        lines = [f"{request.method} {target} HTTP/1.1"]
+        names = set()
+        for header in request.get_headers():
+            name, _, value = header.partition(":")
+            names.add(name.strip().lower())
+            # As with libcurl, a header without a value only removes the default one
+            if value.strip():
+                lines.append(header)
+        if "host" not in names:
+            default_port = 443 if url.scheme.lower() == "https" else 80
+            host = f"[{url.hostname}]" if ":" in url.hostname else url.hostname
+            lines.append(f"Host: {host}" if url.port in (None, default_port) else f"Host: {host}:{url.port}")
+        if "accept" not in names:
+            lines.append("Accept: */*")
+        if self.compressed and "accept-encoding" not in names:
+            lines.append("Accept-Encoding: gzip, deflate")
+        if proxy and url.scheme.lower() == "http" and "proxy-authorization" not in names:
+            authorization = proxy_authorization(proxy)
+            if authorization:
+                lines.append(f"Proxy-Authorization: {authorization}")
+
+        body = b""
+        post_data = request._non_parsed_post
+        if post_data is not None:
+            body = post_data.encode("utf-8", errors="surrogateescape") if isinstance(post_data, str) else post_data
+            if "content-length" not in names:
+                lines.append(f"Content-Length: {len(body)}")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("utf-8", errors="surrogateescape") + body
+
+    async def _exchange(self, connection: Connection, fuzz_request: FuzzRequest, url: ParseResult,
+                        proxy: Optional[str], timings: dict[str, float],
+                        start: float) -> tuple[bytes, StreamingBody, bool]:
+        """
+        Send the request over the connection and receive the response. Returns the header block, the body and
+        whether the connection can be kept alive
+        """
+        try:
+            connection.writer.write(self._build_request(fuzz_request, url, proxy))
+            await connection.writer.drain()
+        except OSError as e:
+            raise TransferError(CURLE_SEND_ERROR, f"Failed sending data to the peer: {e}")
+
+        reader = connection.reader
+        try:
+            # Interim responses like 100 Continue are skipped
+            while True:
+                try:
+                    raw_header = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError as e:
+                    if not e.partial:
+                        raise TransferError(CURLE_GOT_NOTHING, "Empty reply from server")
+                    raise TransferError(CURLE_RECV_ERROR, "Connection closed while receiving the headers")
+                except asyncio.LimitOverrunError:
+                    raise TransferError(CURLE_RECV_ERROR, "Response headers too large")
+                if not timings["starttransfer"]:
+                    timings["starttransfer"] = time.monotonic() - start
+                status_line = raw_header.split(b"\r\n", 1)[0].split(None, 2)
+                if len(status_line) < 2 or not status_line[0].startswith(b"HTTP/") or not status_line[1].isdigit():
+                    raise TransferError(CURLE_WEIRD_SERVER_REPLY, "Unsupported HTTP version in response")
+                code = int(status_line[1])
+                if not 100 <= code < 200 or code == 101:
+                    break
+
+            protocol = status_line[0].upper()
+            content_length = None
+            chunked = False
+            connection_header = b""
+            for line in raw_header.split(b"\r\n")[1:]:
+                name, _, value = line.partition(b":")
+                name = name.strip().lower()
+                if name == b"content-length":
+                    try:
+                        content_length = int(value.strip())
+                    except ValueError:
+                        raise TransferError(CURLE_WEIRD_SERVER_REPLY, "Invalid Content-Length value")
+                elif name == b"transfer-encoding":
+                    chunked = b"chunked" in value.lower()
+                elif name == b"connection":
+                    connection_header = value.strip().lower()
+            if protocol == b"HTTP/1.0":
+                keep_alive = connection_header == b"keep-alive"
+            else:
+                keep_alive = connection_header != b"close"
+
+            body = StreamingBody(BytesIO(raw_header), self.body_limit)
+            if fuzz_request._request.method == "HEAD" or code in BODYLESS_CODES or code < 200:
+                pass
+            elif chunked:
+                await self._read_chunked(reader, body)
+            elif content_length is not None:
+                if content_length > MAX_RESPONSE_SIZE:
+                    raise TransferError(CURLE_FILESIZE_EXCEEDED, "Maximum file size exceeded")
+                await self._read_exactly(reader, content_length, body)
+            else:
+                # The end of the body is marked by closing the connection
+                keep_alive = False
+                size = 0
+                while True:
+                    chunk = await reader.read(READ_SIZE)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > MAX_RESPONSE_SIZE:
+                        raise TransferError(CURLE_FILESIZE_EXCEEDED, "Maximum file size exceeded")
+                    body.write(chunk)
+        except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError) as e:
+            raise TransferError(CURLE_RECV_ERROR, f"Failure when receiving data from the peer: {e}")
+        return raw_header, body, keep_alive
+
+    @staticmethod
+    async def _read_exactly(reader: asyncio.StreamReader, size: int, body: StreamingBody) -> None:
+        while size:
+            chunk = await reader.read(min(size, READ_SIZE))
+            if not chunk:
+                raise TransferError(CURLE_PARTIAL_FILE, "Transfer closed with outstanding read data remaining")
+            body.write(chunk)
+            size -= len(chunk)
+
+    async def _read_chunked(self, reader: asyncio.StreamReader, body: StreamingBody) -> None:
+        received = 0
+        while True:
+            try:
+                size = int((await reader.readuntil(b"\r\n")).split(b";", 1)[0].strip(), 16)
+            except ValueError:
+                raise TransferError(CURLE_RECV_ERROR, "Invalid chunk size in the chunked response")
+            if not size:
+                break
+            received += size
+            if received > MAX_RESPONSE_SIZE:
+                raise TransferError(CURLE_FILESIZE_EXCEEDED, "Maximum file size exceeded")
+            await self._read_exactly(reader, size, body)
+            await reader.readexactly(2)
+        # Skip the trailers
+        while await reader.readuntil(b"\r\n") != b"\r\n":
+            pass
+
+
+class AsyncHttpPool(HttpPool):
+    """
+    HttpPool sending the requests with asyncio instead of libcurl. An event loop running in its own thread handles
+    each transfer in a task, and keeps the connections alive per host. Without a curl handle per transfer, it scales
+    to a large amount of concurrent connections. Caching, rate limiting, retries, the circuit breaker and the proxy
+    balancing work as with the curl transport.
+    """
+
+    def __init__(self, session: FuzzSession):
+        super().__init__(session)
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.client: Optional[AsyncHttpClient] = None
+        # Set to interrupt the event loop waiting for finished transfers, e.g. because new requests are available
+        self.wakeup_event: Optional[asyncio.Event] = None
+        # Tasks of the active transfers
+        self.transfers: set[asyncio.Task] = set()
+
+    def initialize(self) -> None:
+        """
+        Start the thread running the event loop
+        """
+        self.loop = asyncio.new_event_loop()
+        self.wakeup_event = asyncio.Event()
+        self.client = AsyncHttpClient(max_idle_per_host=self.session.options.threads, body_limit=self.body_limit,
+                                      compressed=bool(self.session.options.compressed))
+        self.thread = Thread(target=self._run_event_loop)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def wakeup(self) -> None:
+        if not self.loop:
+            return
+        try:
+            self.loop.call_soon_threadsafe(self.wakeup_event.set)
+        # The loop has already been closed
+        except RuntimeError:
+            pass
+
+    def _run_event_loop(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self._process_transfers())
+        finally:
+            self.loop.close()
+            self._log_transfer_stats()
+            self.logger.debug(f"_process_transfers stopped")
+            self.thread_cancelled.set()
+
+    async def _process_transfers(self) -> None:
+        """
+        Main task of the event loop. Starts the transfers of the available requests, and sleeps until one finished,
+        new requests are queued, or a held back request is due
+        """
+        while self.thread_cancelled.is_set():
+            self.wakeup_event.clear()
+            self._start_transfers()
+            try:
+                await asyncio.wait_for(self.wakeup_event.wait(), self._wait_timeout(1))
+            except asyncio.TimeoutError:
+                pass
+
+        for task in self.transfers:
+            task.cancel()
+        await asyncio.gather(*self.transfers, return_exceptions=True)
+        self.client.close()
+
+    def _start_transfers(self) -> None:
+        while len(self.transfers) < self.session.options.threads:
+            if self.concurrency and len(self.transfers) >= self.concurrency.limit:
+                break
+            fuzz_result = self._next_request()
+            if fuzz_result is None:
+                break
+            task = self.loop.create_task(self._transfer(fuzz_result))
+            self.transfers.add(task)
+            task.add_done_callback(self._transfer_done)
+
+    def _transfer_done(self, task: asyncio.Task) -> None:
+        self.transfers.discard(task)
+        self.wakeup_event.set()
+
+    async def _transfer(self, fuzz_result: FuzzResult) -> None:
+        proxy = self._choose_proxy(fuzz_result)
+        request_timeout = self.session.options.request_timeout
+        try:
+            response, content_metrics, timings, num_connects = await asyncio.wait_for(
+                self.client.send(fuzz_result.history, proxy), request_timeout)
+        except asyncio.TimeoutError:
+            self._update_host_load(fuzz_result, -1)
+            self._handle_transfer_error(fuzz_result, CURLE_OPERATION_TIMEDOUT,
+                                        f"Operation timed out after {request_timeout} seconds")
+            return
+        except TransferError as e:
+            self._update_host_load(fuzz_result, -1)
+            self._record_connections(e.num_connects)
+            self._handle_transfer_error(fuzz_result, e.errno, str(e))
+            return
+        except Exception as e:
+            self._update_host_load(fuzz_result, -1)
+            self._handle_unparsable_response(fuzz_result, e)
+            return
+
+        self._update_host_load(fuzz_result, -1)
+        self._record_connections(num_connects)
+        response.content_metrics = content_metrics
+        fuzz_result.history._request.response = response
+        fuzz_result.history._request.totaltime = timings["total"]
+        fuzz_result.history._request.timings = timings
+        self._handle_response(fuzz_result)
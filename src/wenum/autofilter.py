@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+from .helpers.obj_dic import FixSizeOrderedDict
+
+if TYPE_CHECKING:
+    from .fuzzobjects import FuzzResult
+
+# Status code, lines and words of a response, identifying responses which are (nearly) the same
+Signature = tuple[int, int, int]
+
+
+class DirectoryState:
+    """
+    What the autofilter learned about the responses of a single directory
+    """
+
+    def __init__(self, expiry: int):
+        # Amount of times each signature occurred. The least recently seen one is forgotten once there are too many
+        self.hits: FixSizeOrderedDict = FixSizeOrderedDict(maximum_length=expiry)
+        # Signatures that occurred often enough to be filtered out
+        self.filtered: set[Signature] = set()
+
+
+class Autofilter:
+    """
+    Learns which responses recur within a directory, and filters them out in that directory once they occurred
+    threshold times. Directories are kept apart, as a response that is uninteresting in one directory (e.g. a
+    custom 404 page) may well be a hit in another.
+    """
+
+    def __init__(self, threshold: int, expiry: int):
+        self.threshold = threshold
+        self.expiry = expiry
+        self.directories: dict[str, DirectoryState] = {}
+
+    @staticmethod
+    def directory(fuzz_result: FuzzResult) -> str:
+        """
+        The key of the directory of the result. The seed it has been generated from if there is one, otherwise the
+        parent path of its URL
+        """
+        if fuzz_result.seed_url:
+            return fuzz_result.seed_url
+        url = fuzz_result.history.url.split("?", 1)[0]
+        return url.rsplit("/", 1)[0] + "/"
+
+    @staticmethod
+    def signature(fuzz_result: FuzzResult) -> Signature:
+        return fuzz_result.code, fuzz_result.lines, fuzz_result.words
+
+    def _state(self, directory: str) -> DirectoryState:
+        state = self.directories.get(directory)
+        if state is None:
+            state = self.directories[directory] = DirectoryState(self.expiry)
+        return state
+
+    def is_filtered(self, fuzz_result: FuzzResult) -> bool:
+        state = self.directories.get(self.directory(fuzz_result))
+        return state is not None and self.signature(fuzz_result) in state.filtered
+
+    def observe(self, fuzz_result: FuzzResult) -> Optional[Signature]:
+        """
+        Count the signature of a result that has not been filtered out. Returns the signature if it occurred often
+        enough to be filtered out from now on
+        """
+        state = self._state(self.directory(fuzz_result))
+        signature = self.signature(fuzz_result)
+        hits = state.hits.pop(signature, 0) + 1
+        if hits >= self.threshold:
+            state.filtered.add(signature)
+            return signature
+        # Reinserting moves the signature to the end, so that the least recently seen one is forgotten first
+        state.hits[signature] = hits
+        return None
@@ -25,6 +25,7 @@ from .fuzzqueues import (
     HttpQueue,
     CLIPrinterQueue,
     AutofilterQueue,
+    Soft404Queue,
     RedirectQueue
 )
 
@@ -58,6 +59,9 @@ class Fuzzer:
                 "autofilter_queue", AutofilterQueue(session)
             )
 
+        if session.options.soft_404:
+            self.qmanager.add("soft_404_queue", Soft404Queue(session))
+
         if session.options.plugins_list:
             self.qmanager.add("plugins_queue", PluginQueue(session))
 
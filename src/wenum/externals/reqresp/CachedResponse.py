@@ -1,4 +1,4 @@
-from wenum.externals.reqresp.Response import Response, get_encoding_from_headers
+from wenum.externals.reqresp.Response import Response
 
 
 class CachedResponse(Response):
@@ -12,14 +12,9 @@ class CachedResponse(Response):
             self.code = code
             self.charlen = length
 
-    def get_content(self):
+    def _get_raw_content(self):
         if self._body is None:
-            return super().get_content()
-        content_encoding = get_encoding_from_headers(dict(self.get_headers()))
-
-        # fallback to default encoding
-        if content_encoding is None:
-            content_encoding = "utf-8"
+            return super()._get_raw_content()
 
         with open(self._body, "rb") as body_file:
-            return body_file.read().decode(content_encoding, errors="replace")
\ No newline at end of file
+            return body_file.read()
@@ -0,0 +1,106 @@
+import re
+
+STATUS_LINE_REGEX = re.compile(r"(HTTP/[0-9.]+) ([0-9]+) ?(.*)")
+
+
+class HeaderMultiDict:
+    """
+    Case-insensitive multi-dict of HTTP headers. Keeps the original names and order, and allows for
+    repeated headers like Set-Cookie. Single value lookups return the last value, like dict() on the header
+    list would.
+    """
+
+    def __init__(self, items=()):
+        self._items = list(items)
+        # Maps the lowercase names to the positions in _items. Built on the first lookup, as many header blocks
+        # are only converted to a list
+        self._index = None
+
+    def _get_index(self):
+        if self._index is None:
+            self._index = {}
+            for position, (name, value) in enumerate(self._items):
+                self._index.setdefault(name.lower(), []).append(position)
+        return self._index
+
+    def add(self, name, value):
+        self._items.append((name, value))
+        if self._index is not None:
+            self._index.setdefault(name.lower(), []).append(len(self._items) - 1)
+
+    def get(self, name, default=None):
+        positions = self._get_index().get(name.lower())
+        if not positions:
+            return default
+        return self._items[positions[-1]][1]
+
+    def getall(self, name):
+        return [self._items[position][1] for position in self._get_index().get(name.lower(), [])]
+
+    def items(self):
+        return list(self._items)
+
+    def __getitem__(self, name):
+        positions = self._get_index().get(name.lower())
+        if not positions:
+            raise KeyError(name)
+        return self._items[positions[-1]][1]
+
+    def __contains__(self, name):
+        return name.lower() in self._get_index()
+
+    def __iter__(self):
+        return (name for name, value in self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __repr__(self):
+        return f"HeaderMultiDict({self._items!r})"
+
+
+def parse_header_block(raw_header):
+    """
+    Parse the raw header data curl passed for a response in a single pass.
+
+    curl passes several header blocks e.g. for 100 Continue responses or when tunneling through a proxy. Every status
+    line starts a new block, so the headers of the last response are returned. Folded header lines (starting with
+    whitespace) are joined to the header they continue.
+
+    Returns a tuple of protocol, status code, status message and a HeaderMultiDict. The protocol is "unknown" and
+    the code 0 if there is no status line.
+    """
+    protocol, code, message = "unknown", 0, ""
+    items = []
+    # Whether the previous line was a header that a folded line may continue
+    in_header = False
+
+    for line in raw_header.split("\n"):
+        if line[-1:] == "\r":
+            line = line[:-1]
+        if not line:
+            in_header = False
+            continue
+
+        if line[0] in " \t":
+            if in_header:
+                name, value = items[-1]
+                items[-1] = (name, f"{value} {line.strip()}" if value else line.strip())
+            continue
+
+        if line[:5] == "HTTP/":
+            match = STATUS_LINE_REGEX.match(line)
+            if match:
+                protocol, code, message = match.group(1), int(match.group(2)), match.group(3).strip()
+                items = []
+                in_header = False
+                continue
+
+        name, separator, value = line.partition(":")
+        if separator and name:
+            items.append((name, value.strip()))
+            in_header = True
+        else:
+            in_header = False
+
+    return protocol, code, message, HeaderMultiDict(items)
@@ -60,6 +60,8 @@ class Request:
         self._totaltimeout = None
 
         self.totaltime = None
+        # Points in time of the phases of the transfer, see wenum.helpers.timing
+        self.timings = None
         self.date = None
 
     @property
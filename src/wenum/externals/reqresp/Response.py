@@ -6,6 +6,7 @@ import gzip
 import zlib
 
 from .TextParser import TextParser
+from .HeaderParser import HeaderMultiDict, parse_header_block
 
 
 def get_encoding_from_headers(headers):
@@ -57,11 +58,14 @@ class Response:
         self.code = code  # 200
         self.message = message  # OK
         self._headers = []  # well then the headers are the same as in the request
-        self.__content = (
-            ""  # content of the response (only if Content-Length exists)
-        )
+        # Body as received (after decompression). Only decoded once the content is accessed
+        self._raw_content = None
+        # Decoded content of the response, cached after the first access
+        self.__content = None
         self.md5 = ""  # hash of the result contents
         self.charlen = ""  # Number of characters in the response
+        # Precomputed ContentMetrics of the content, e.g. if the response has been processed in a separate process
+        self.content_metrics = None
 
     def add_header(self, key, value):
         self._headers += [(key, value)]
@@ -72,7 +76,8 @@ class Response:
                 self._headers.remove(i)
 
     def add_content(self, text):
-        self.__content = self.__content + text
+        self.__content = self.get_content() + text
+        self._raw_content = None
 
     def __getitem__(self, key):
         for i, j in self._headers:
@@ -108,7 +113,34 @@ class Response:
     def get_headers(self):
         return self._headers
 
+    def _get_raw_content(self):
+        return self._raw_content
+
+    @property
+    def raw_content_bytes(self):
+        """
+        The body as bytes, without decoding it. Cheaper for plugins that can work on bytes
+        """
+        raw_content = self._get_raw_content()
+        if raw_content is not None:
+            return raw_content
+        return (self.__content or "").encode("utf-8", errors="surrogateescape")
+
+    def get_content_encoding(self):
+        # Try to get charset encoding from headers
+        content_encoding = get_encoding_from_headers(HeaderMultiDict(self.get_headers()))
+
+        # fallback to default encoding
+        if content_encoding is None:
+            content_encoding = "utf-8"
+        return content_encoding
+
     def get_content(self):
+        if self.__content is None:
+            raw_content = self._get_raw_content()
+            if raw_content is None:
+                return ""
+            self.__content = raw_content.decode(self.get_content_encoding(), errors="replace")
         return self.__content
 
     def get_text_headers(self):
@@ -138,7 +170,9 @@ class Response:
         return string
 
     def parse_response(self, rawheader, rawbody=None):
-        self.__content = ""
+        self.__content = None
+        self._raw_content = None
+        self.content_metrics = None
         self._headers = []
 
         text_parser: TextParser = TextParser()
@@ -184,12 +218,36 @@ class Response:
             pass
 
         # TODO: this should be added to rawbody not directly to __content
+        content_lines = []
         if text_parser.lastFull_line:
-            self.add_content(text_parser.lastFull_line)
+            content_lines.append(text_parser.lastFull_line)
 
         while text_parser.skip(1):
-            self.add_content(text_parser.lastFull_line)
-
+            content_lines.append(text_parser.lastFull_line)
+        if content_lines:
+            self.__content = "".join(content_lines)
+
+        self._set_raw_body(rawbody)
+
+    def parse_curl_response(self, rawheader, rawbody, decoded=False):
+        """
+        Faster variant of parse_response for the header data and body received by curl.
+        The header block is parsed in a single pass, and the body is not searched for in the header data.
+        decoded signals that curl already decompressed the body. The Content-Encoding header is kept as sent.
+        """
+        self.__content = None
+        self._raw_content = None
+        self.content_metrics = None
+
+        self.protocol, self.code, self.message, headers = parse_header_block(rawheader)
+        self._headers = headers.items()
+
+        self._set_raw_body(rawbody, decoded)
+
+    def _set_raw_body(self, rawbody, decoded=False):
+        """
+        Decompress the body if needed, and store it for decoding it on access
+        """
         self.del_header("Transfer-Encoding")
 
         if self.header_equal("Transfer-Encoding", "chunked"):
@@ -206,7 +264,9 @@ class Response:
 
             rawbody = result
 
-        if self.header_equal("Content-Encoding", "gzip"):
+        if decoded:
+            pass
+        elif self.header_equal("Content-Encoding", "gzip"):
             compressedstream = BytesIO(rawbody)
             gzipper = gzip.GzipFile(fileobj=compressedstream)
             rawbody = gzipper.read()
@@ -222,16 +282,11 @@ class Response:
                     deflated_data = deflater.decompress(rawbody)
                     deflated_data += deflater.flush()
                 except zlib.error:
-                    deflated_data = ""
+                    deflated_data = b""
             rawbody = deflated_data
             self.del_header("Content-Encoding")
 
         if rawbody is not None:
-            # Try to get charset encoding from headers
-            content_encoding = get_encoding_from_headers(dict(self.get_headers()))
-
-            # fallback to default encoding
-            if content_encoding is None:
-                content_encoding = "utf-8"
-
-            self.__content = rawbody.decode(content_encoding, errors="replace")
+            # Decoded on first access, as the content of most responses is never looked at
+            self.__content = None
+            self._raw_content = rawbody
@@ -19,16 +19,18 @@ class FuzzResultFactory(ObjectFactory):
                 "seed_from_recursion": FuzzResSeedBuilder(),
                 "seed_from_plugin": FuzzResPluginSeedBuilder(),
                 "seed_from_options": FuzzResOptionsSeedBuilder(),
+                "seed_from_target": FuzzResTargetSeedBuilder(),
             },
         )
 
 
 class FuzzResultDictioBuilder:
-    def __call__(self, session, dictio_item):
-        fuzz_result: FuzzResult = copy.deepcopy(session.compiled_seed)
+    def __call__(self, session, dictio_item, seed: FuzzResult = None):
+        fuzz_result: FuzzResult = copy.deepcopy(seed if seed else session.compiled_seed)
         fuzz_result.item_type = FuzzType.RESULT
         fuzz_result.payload_man.update_from_dictio(dictio_item)
         fuzz_result.from_plugin = False
+        fuzz_result.seed_url = fuzz_result.history.url
 
         SeedBuilderHelper.replace_markers(fuzz_result.history, fuzz_result.payload_man)
         fuzz_result.result_number = next(FuzzResult.newid)
@@ -46,6 +48,20 @@ class FuzzResOptionsSeedBuilder:
         return fuzz_result
 
 
+class FuzzResTargetSeedBuilder:
+    """
+    Create the seed of another target URL (--url-file), based on the seed built from the options
+    """
+
+    def __call__(self, options_seed: FuzzResult, target_url: str) -> FuzzResult:
+        new_seed: FuzzResult = copy.deepcopy(options_seed)
+        new_seed.history.url = target_url
+        new_seed.history.fuzzing_url = target_url
+        new_seed.payload_man = payman_factory.create("payloadman_from_request", new_seed.history)
+
+        return new_seed
+
+
 class FuzzResSeedBuilder:
     """
     Create a new seed. Polls the recursion URL from the seed object's response.
@@ -1,17 +1,31 @@
 import pycurl
 
 from ..helpers.str_func import convert_to_unicode
+from ..helpers.timing import read_timings
 from ..externals.reqresp import Response
 
 
 class ReqRespRequestFactory:
 
     @staticmethod
-    def to_http_object(fuzz_request, pycurl_c) -> pycurl.Curl:
-        pycurl_c.setopt(pycurl.MAXREDIRS, 5)
+    def get_applied_options(pycurl_c: pycurl.Curl) -> dict:
+        """
+        Return the record of the options that have been set on the curl handle, which allows to only set the
+        options that differ from the previous request. Curl handles are reused for many requests, and most options
+        stay the same during a run.
+        """
+        applied_options = getattr(pycurl_c, "applied_options", None)
+        if applied_options is None:
+            applied_options = {}
+            pycurl_c.applied_options = applied_options
+        return applied_options
 
-        pycurl_c.setopt(pycurl.WRITEFUNCTION, fuzz_request._request.body_callback)
-        pycurl_c.setopt(pycurl.HEADERFUNCTION, fuzz_request._request.header_callback)
+    @staticmethod
+    def apply_baseline_options(pycurl_c: pycurl.Curl) -> None:
+        """
+        Set the options that are the same for every request
+        """
+        pycurl_c.setopt(pycurl.MAXREDIRS, 5)
 
         pycurl_c.setopt(pycurl.NOSIGNAL, 1)
         pycurl_c.setopt(pycurl.SSL_VERIFYPEER, False)
@@ -19,49 +33,68 @@ class ReqRespRequestFactory:
 
         pycurl_c.setopt(pycurl.PATH_AS_IS, 1)
 
-        pycurl_c.setopt(
-            pycurl.URL, convert_to_unicode(fuzz_request._request.complete_url)
-        )
-
         pycurl_c.unsetopt(pycurl.USERPWD)
 
-        pycurl_c.setopt(
-            pycurl.HTTPHEADER, convert_to_unicode(fuzz_request._request.get_headers())
-        )
-
-        curl_options = {
-            "GET": pycurl.HTTPGET,
-            "POST": pycurl.POST,
-            "PATCH": pycurl.UPLOAD,
-            "HEAD": pycurl.NOBODY,
-        }
+        # We do not want pycurl to automatically follow requests. We wouldn't be able to parse
+        # The requests inbetween in a modular way
+        pycurl_c.setopt(pycurl.FOLLOWLOCATION, 0)
 
-        for verb in curl_options.values():
-            pycurl_c.setopt(verb, False)
+    @staticmethod
+    def to_http_object(fuzz_request, pycurl_c) -> pycurl.Curl:
+        """
+        Prepare the curl handle for sending the request. The body and header callbacks are left to the caller
+        """
+        applied_options = ReqRespRequestFactory.get_applied_options(pycurl_c)
+        if not applied_options.get("baseline"):
+            ReqRespRequestFactory.apply_baseline_options(pycurl_c)
+            applied_options["baseline"] = True
 
-        if fuzz_request._request.method in curl_options:
-            pycurl_c.unsetopt(pycurl.CUSTOMREQUEST)
-            pycurl_c.setopt(curl_options[fuzz_request._request.method], True)
-        else:
-            pycurl_c.setopt(pycurl.CUSTOMREQUEST, fuzz_request._request.method)
+        pycurl_c.setopt(
+            pycurl.URL, convert_to_unicode(fuzz_request._request.complete_url)
+        )
 
-        if fuzz_request._request._non_parsed_post is not None:
+        # Equal header lists are common, comparing them is cheaper than encoding them and having curl rebuild its list
+        headers = fuzz_request._request.get_headers()
+        if headers != applied_options.get("headers"):
+            pycurl_c.setopt(pycurl.HTTPHEADER, convert_to_unicode(headers))
+            applied_options["headers"] = headers
+
+        post_data = fuzz_request._request._non_parsed_post
+        # Setting POSTFIELDS changes the method curl uses, so the method has to be set again after it
+        method = fuzz_request._request.method if post_data is None else None
+        if method is None or method != applied_options.get("method"):
+            curl_options = {
+                "GET": pycurl.HTTPGET,
+                "POST": pycurl.POST,
+                "PATCH": pycurl.UPLOAD,
+                "HEAD": pycurl.NOBODY,
+            }
+
+            for verb in curl_options.values():
+                pycurl_c.setopt(verb, False)
+
+            if fuzz_request._request.method in curl_options:
+                pycurl_c.unsetopt(pycurl.CUSTOMREQUEST)
+                pycurl_c.setopt(curl_options[fuzz_request._request.method], True)
+            else:
+                pycurl_c.setopt(pycurl.CUSTOMREQUEST, fuzz_request._request.method)
+            applied_options["method"] = method
+
+        if post_data is not None:
             pycurl_c.setopt(
                 pycurl.POSTFIELDS,
-                convert_to_unicode(fuzz_request._request._non_parsed_post),
+                convert_to_unicode(post_data),
             )
 
-        # We do not want pycurl to automatically follow requests. We wouldn't be able to parse
-        # The requests inbetween in a modular way
-        pycurl_c.setopt(pycurl.FOLLOWLOCATION, 0)
-
-        if fuzz_request.ip:
-            pycurl_c.setopt(
-                pycurl.CONNECT_TO,
-                [f"::{fuzz_request.ip}"],
-            )
-        #for i in range(10):
-        #    print(fuzz_request.ip)
+        if fuzz_request.ip != applied_options.get("ip"):
+            if fuzz_request.ip:
+                pycurl_c.setopt(
+                    pycurl.CONNECT_TO,
+                    [f"::{fuzz_request.ip}"],
+                )
+            else:
+                pycurl_c.unsetopt(pycurl.CONNECT_TO)
+            applied_options["ip"] = fuzz_request.ip
 
         return pycurl_c
 
@@ -70,8 +103,11 @@ class ReqRespRequestFactory:
         raw_header = header.decode("utf-8", errors="surrogateescape")
 
         fuzz_request._request.totaltime = pycurl_c.getinfo(pycurl.TOTAL_TIME)
+        fuzz_request._request.timings = read_timings(pycurl_c)
 
         fuzz_request._request.response = Response()
-        fuzz_request._request.response.parse_response(raw_header, rawbody=body)
+        # With compression enabled, libcurl already decoded the body
+        decoded = ReqRespRequestFactory.get_applied_options(pycurl_c).get("compressed", False)
+        fuzz_request._request.response.parse_curl_response(raw_header, body, decoded)
 
         return fuzz_request._request.response
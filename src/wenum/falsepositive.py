@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import functools
+from threading import Lock
+from typing import TYPE_CHECKING, Callable, Optional
+
+from .fuzzobjects import FuzzResult
+
+if TYPE_CHECKING:
+    from .transport import Transport
+
+# Paths requested in each recursion directory, which are assumed to not exist
+JUNK_WORDS = ("thisdoesnotexist123", "thisalsodoesnotexist123")
+
+
+class FalsePositiveProbes:
+    """
+    Tells whether a recursion directory answers non-existing paths the same way as the result that led to it, in
+    which case recursing into it is not worth it. Two junk paths per directory are requested through the transport.
+    The requests do not block the caller: Their responses are cached per directory, and callers register a callback
+    with when_ready to be notified once they are available.
+    """
+
+    def __init__(self, http_pool: Transport):
+        self.http_pool = http_pool
+        self.mutex = Lock()
+        # Status code and word count of the junk responses of each recursion URL. None for failed requests
+        self.responses: dict[str, list[Optional[tuple[int, int]]]] = {}
+        # Amount of probe requests of each recursion URL which have not returned yet
+        self.pending: dict[str, int] = {}
+        # Callbacks waiting for the probes of a set of recursion URLs
+        self.waiting: list[tuple[set[str], Callable[[], None]]] = []
+
+    def _is_probed(self, recursion_url: str) -> bool:
+        return recursion_url in self.responses and self.pending[recursion_url] == 0
+
+    def is_false_positive(self, seed: FuzzResult) -> Optional[bool]:
+        """
+        Returns True if the seed is a false positive, False if it is legitimate, and None if the probes of its
+        directory have not returned yet. They are sent if they have not been already
+        """
+        recursion_url = seed.history.url
+        with self.mutex:
+            if self._is_probed(recursion_url):
+                junk_responses = list(self.responses[recursion_url])
+            else:
+                junk_responses = None
+                send_probes = recursion_url not in self.responses
+                if send_probes:
+                    self.responses[recursion_url] = [None] * len(JUNK_WORDS)
+                    self.pending[recursion_url] = len(JUNK_WORDS)
+        if junk_responses is None:
+            if send_probes:
+                self._send_probes(seed)
+            return None
+        return self.compare(seed.code, seed.words, junk_responses)
+
+    @staticmethod
+    def compare(code: int, words: int, junk_responses: list[Optional[tuple[int, int]]]) -> bool:
+        """
+        Decide based on the junk responses whether the response with code and words is a false positive
+        """
+        first_junk, second_junk = junk_responses
+        if first_junk is None:
+            return False
+        # If the status code and word count of the junk response is identical, it's pretty much guaranteed to be
+        # a false positive
+        if first_junk == (code, words):
+            return True
+        # If even the status code is different, the initial request was a real hit
+        if first_junk[0] != code:
+            return False
+        if second_junk is None:
+            return False
+        # If both junk responses are identical, whereas the word count differs to the original request, the original
+        # one was unique and therefore not a false positive. Otherwise, the directory answers with dynamic content
+        return second_junk != first_junk
+
+    def _send_probes(self, seed: FuzzResult) -> None:
+        recursion_url = seed.history.url
+        for index, junk_word in enumerate(JUNK_WORDS):
+            probe = FuzzResult(history=seed.history.copy_without_response())
+            probe.history.url = recursion_url.replace("FUZZ", junk_word)
+            probe.probe_callback = functools.partial(self._probe_done, recursion_url, index)
+            self.http_pool.enqueue(probe)
+
+    def _probe_done(self, recursion_url: str, index: int, probe: FuzzResult) -> None:
+        """
+        Called with the result of a probe request
+        """
+        ready = []
+        with self.mutex:
+            self.responses[recursion_url][index] = None if probe.exception else (probe.code, probe.words)
+            self.pending[recursion_url] -= 1
+            if self.pending[recursion_url] == 0:
+                still_waiting = []
+                for recursion_urls, callback in self.waiting:
+                    if all(self._is_probed(url) for url in recursion_urls):
+                        ready.append(callback)
+                    else:
+                        still_waiting.append((recursion_urls, callback))
+                self.waiting = still_waiting
+        for callback in ready:
+            callback()
+
+    def when_ready(self, seeds: list[FuzzResult], callback: Callable[[], None]) -> None:
+        """
+        Call callback once the probes of the directories of all seeds returned. Right away if they already have.
+        The probes have to be started with is_false_positive before
+        """
+        recursion_urls = {seed.history.url for seed in seeds}
+        with self.mutex:
+            ready = all(self._is_probed(url) for url in recursion_urls)
+            if not ready:
+                self.waiting.append((recursion_urls, callback))
+        if ready:
+            callback()
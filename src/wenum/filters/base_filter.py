@@ -17,3 +17,11 @@ class BaseFilter(ABC):
         Returns True if it should be, and False if not.
         """
         raise NotImplementedError
+
+    def filter_many(self, fuzz_results: list) -> list[bool]:
+        """
+        Check a block of fuzz_results at once.
+
+        Returns whether each of them should be filtered out.
+        """
+        return [self.is_filtered(fuzz_result) for fuzz_result in fuzz_results]
@@ -1,14 +1,14 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Callable
 from typing import Optional as TypingOptional
 from wenum.filters.base_filter import BaseFilter
 
 if TYPE_CHECKING:
-    from wenum.facade import Facade, ERROR_CODE
     from wenum.fuzzobjects import FuzzResult
 
 from ..exception import FuzzExceptIncorrectFilter, FuzzExceptBadOptions
+from ..facade import Facade, ERROR_CODE
 from ..helpers.obj_dyn import (
     rgetattr,
     rsetattr,
@@ -38,12 +38,15 @@ from pyparsing import (
 class FuzzResFilter(BaseFilter):
     """
     Filter class for more complex filtering, often triggered by the --filter argument
+
+    The filter string is parsed once into a tree of functions, each taking the FuzzResult and returning the value of
+    its part of the expression. Evaluating the tree for each result avoids running the grammar again. As before, all
+    parts of the expression are evaluated, so that assignments and |unique() take effect regardless of the outcome.
     """
     FUZZ_MARKER_REGEX = re.compile(r"FUZ\d*Z", re.MULTILINE | re.DOTALL)
 
     def __init__(self, filter_string=None):
         super().__init__()
-        self.filter_string = filter_string
 
         quoted_str_value = QuotedString("'", unquoteResults=True, escChar="\\")
         int_values = Word("0123456789").setParseAction(lambda s, l, t: [int(t[0])])
@@ -100,60 +103,102 @@ class FuzzResFilter(BaseFilter):
         nested_definition.setParseAction(self.__compute_formula)
         self.finalformula.setParseAction(self.__myreduce)
 
-        self.fuzz_result: TypingOptional[FuzzResult] = None
+        # Fields of the symbols parsed so far. Decides which field an assignment sets
         self.stack = []
         self._cache = collections.defaultdict(set)
+        # The filter string the compiled formula belongs to, and the formula
+        self._compiled_string: TypingOptional[str] = None
+        self._compiled_formula: TypingOptional[Callable[[FuzzResult], Any]] = None
+
+        self.filter_string = filter_string
+
+    @property
+    def filter_string(self) -> TypingOptional[str]:
+        return self._filter_string
+
+    @filter_string.setter
+    def filter_string(self, filter_string: TypingOptional[str]) -> None:
+        """
+        Setting the filter string compiles it right away, so that errors in it show up before any result is processed
+        """
+        self._filter_string = filter_string
+        if filter_string:
+            self._compile(filter_string)
+
+    def _compile(self, filter_string: str) -> Callable[[FuzzResult], Any]:
+        """
+        Return the formula of the filter string, parsing it if it has not been the last one parsed
+        """
+        if filter_string != self._compiled_string:
+            self.stack = []
+            try:
+                self._compiled_formula = self.finalformula.parseString(filter_string, parseAll=True)[0]
+            except ParseException as e:
+                raise FuzzExceptIncorrectFilter(
+                    f"Incorrect filter expression \"{filter_string}\", check documentation. \n{str(e)}"
+                )
+            self._compiled_string = filter_string
+        return self._compiled_formula
+
+    @staticmethod
+    def _as_formula(token) -> Callable[[FuzzResult], Any]:
+        """
+        Literal values are parsed as they are, turn them into a formula as well
+        """
+        if callable(token):
+            return token
+        return lambda fuzz_result: token
 
     def _compute_res_symbol(self, tokens):
-        return self._get_field_value(self.fuzz_result, tokens[0])
+        field = tokens[0]
+        self.stack.append(field)
+        return lambda fuzz_result: self._get_field_value(fuzz_result, field)
 
     def _compute_fuzz_symbol(self, tokens):
         match_dict = tokens[0].groupdict()
         p_index = int(match_dict["index"]) if match_dict["index"] is not None else 1
+        field = match_dict["field"]
+        if field:
+            self.stack.append(field)
 
-        try:
-            fuzz_val = self.fuzz_result.payload_man.get_payload_content(p_index)
-        except IndexError:
-            raise FuzzExceptIncorrectFilter(
-                "Non existent FUZZ payload! Use a correct index."
-            )
-
-        if match_dict["field"]:
-            fuzz_val = self._get_field_value(fuzz_val, match_dict["field"])
+        def fuzz_symbol(fuzz_result):
+            fuzz_val = self._get_payload_value(fuzz_result, p_index)
+            if field:
+                fuzz_val = self._get_field_value(fuzz_val, field)
+            return fuzz_val
 
-        return fuzz_val
+        return fuzz_symbol
 
     def __compute_res_value(self, tokens):
-        fuzz_val, token_tuple = tokens[0]
+        value_formula = self._as_formula(tokens[0][0])
+        token_tuple = tokens[0][1]
 
         if token_tuple:
             location, operator_match = token_tuple
 
             if location == "diff":
-                return diff(operator_match, fuzz_val)
-            else:
-                if operator_match and operator_match.groupdict()["operator"]:
-                    fuzz_val = self._get_operator_value(
-                        location, fuzz_val, operator_match.groupdict()
-                    )
+                param_formula = self._as_formula(operator_match)
+                return lambda fuzz_result: diff(param_formula(fuzz_result), value_formula(fuzz_result))
+            elif operator_match and operator_match.groupdict()["operator"]:
+                match_dict = operator_match.groupdict()
+                return lambda fuzz_result: self._get_operator_value(location, value_formula(fuzz_result),
+                                                                    match_dict)
 
-        if isinstance(fuzz_val, list):
-            return [fuzz_val]
-        return fuzz_val
+        return value_formula
 
-    def _get_payload_value(self, p_index):
+    @staticmethod
+    def _get_payload_value(fuzz_result, p_index):
         try:
-            return self.fuzz_result.payload_man.get_payload_content(p_index)
+            return fuzz_result.payload_man.get_payload_content(p_index)
         except IndexError:
             raise FuzzExceptIncorrectFilter(
                 "Non existent FUZZ payload! Use a correct index."
             )
 
-    def _get_field_value(self, fuzz_val, field):
-        self.stack.append(field)
-
+    @staticmethod
+    def _get_field_value(fuzz_val, field):
         try:
-            ret = rgetattr(fuzz_val, field)
+            return rgetattr(fuzz_val, field)
         except IndexError:
             raise FuzzExceptIncorrectFilter(
                 "Non existent FUZZ payload! Use a correct index."
@@ -165,10 +210,6 @@ class FuzzResFilter(BaseFilter):
                 )
             )
 
-        if isinstance(ret, list):
-            return [ret]
-        return ret
-
     def _get_operator_value(self, location, fuzz_val, match_dict):
         op = match_dict["operator"]
         param1 = match_dict["param1"]
@@ -222,7 +263,8 @@ class FuzzResFilter(BaseFilter):
         return ERROR_CODE
 
     def __compute_expr(self, tokens):
-        leftvalue, exp_operator, rightvalue = tokens[0]
+        left_formula, exp_operator, right_token = tokens[0]
+        right_formula = self._as_formula(right_token)
 
         # a bit hacky but we don't care about fields on the right hand side of the expression
         if len(self.stack) > 1:
@@ -230,6 +272,15 @@ class FuzzResFilter(BaseFilter):
 
         field_to_set = self.stack.pop() if self.stack else None
 
+        def expr(fuzz_result):
+            leftvalue = left_formula(fuzz_result)
+            rightvalue = right_formula(fuzz_result)
+            return self._evaluate_expr(fuzz_result, leftvalue, exp_operator, rightvalue, field_to_set)
+
+        return expr
+
+    @staticmethod
+    def _evaluate_expr(fuzz_result, leftvalue, exp_operator, rightvalue, field_to_set):
         try:
             if exp_operator in ["=", "=="]:
                 return str(leftvalue) == str(rightvalue)
@@ -262,14 +313,14 @@ class FuzzResFilter(BaseFilter):
 
                 return ret if exp_operator == "~" else not ret
             elif exp_operator == ":=":
-                rsetattr(self.fuzz_result, field_to_set, rightvalue, None)
+                rsetattr(fuzz_result, field_to_set, rightvalue, None)
             elif exp_operator == "=+":
-                rsetattr(self.fuzz_result, field_to_set, rightvalue, operator.add)
+                rsetattr(fuzz_result, field_to_set, rightvalue, operator.add)
             elif exp_operator == "=-":
                 if isinstance(rightvalue, str):
-                    rsetattr(self.fuzz_result, field_to_set, rightvalue, lambda x, y: y + x)
+                    rsetattr(fuzz_result, field_to_set, rightvalue, lambda x, y: y + x)
                 else:
-                    rsetattr(self.fuzz_result, field_to_set, rightvalue, operator.sub)
+                    rsetattr(fuzz_result, field_to_set, rightvalue, operator.sub)
         except re.error as e:
             raise FuzzExceptBadOptions(
                 "Invalid regex expression used in expression: %s" % str(e)
@@ -278,34 +329,39 @@ class FuzzResFilter(BaseFilter):
             raise FuzzExceptBadOptions(
                 "Invalid operand types used in expression: %s" % str(e)
             )
-        except ParseException as e:
-            raise FuzzExceptBadOptions("Invalid filter: %s" % str(e))
 
         return True
 
     def __myreduce(self, elements):
-        first = elements[0]
-        for i in range(1, len(elements), 2):
-            if elements[i] == "and":
-                first = first and elements[i + 1]
-            elif elements[i] == "or":
-                first = first or elements[i + 1]
+        formulas = [self._as_formula(element) for element in elements[::2]]
+        operators = list(elements[1::2])
 
         self.stack = []
 
-        if isinstance(first, list):
-            return [first]
-        return first
+        if not operators:
+            return formulas[0]
+
+        def formula(fuzz_result):
+            # Every part is evaluated, without short-circuiting
+            values = [part(fuzz_result) for part in formulas]
+            first = values[0]
+            for exp_operator, value in zip(operators, values[1:]):
+                if exp_operator == "and":
+                    first = first and value
+                elif exp_operator == "or":
+                    first = first or value
+            return first
+
+        return formula
 
     def __compute_not_operator(self, tokens):
         operator, value = tokens
+        value_formula = self._as_formula(value)
 
         if operator == "not":
-            return not value
+            return lambda fuzz_result: not value_formula(fuzz_result)
 
-        if isinstance(value, list):
-            return [value]
-        return value
+        return value_formula
 
     def __compute_formula(self, tokens):
         return self.__myreduce(tokens[0])
@@ -313,13 +369,9 @@ class FuzzResFilter(BaseFilter):
     def is_filtered(self, fuzz_result, filter_string=None):
         if filter_string is None:
             filter_string = self.filter_string
-        self.fuzz_result = fuzz_result
+        formula = self._compile(filter_string)
         try:
-            return not self.finalformula.parseString(filter_string, parseAll=True)[0]
-        except ParseException as e:
-            raise FuzzExceptIncorrectFilter(
-                f"Incorrect filter expression \"{filter_string}\", check documentation. \n{str(e)}"
-            )
+            return not formula(fuzz_result)
         except AttributeError as e:
             raise FuzzExceptIncorrectFilter(
                 "It is only possible to use advanced filters when using a non-string payload. %s"
@@ -9,6 +9,9 @@ import re
 class FuzzResSimpleFilter(BaseFilter):
     """
     Filter class triggered when options such as --hc 404 are used on the cli.
+
+    The identifiers are kept in frozensets. The status code is checked first, as it is known without the body, and the
+    regex is only run over the body if the identifiers did not already filter the result out.
     """
     def __init__(self):
         super().__init__()
@@ -16,57 +19,97 @@ class FuzzResSimpleFilter(BaseFilter):
         self.hide_identifier: Optional[bool] = None
         self.show_regex: Optional[bool] = None
         self.hide_regex: Optional[bool] = None
-        self.codes: list[int] = []
-        self.words: list[int] = []
-        self.lines: list[int] = []
+        self.codes: frozenset[int] = frozenset()
+        self.words: frozenset[int] = frozenset()
+        self.lines: frozenset[int] = frozenset()
         self.chars: list[int] = []
         # Previously referred to as "chars"
-        self.size: list[int] = []
+        self.size: frozenset[int] = frozenset()
         self.regex: Optional[re.Pattern] = None
 
-    def is_filtered(self, fuzz_result):
-        # Check if the response should be filtered according to the identifiers (hide words, show lines, etc.)
+    @property
+    def codes(self) -> frozenset[int]:
+        return self._codes
+
+    @codes.setter
+    def codes(self, codes) -> None:
+        self._codes = frozenset(codes)
+
+    @property
+    def words(self) -> frozenset[int]:
+        return self._words
+
+    @words.setter
+    def words(self, words) -> None:
+        self._words = frozenset(words)
+
+    @property
+    def lines(self) -> frozenset[int]:
+        return self._lines
+
+    @lines.setter
+    def lines(self, lines) -> None:
+        self._lines = frozenset(lines)
+
+    @property
+    def size(self) -> frozenset[int]:
+        return self._size
+
+    @size.setter
+    def size(self, size) -> None:
+        self._size = frozenset(size)
+
+    def _matches_identifier(self, fuzz_result) -> bool:
+        # The metrics are only looked at if there is an identifier for them
+        return (
+                fuzz_result.code in self.codes
+                or (self.lines and fuzz_result.lines in self.lines)
+                or (self.words and fuzz_result.words in self.words)
+                or (self.size and fuzz_result.chars in self.size)
+        )
+
+    def is_filtered_by_identifier(self, fuzz_result) -> bool:
+        """
+        Check if the response should be filtered according to the identifiers (hide words, show lines, etc.)
+        """
         if self.show_identifier:
             # Filter out if not in show identifiers
-            if (
-                    fuzz_result.code in self.codes
-                    or fuzz_result.lines in self.lines
-                    or fuzz_result.words in self.words
-                    or fuzz_result.chars in self.size
-            ):
-                filtered_via_identifier = False
-            else:
-                filtered_via_identifier = True
+            return not self._matches_identifier(fuzz_result)
         elif self.hide_identifier:
             # Filter out if in hide identifiers
-            if (
-                    fuzz_result.code in self.codes
-                    or fuzz_result.lines in self.lines
-                    or fuzz_result.words in self.words
-                    or fuzz_result.chars in self.size
-            ):
-                filtered_via_identifier = True
-            else:
-                filtered_via_identifier = False
-        else:
-            filtered_via_identifier = False
+            return bool(self._matches_identifier(fuzz_result))
+        return False
 
+    def is_filtered_by_regex(self, fuzz_result) -> bool:
         if self.show_regex:
             # Filter if not found in regex
-            if self.regex.search(fuzz_result.history.content):
-                filtered_via_regex = False
-            else:
-                filtered_via_regex = True
+            return not self.regex.search(fuzz_result.history.content)
         elif self.hide_regex:
             # Filter if found in regex
-            if self.regex.search(fuzz_result.history.content):
-                filtered_via_regex = True
-            else:
-                filtered_via_regex = False
-        else:
-            filtered_via_regex = False
+            return bool(self.regex.search(fuzz_result.history.content))
+        return False
+
+    def is_filtered(self, fuzz_result):
+        return self.is_filtered_by_identifier(fuzz_result) or self.is_filtered_by_regex(fuzz_result)
 
-        return filtered_via_identifier or filtered_via_regex
+    def is_filtered_by_headers(self, code: int) -> bool:
+        """
+        Check if a response is filtered for sure, judging only by the status code a HEAD request returns. The size
+        filters count the characters of the decoded body, which the Content-Length of a HEAD response does not
+        reliably tell, so the body is always needed if one is set.
+
+        Returns False if the body would be needed to decide.
+        """
+        if self.size:
+            return False
+        if self.show_identifier:
+            # Lines and words can't be known without the body
+            if self.lines or self.words:
+                return False
+            return code not in self.codes
+        elif self.hide_identifier:
+            return code in self.codes
+        return False
 
     @staticmethod
     def from_options(session):
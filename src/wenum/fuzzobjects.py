@@ -1,23 +1,23 @@
 from __future__ import annotations
 
 import datetime
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Callable, Optional
 
 if TYPE_CHECKING:
     from wenum.fuzzrequest import FuzzRequest
 import time
-import hashlib
-import re
 import itertools
 from enum import Enum
 
 from threading import Lock
+from urllib.parse import urlparse
 from collections import defaultdict, namedtuple
 
 from .filters.complexfilter import FuzzResFilter
 from .facade import ERROR_CODE
-from .helpers.str_func import convert_to_unicode
 from .helpers.utils import MyCounter
+from .helpers.timing import TimingHistograms
+from .helpers.metrics import EMPTY_CONTENT_METRICS, ContentMetrics
 
 FuzzWord = namedtuple("FuzzWord", ["content", "type"])
 
@@ -100,6 +100,14 @@ class FuzzStats:
         # Tracks how many hits have been found in a subdir.
         self.subdir_hits = {}
 
+        # Processed, filtered and found requests of each target (scheme://host:port) if several targets are scanned.
+        # Empty otherwise
+        self.target_stats: dict[str, dict[str, int]] = {}
+
+        # Histograms of the transfer phases of the responses, per host (scheme://host:port) and per seed URL
+        self.timing_by_host: dict[str, TimingHistograms] = {}
+        self.timing_by_seed: dict[str, TimingHistograms] = {}
+
         self.totaltime = 0
         self.starttime: float = 0
 
@@ -112,9 +120,70 @@ class FuzzStats:
         tmp_stats.url = session.compiled_seed.history.url
         tmp_stats.wordlist_req = session.compiled_iterator.count()
         tmp_stats.seed = session.compiled_seed
+        if len(session.compiled_target_seeds) > 1:
+            for seed in session.compiled_target_seeds:
+                tmp_stats.target_stats[FuzzStats.get_target(seed.history.url)] = {"Processed": 0, "Filtered": 0,
+                                                                                   "Hits": 0}
 
         return tmp_stats
 
+    @staticmethod
+    def get_target(url: str) -> str:
+        """
+        Return the target a URL belongs to, which is its scheme and network location
+        """
+        parsed_url = urlparse(url)
+        return f"{parsed_url.scheme}://{parsed_url.netloc}"
+
+    def target_of(self, fuzz_result: FuzzResult) -> Optional[str]:
+        """
+        Return the target of the result if several targets are scanned, None otherwise
+        """
+        if not self.target_stats:
+            return None
+        target = self.get_target(fuzz_result.url)
+        return target if target in self.target_stats else None
+
+    def update_target_stats(self, fuzz_result: FuzzResult) -> None:
+        target = self.target_of(fuzz_result)
+        if target is None:
+            return
+        with self.mutex:
+            target_stats = self.target_stats[target]
+            target_stats["Processed"] += 1
+            if fuzz_result.discarded:
+                target_stats["Filtered"] += 1
+            else:
+                target_stats["Hits"] += 1
+
+    def update_timing_stats(self, fuzz_result: FuzzResult) -> None:
+        timings = fuzz_result.history.timings
+        if not timings:
+            return
+        host = self.get_target(fuzz_result.url)
+        with self.mutex:
+            if host not in self.timing_by_host:
+                self.timing_by_host[host] = TimingHistograms()
+            self.timing_by_host[host].add(timings)
+            if fuzz_result.seed_url:
+                if fuzz_result.seed_url not in self.timing_by_seed:
+                    self.timing_by_seed[fuzz_result.seed_url] = TimingHistograms()
+                self.timing_by_seed[fuzz_result.seed_url].add(timings)
+
+    def timing_summary(self, max_seeds: int = 10) -> str:
+        """
+        Mean and p95 of each transfer phase per host, and of the seeds with the slowest responses
+        """
+        with self.mutex:
+            lines = [f"{host} ({histograms.count} responses): {histograms.summary()}"
+                     for host, histograms in self.timing_by_host.items()]
+            slowest_seeds = sorted(self.timing_by_seed.items(),
+                                   key=lambda seed_histograms: seed_histograms[1].phases["total"].mean,
+                                   reverse=True)[:max_seeds]
+            lines += [f"{seed} ({histograms.count} responses): {histograms.summary()}"
+                      for seed, histograms in slowest_seeds]
+        return "\n".join(lines)
+
     def get_runtime_stats(self):
         """Return stats of current runtime as dict.
         Data included is tailored towards being used during the runtime, not at the end of it"""
@@ -181,6 +250,8 @@ class FuzzStats:
             "Requests/s: %s\n"
             % str(int(self.processed() / totaltime) if totaltime > 0 else 0)[:8]
         )
+        for target, target_stats in self.target_stats.items():
+            string += f"{target}: " + ", ".join(f"{name} {value}" for name, value in target_stats.items()) + "\n"
 
         return string
 
@@ -194,13 +265,17 @@ class FuzzStats:
         self.pending_fuzz._operation(fuzzstats2.pending_fuzz())
         self.filtered._operation(fuzzstats2.filtered())
         self.pending_seeds._operation(fuzzstats2.pending_seeds())
+        self.target_stats = {target: dict(target_stats) for target, target_stats in fuzzstats2.target_stats.items()}
+        self.timing_by_host = dict(fuzzstats2.timing_by_host)
+        self.timing_by_seed = dict(fuzzstats2.timing_by_seed)
 
-    def new_seed(self):
+    def new_seed(self, targets: int = 1):
         """
-        Called to execute relevant stat updates when a new seed is created
+        Called to execute relevant stat updates when a new seed is created. The initial seed sends the wordlist to
+        each of the targets
         """
         self.pending_seeds.inc()
-        self.total_req += self.wordlist_req
+        self.total_req += self.wordlist_req * targets
 
     def new_backfeed(self):
         """
@@ -323,10 +398,8 @@ class FuzzResult(FuzzItem):
         self.rlevel_desc: str = ""
         self.result_number: int = next(FuzzResult.newid)
 
-        self.chars: int = 0
-        self.lines: int = 0
-        self.words: int = 0
-        self.md5: str = ""
+        # Size metrics of the response content, computed when first needed. See content_metrics
+        self._content_metrics: Optional[ContentMetrics] = None
 
         self.update()
 
@@ -338,6 +411,13 @@ class FuzzResult(FuzzItem):
         # Bool indicating whether this object is initialized by a plugin.
         self.from_plugin: bool = False
 
+        # URL of the seed the request has been generated from, with its fuzzing marker
+        self.seed_url: str = ""
+
+        # Set on internal requests, e.g. the false positive probes. Their results are passed to this function instead
+        # of being processed like the other results
+        self.probe_callback: Optional[Callable[[FuzzResult], None]] = None
+
         # Variable to keep track of how often a specific object has been parsed for a new URL and requeued.
         # In case a plugin interaction with an applications runs into an endless re-queuing-chain, this will help
         # stop after a limit is reached.
@@ -348,24 +428,56 @@ class FuzzResult(FuzzItem):
         if exception:
             self.exception = exception
 
-        if self.history and self.history.content:
-            m = hashlib.md5()
-            m.update(convert_to_unicode(self.history.content))
-            self.md5 = m.hexdigest()
-
-            self.chars = len(self.history.content)
-            self.lines = self.history.content.count("\n")
-            self.words = len(re.findall(r"\S+", self.history.content))
-        # Explicitly resetting these. As recursive requests are copies from the prior FuzzResult object,
-        # this otherwise may retain the data from the previous result
-        else:
-            self.md5 = ""
-            self.chars = 0
-            self.lines = 0
-            self.words = 0
+        # The response may have changed. As recursive requests are copies from the prior FuzzResult object,
+        # the metrics otherwise may be the ones of the previous result
+        self._content_metrics = None
 
         return self
 
+    @property
+    def content_metrics(self) -> ContentMetrics:
+        """
+        The size metrics of the response content. They are computed on first access and cached until update() is
+        called, as counting the words of a large body is wasted on runs that only look at the status code
+        """
+        if self._content_metrics is None:
+            metrics = self.history.content_metrics if self.history else None
+            # Checking the metrics instead of the content avoids decoding bodies which are never looked at
+            self._content_metrics = metrics if metrics and metrics.chars else EMPTY_CONTENT_METRICS
+        return self._content_metrics
+
+    @property
+    def chars(self) -> int:
+        return self.content_metrics.chars
+
+    @chars.setter
+    def chars(self, chars: int):
+        self._content_metrics = self.content_metrics._replace(chars=chars)
+
+    @property
+    def lines(self) -> int:
+        return self.content_metrics.lines
+
+    @lines.setter
+    def lines(self, lines: int):
+        self._content_metrics = self.content_metrics._replace(lines=lines)
+
+    @property
+    def words(self) -> int:
+        return self.content_metrics.words
+
+    @words.setter
+    def words(self, words: int):
+        self._content_metrics = self.content_metrics._replace(words=words)
+
+    @property
+    def md5(self) -> str:
+        return self.content_metrics.md5
+
+    @md5.setter
+    def md5(self, md5: str):
+        self._content_metrics = self.content_metrics._replace(md5=md5)
+
     def __str__(self):
         fuzz_result = '%05d:  C=%03d   %4d L\t   %5d W\t  %5d Ch\t  "%s"\t "%s"' % (
             self.result_number,
@@ -15,13 +15,14 @@ if TYPE_CHECKING:
     from wenum.plugin_api.base import BasePlugin
     from wenum.printers import BasePrinter
     from wenum.externals.reqresp.cache import HttpCache
+    from wenum.transport import Transport
 from threading import Thread, Event, Condition
 from queue import Queue
-from wenum.externals.reqresp.Response import get_encoding_from_headers
 
 from .factories.fuzzresfactory import resfactory
 from .factories.plugin_factory import plugin_factory
-from .helpers.obj_dic import FixSizeOrderedDict
+from .autofilter import Autofilter, Signature
+from .soft404 import Soft404Detector
 from .fuzzobjects import FuzzType, FuzzItem, FuzzWord, FuzzWordType, FuzzResult, FuzzPlugin
 from .myqueues import FuzzQueue, FuzzListQueue
 from .exception import (
@@ -30,10 +31,8 @@ from .exception import (
     FuzzExceptPluginLoadError,
 )
 from .filters.base_filter import BaseFilter
-from .filters.complexfilter import FuzzResFilter
 from .facade import Facade, ERROR_CODE
 from .ui.console.mvc import View
-import requests
 import re
 
 
@@ -78,26 +77,29 @@ class SeedQueue(FuzzQueue):
         # STARTSEED used by the first item when wenum starts
         if fuzz_item.item_type == FuzzType.STARTSEED:
             self.add_initial_recursion_to_cache()
-            self.stats.new_seed()
+            self.stats.new_seed(targets=len(self.session.compiled_target_seeds))
+            # The wordlist is sent to all targets at once
+            seeds = self.session.compiled_target_seeds
         elif fuzz_item.item_type == FuzzType.SEED:
             self.restart(fuzz_item)
+            seeds = [fuzz_item]
         else:
             raise FuzzExceptInternalError("SeedQueue: Unknown item type in queue!")
 
         if self.session.options.limit_requests:
             if not self.session.http_pool.queued_requests > self.session.options.limit_requests:
-                self.send_dictionary()
+                self.send_dictionary(seeds)
             else:
                 self.end_seed()
         else:
-            self.send_dictionary()
+            self.send_dictionary(seeds)
 
-    def get_fuzz_res(self, dictio_item: tuple) -> FuzzResult:
+    def get_fuzz_res(self, dictio_item: tuple, seed: FuzzResult = None) -> FuzzResult:
         """
         Create FuzzResult object from FuzzWord
         """
         return resfactory.create(
-            "fuzzres_from_options_and_dict", self.session, dictio_item
+            "fuzzres_from_options_and_dict", self.session, dictio_item, seed
         )
 
     def add_initial_recursion_to_cache(self):
@@ -105,19 +107,28 @@ class SeedQueue(FuzzQueue):
         Since on startup there is always a recursion on the base FUZZ dir, it needs to be added to the cache
         to avoid e.g. plugins to enqueue a second recursion on it
         """
-        key = self.session.options.url.replace("FUZZ", "")
-        self.session.cache.check_cache(url_key=key, cache_type="recursion")
+        for url in self.session.options.url_list:
+            key = url.replace("FUZZ", "")
+            self.session.cache.check_cache(url_key=key, cache_type="recursion")
 
-    def send_dictionary(self):
+    def send_word(self, fuzz_word: tuple, seeds: list[FuzzResult]):
+        """
+        Send the request of the word for each seed. Alternating between the seeds spreads the requests evenly
+        between several targets
+        """
+        for seed in seeds:
+            fuzz_result = self.get_fuzz_res(fuzz_word, seed)
+            # Only send out if it's not already in the cache
+            if not self.session.cache.check_cache(fuzz_result.url):
+                self.stats.pending_fuzz.inc()
+                self.send(fuzz_result)
+
+    def send_dictionary(self, seeds: list[FuzzResult]):
         """
         Send the requests of the wordlist
         """
         # Ensure that a request is sent to the base of the FUZZ path
-        fuzz_word = (FuzzWord("", FuzzWordType.WORD),)
-        fuzz_result = self.get_fuzz_res(fuzz_word)
-        if not self.session.cache.check_cache(fuzz_result.url):
-            self.stats.pending_fuzz.inc()
-            self.send(fuzz_result)
+        self.send_word((FuzzWord("", FuzzWordType.WORD),), seeds)
 
         # Check if the payload dictionary is empty to begin with
         try:
@@ -130,20 +141,11 @@ class SeedQueue(FuzzQueue):
             while fuzz_word:
                 if self.session.compiled_stats.cancelled:
                     break
-                fuzz_result = self.get_fuzz_res(fuzz_word)
-                # Only send out if it's not already in the cache
-                if not self.session.cache.check_cache(fuzz_result.url):
-                    self.stats.pending_fuzz.inc()
-                    self.send(fuzz_result)
+                self.send_word(fuzz_word, seeds)
 
                 # generate additional requests for the extensions
                 for extension in self.extensions:
-                    fuzz_word_ext = (FuzzWord(fuzz_word[0][0] + extension, FuzzWordType.WORD),)
-                    fuzz_res_ext = self.get_fuzz_res(fuzz_word_ext)
-
-                    if not self.session.cache.check_cache(fuzz_res_ext.url):
-                        self.stats.pending_fuzz.inc()
-                        self.send(fuzz_res_ext)
+                    self.send_word((FuzzWord(fuzz_word[0][0] + extension, FuzzWordType.WORD),), seeds)
 
                 fuzz_word = next(self.session.compiled_iterator)
         except StopIteration:
@@ -274,6 +276,10 @@ class RoutingQueue(FuzzQueue):
             self.send(fuzz_result)
 
 
+# Maximum amount of results the FilterQueue takes from its queue at once
+FILTER_BLOCK_SIZE = 256
+
+
 class FilterQueue(FuzzQueue):
     """
     Queue designed to filter out unwanted requests
@@ -289,26 +295,30 @@ class FilterQueue(FuzzQueue):
         return "FilterQueue"
 
     def process(self, fuzz_result: FuzzResult):
-
-        if self.ffilter.is_filtered(fuzz_result):
-            self.discard(fuzz_result)
-        else:
-            self.send(fuzz_result)
+        # The results already waiting behind this one are filtered together with it
+        fuzz_results = [fuzz_result] + self.get_waiting(FuzzType.RESULT, FILTER_BLOCK_SIZE - 1)
+        try:
+            for result, filtered in zip(fuzz_results, self.ffilter.filter_many(fuzz_results)):
+                if filtered:
+                    self.discard(result)
+                else:
+                    self.send(result)
+        finally:
+            # run() marks the first one as done
+            for _ in fuzz_results[1:]:
+                self.task_done()
 
 
 class AutofilterQueue(FuzzQueue):
     """
-    Queue activated with the autofilter option. During runtime, it will keep track of the most
-    recent kinds of results within a path, and if they repeat too often, will discard those if they occur in that dir.
+    Queue activated with the autofilter option. During runtime, it will keep track of the kinds of results within
+    each directory, and if they repeat too often, will discard those if they occur in that directory.
     """
 
     def __init__(self, session: FuzzSession):
         super().__init__(session)
 
-        # The filter that gets adjusted during runtime
-        self.filter = FuzzResFilter()
-        # Tracks 15 identifiers from responses in total. If more are found, the oldest one gets removed by expiry (FIFO)
-        self.response_tracker_dict = FixSizeOrderedDict(maximum_length=15)
+        self.autofilter = Autofilter(session.options.auto_filter_threshold, session.options.auto_filter_expiry)
 
     def get_name(self):
         return "AutofilterQueue"
@@ -320,46 +330,21 @@ class AutofilterQueue(FuzzQueue):
             self.send(fuzz_result)
             return
 
-        # Only process if there isn't a filter (yet) or isn't filtered out by the path's filter
-        if not self.filter.filter_string or not self.filter.is_filtered(fuzz_result):
-            self.update_response_tracker(fuzz_result)
-            self.send(fuzz_result)
-        else:
+        if self.autofilter.is_filtered(fuzz_result):
             self.discard(fuzz_result)
+            return
 
-    def update_response_tracker(self, fuzz_result: FuzzResult):
-        """
-        Update the path's dict of how often a response has been seen
-        """
-        # The identifier is supposed to identify duplicate responses
-        response_identifier = f"c={fuzz_result.code} and l={fuzz_result.lines} and w={fuzz_result.words}"
-        try:
-            self.response_tracker_dict[response_identifier] += 1
-            # If it's been detected 10 times, it should be added to the filter
-            if self.response_tracker_dict[response_identifier] >= 10:
-                self.update_filter(fuzz_result, response_identifier)
-                # Tracking a filtered response type is not necessary, therefore gets popped
-                self.response_tracker_dict.pop(response_identifier)
-            else:
-                # When a hit is found, it should be moved to the beginning,
-                # preventing it from getting popped right after
-                self.response_tracker_dict.move_to_end(response_identifier)
-        # If the identifier is not in the dict, simply set the counter to 1. Uncritical exception
-        except KeyError:
-            self.response_tracker_dict[response_identifier] = 1
-
-    def update_filter(self, fuzz_result: FuzzResult, identifier: str):
+        signature = self.autofilter.observe(fuzz_result)
+        if signature:
+            self.report_filter(fuzz_result, signature)
+        self.send(fuzz_result)
+
+    def report_filter(self, fuzz_result: FuzzResult, signature: Signature):
         """
-        Update the filter with the identifier of the response
+        Tell the user that the response of the result is filtered out in its directory from now on
         """
-        filter_string = f"not ({identifier})"
-        # If a filter already exists, add the next identifier as an additional filter condition.
-        # Duplicate conditions should have no chance of occurring, as responses that already are added once
-        # to the filter should start to get discarded from the beginning
-        if not self.filter.filter_string:
-            self.filter.filter_string = filter_string
-        else:
-            self.filter.filter_string = f"{self.filter.filter_string} and {filter_string}"
+        code, lines, words = signature
+        identifier = f"c={code} and l={lines} and w={words}"
         if 300 <= fuzz_result.code < 400:
             redirect_string = ". Redirects will still be followed in the background."
         else:
@@ -367,7 +352,38 @@ class AutofilterQueue(FuzzQueue):
         fuzz_result.plugins_res.append(
             plugin_factory.create("plugin_from_finding", self.get_name(),
                                   f"Recurring response detected. Filtering out "
-                                  f"'[u]{identifier}[/u]'{redirect_string}", FuzzPlugin.INFO))
+                                  f"'[u]{identifier}[/u]' in {self.autofilter.directory(fuzz_result)}"
+                                  f"{redirect_string}", FuzzPlugin.INFO))
+
+
+class Soft404Queue(FuzzQueue):
+    """
+    Queue activated with the soft-404 option. Discards results which look like the answer of their directory to
+    paths that do not exist. Results wait in the queue's callback until the baseline of their directory is known,
+    instead of blocking the queue in the meantime.
+    """
+
+    def __init__(self, session: FuzzSession):
+        super().__init__(session)
+
+        self.detector = Soft404Detector(session.http_pool, session.options.soft_404_distance)
+
+    def get_name(self):
+        return "Soft404Queue"
+
+    def process(self, fuzz_result: FuzzResult):
+        # Errored requests, HEAD requests without a body and results without a seed directory can not be compared
+        if fuzz_result.code == ERROR_CODE or fuzz_result.history.method == "HEAD" or not fuzz_result.seed_url:
+            self.send(fuzz_result)
+            return
+
+        soft_404 = self.detector.is_soft_404(fuzz_result)
+        if soft_404 is None:
+            self.detector.when_ready(fuzz_result, lambda: self.put(fuzz_result))
+        elif soft_404:
+            self.discard(fuzz_result)
+        else:
+            self.send(fuzz_result)
 
 
 class PluginQueue(FuzzListQueue):
@@ -406,6 +422,7 @@ class PluginExecutor(FuzzQueue):
         self.cache: HttpCache = session.cache
         self.max_rlevel = session.options.recursion
         self.max_plugin_rlevel = session.options.plugin_recursion
+        self.false_positive_probes = session.false_positive_probes
         self.interrupt = Event()
         self.condition = Condition()
 
@@ -435,6 +452,8 @@ class PluginExecutor(FuzzQueue):
         queued_dict: dict[dict[str, int]] = {}
         # Keeps track of all the plugins signal for completion
         plugin_signal_dict: dict = {}
+        # Seeds waiting for their false positive probes, with the name of the plugin that created them
+        deferred_seeds: list[tuple[str, FuzzResult]] = []
         for plugin in self.active_plugins:
             plugin_finished = Event()
             if plugin.disabled or not plugin.validate(fuzz_result):
@@ -469,11 +488,18 @@ class PluginExecutor(FuzzQueue):
                     plugins_res_queue.join()
                     break
                 elif self.check_all_plugins_done(plugin_signal_dict):
-                    self.process_results(fuzz_result, plugins_res_queue, queued_dict)
+                    deferred_seeds = self.process_results(fuzz_result, plugins_res_queue, queued_dict)
                     break
                 else:
                     self.condition.wait()
 
+        if deferred_seeds:
+            # The result is held back until the probes returned, so that it reports the seeds that have been queued
+            self.false_positive_probes.when_ready(
+                [seed for plugin_name, seed in deferred_seeds],
+                lambda: self.send_deferred_seeds(fuzz_result, deferred_seeds, queued_dict))
+            return
+        self.add_queued_summary(fuzz_result, queued_dict)
         self.send(fuzz_result)
 
     @staticmethod
@@ -489,11 +515,14 @@ class PluginExecutor(FuzzQueue):
             return True
 
     def process_results(self, fuzz_result: FuzzResult, plugins_res_queue: Queue,
-                        queued_dict: dict) -> None:
+                        queued_dict: dict) -> list[tuple[str, FuzzResult]]:
         """
         Plugin results are polled from plugins_res_queue. Every plugin gets processed. Information gets appended
-        to the fuzzresult on which the plugins ran, backfeed and seed objects are created if appropriate
+        to the fuzzresult on which the plugins ran, backfeed and seed objects are created if appropriate.
+
+        Returns the seeds whose false positive probes have not returned yet, with the names of their plugins
         """
+        deferred_seeds = []
         # A URL could theoretically cause further backfeeds to be created indefinitely. Taking 15 as an arbitrary
         # value to avoid infinite backfeeds
         requeue_limit = 15
@@ -514,7 +543,8 @@ class PluginExecutor(FuzzQueue):
                 fuzz_result.plugins_res.append(plugin)
             # If it has a seed (BACKFEED/SEED) and goes over http
             elif plugin.seed and not self.session.options.dry_run:
-                in_scope = fuzz_result.history.check_in_scope(plugin.seed.history.url, self.session.options.domain_scope)
+                in_scope = fuzz_result.history.check_in_scope(plugin.seed.history.url, self.session.options.domain_scope,
+                                                              self.session.dns_cache)
                 if not in_scope:
                     continue
                 if plugin.seed.item_type == FuzzType.BACKFEED:
@@ -536,8 +566,12 @@ class PluginExecutor(FuzzQueue):
                     # For SEED Plugin objects, the rlevel needs to be checked as well
                     if fuzz_result.plugin_rlevel >= self.max_plugin_rlevel:
                         continue
+                    false_positive = self.false_positive_probes.is_false_positive(plugin.seed)
+                    if false_positive is None:
+                        deferred_seeds.append((plugin.name, plugin.seed))
+                        continue
                     # If the URL is deemed a false positive, don't throw a recursion
-                    elif RecursiveQueue.false_positive_hit(seed=plugin.seed, session=self.session, logger=self.logger):
+                    elif false_positive:
                         continue
                     queued_dict[plugin.name]["queued_seeds"] += 1
                 else:
@@ -555,7 +589,40 @@ class PluginExecutor(FuzzQueue):
                 if not self.cache.check_cache(plugin.seed.history.url, cache_type=cache_type, update=True):
                     self.send(plugin.seed)
             plugins_res_queue.task_done()
-        # After all the individual results have been processed, print the amount of requests queued by each plugin
+        # Print the URLs that have not been requeued due to the limit
+        if limit_exceeded_urls:
+            output_string = ""
+            for plugin_name, url_list in limit_exceeded_urls.items():
+                output_string += f"{plugin_name}:" + "\n" + str(url_list)
+
+            fuzz_result.plugins_res.append(plugin_factory.create(
+                "plugin_from_finding", name=self.name,
+                message=f"The following plugins intended to queue URLs that exceed the limit of 15 in a chain. "
+                        f"To avoid infinite re-queueing, the listed URLs have not been queued again.\n"
+                        f"{output_string}",
+                severity=FuzzPlugin.INFO))
+        return deferred_seeds
+
+    def send_deferred_seeds(self, fuzz_result: FuzzResult, deferred_seeds: list[tuple[str, FuzzResult]],
+                            queued_dict: dict) -> None:
+        """
+        Called once the false positive probes of the deferred seeds returned. Sends the legitimate seeds, and
+        the result they originate from afterwards
+        """
+        for plugin_name, seed in deferred_seeds:
+            if self.false_positive_probes.is_false_positive(seed):
+                continue
+            queued_dict[plugin_name]["queued_seeds"] += 1
+            if not self.cache.check_cache(seed.history.url, cache_type="recursion", update=True):
+                self.send(seed)
+        self.add_queued_summary(fuzz_result, queued_dict)
+        self.send(fuzz_result)
+
+    @staticmethod
+    def add_queued_summary(fuzz_result: FuzzResult, queued_dict: dict) -> None:
+        """
+        After all the individual results have been processed, print the amount of requests queued by each plugin
+        """
         for plugin_name, plugin_dict in queued_dict.items():
             # Only if the plugin queued a request at all
             if plugin_dict["queued_requests"]:
@@ -571,18 +638,6 @@ class PluginExecutor(FuzzQueue):
                     "plugin_from_finding", name=plugin_name,
                     message=f"Enqueued [u]{plugin_dict['queued_seeds']} seed{multiple}[/u]",
                     severity=FuzzPlugin.INFO))
-        # Print the URLs that have not been requeued due to the limit
-        if limit_exceeded_urls:
-            output_string = ""
-            for plugin_name, url_list in limit_exceeded_urls.items():
-                output_string += f"{plugin_name}:" + "\n" + str(url_list)
-
-            fuzz_result.plugins_res.append(plugin_factory.create(
-                "plugin_from_finding", name=self.name,
-                message=f"The following plugins intended to queue URLs that exceed the limit of 15 in a chain. "
-                        f"To avoid infinite re-queueing, the listed URLs have not been queued again.\n"
-                        f"{output_string}",
-                severity=FuzzPlugin.INFO))
 
 
 class RedirectQueue(FuzzQueue):
@@ -622,7 +677,8 @@ class RedirectQueue(FuzzQueue):
         # Join both URLs. If it's relative, will append to the base URL. Otherwise, will use link_url's netloc
         target_url = urljoin(fuzz_result.url, link_url)
 
-        in_scope = fuzz_result.history.check_in_scope(target_url, domain_based=self.session.options.domain_scope)
+        in_scope = fuzz_result.history.check_in_scope(target_url, domain_based=self.session.options.domain_scope,
+                                                      dns_cache=self.session.dns_cache)
         if not in_scope:
             fuzz_result.plugins_res.append(plugin_factory.create(
                 "plugin_from_finding", name=self.get_name(),
@@ -656,6 +712,7 @@ class RecursiveQueue(FuzzQueue):
         self.cache = session.cache
         self.max_rlevel = session.options.recursion
         self.max_plugin_rlevel = session.options.plugin_recursion
+        self.false_positive_probes = session.false_positive_probes
 
     def get_name(self):
         return "RecursiveQueue"
@@ -687,22 +744,30 @@ class RecursiveQueue(FuzzQueue):
                 plugin_factory.create("plugin_from_finding", self.get_name(),
                                       f"Skipped recursion - " + max_recursion_condition +
                                       f" for {recursion_url}", FuzzPlugin.INFO))
-        # Or if the recursion URL is deemed a false positive. This check should be the last, as it is the costliest.
-        elif self.false_positive_hit(seed, self.session, self.logger):
-            fuzz_result.plugins_res.append(
-                plugin_factory.create("plugin_from_finding", self.get_name(),
-                                      f"Permanent redirect detected for "
-                                      f"{recursion_url} - skipped recursion", FuzzPlugin.INFO))
-        # Double-checking the cache. The previous cache checks help avoid extensive checks if it is
-        # in the cache already, but a cache check right before sending the seed is necessary
-        # to reduce race conditions.
-        elif not self.cache.check_cache(recursion_url, cache_type="recursion", update=True):
-            # Send the seed
-            self.send(seed)
-            fuzz_result.plugins_res.append(plugin_factory.create(
-                "plugin_from_finding", name=self.get_name(),
-                message=f"Enqueued path {recursion_url} for [u]recursion[/u] "
-                        f"(rlevel={seed.rlevel}, plugin_rlevel={seed.plugin_rlevel})", severity=FuzzPlugin.INFO))
+        else:
+            # Check if the recursion URL is deemed a false positive. This check should be the last, as it is the
+            # costliest.
+            false_positive = self.false_positive_probes.is_false_positive(seed)
+            if false_positive is None:
+                # The probes of the directory are still running. The result comes back to this queue once they
+                # returned, instead of blocking the queue in the meantime
+                self.false_positive_probes.when_ready([seed], lambda: self.put(fuzz_result))
+                return
+            elif false_positive:
+                fuzz_result.plugins_res.append(
+                    plugin_factory.create("plugin_from_finding", self.get_name(),
+                                          f"Permanent redirect detected for "
+                                          f"{recursion_url} - skipped recursion", FuzzPlugin.INFO))
+            # Double-checking the cache. The previous cache checks help avoid extensive checks if it is
+            # in the cache already, but a cache check right before sending the seed is necessary
+            # to reduce race conditions.
+            elif not self.cache.check_cache(recursion_url, cache_type="recursion", update=True):
+                # Send the seed
+                self.send(seed)
+                fuzz_result.plugins_res.append(plugin_factory.create(
+                    "plugin_from_finding", name=self.get_name(),
+                    message=f"Enqueued path {recursion_url} for [u]recursion[/u] "
+                            f"(rlevel={seed.rlevel}, plugin_rlevel={seed.plugin_rlevel})", severity=FuzzPlugin.INFO))
         # Sends the current request into the next queue
         self.send(fuzz_result)
 
@@ -720,79 +785,6 @@ class RecursiveQueue(FuzzQueue):
         else:
             return ""
 
-    @staticmethod
-    def false_positive_hit(seed: FuzzResult, session: FuzzSession, logger: logging.Logger) -> bool:
-        """
-        Checks whether server responds with something that looks like a hit an endpoint that does not exist,
-        based on the URL of the FuzzResult
-        Returns True if it is a false positive, False if it is legitimate
-        """
-        if session.options.proxy_list:
-            proxy_string = session.options.proxy_list[0]
-            proxy_dict = {"http": proxy_string,
-                          "https": proxy_string}
-        else:
-            proxy_dict = ""
-        if session.options.header_dict():
-            headers_dict = session.options.header_dict()
-        else:
-            headers_dict = {
-                "User-Agent": "Mozilla/5.0 (X11; Linux x86_64; rv:60.0) Gecko/20100101 Firefox/60.0"
-            }
-        check_string = "thisdoesnotexist123"
-        recursion_url = seed.history.url
-        check_url = recursion_url.replace("FUZZ", check_string)
-        try:
-            junk_response_tuple = RecursiveQueue._get_response_tuple(check_url, headers_dict, proxy_dict)
-        except Exception as e:
-            logger.exception(f"Exception in false_positive_hit during first junk response")
-            return False
-        # If the status code and word count of the junk response is identical, it's pretty much guaranteed to be
-        # a false positive
-        if junk_response_tuple[0] == seed.code and junk_response_tuple[1] == seed.words:
-            return True
-        # If even the status code is different, the initial request was a real hit
-        elif junk_response_tuple[0] != seed.code:
-            return False
-        # Lastly, if the word count is different, but the status code is the same, a third request should be compared
-        # as things are hard to determine (dynamic response content may play a part):
-        check_string = "thisalsodoesnotexist123"
-        check_url = recursion_url.replace("FUZZ", check_string)
-        try:
-            second_junk_response_tuple = RecursiveQueue._get_response_tuple(check_url, headers_dict, proxy_dict)
-        except Exception as e:
-            logger.exception(f"Exception in false_positive_hit during second junk response")
-            return False
-        # If both junk responses are identical, whereas it has been established prior that the word count differs to the
-        # original request, the original one was unique and therefore not a false positive
-        if second_junk_response_tuple[0] == junk_response_tuple[0] and \
-                second_junk_response_tuple[1] == junk_response_tuple[1]:
-            return False
-        # In every other case left, the original response is not unique and
-        # therefore treated as a false positive
-        return True
-
-    @staticmethod
-    def _get_response_tuple(check_url, headers_dict, proxy_dict) -> tuple[int, int]:
-        """
-        Send out the request, parse the response and return it in a tuple, where the first entry is the
-        response status code, and the second entry is the word length
-        """
-        try:
-            junk_response = requests.get(check_url, verify=False,
-                                         headers=headers_dict, allow_redirects=False, proxies=proxy_dict)
-        except Exception as e:
-            raise Exception
-        encoding = get_encoding_from_headers(junk_response.headers)
-        # fallback to default encoding
-        if encoding is None:
-            encoding = "utf-8"
-        junk_string_content = junk_response.content.decode(encoding, errors="replace")
-        # No line comparison as of right now
-        # junk_lines = string_content.count("\n")
-        junk_words = len(re.findall(r"\S+", junk_string_content))
-        return junk_response.status_code, junk_words
-
 
 class DryRunQueue(FuzzQueue):
     """
@@ -824,7 +816,7 @@ class HttpQueue(FuzzQueue):
     def __init__(self, session: FuzzSession):
         super().__init__(session)
 
-        self.http_pool = session.http_pool
+        self.http_pool: Transport = session.http_pool
 
         # Listening for keypress to pause execution
         self.pause = Event()
@@ -853,6 +845,7 @@ class HttpQueue(FuzzQueue):
         self.thread_cancelled.wait()
 
         self.http_pool.thread_cancelled.clear()
+        self.http_pool.wakeup()
         self.http_pool.thread_cancelled.wait()
 
         self.thread.join()
@@ -890,7 +883,9 @@ class HttpQueue(FuzzQueue):
             fuzz_result, requeue = next(self.http_pool.iter_results())
             if not fuzz_result:
                 break
-            if requeue:
+            if fuzz_result.probe_callback:
+                fuzz_result.probe_callback(fuzz_result)
+            elif requeue:
                 self.http_pool.enqueue(fuzz_result)
             else:
                 if fuzz_result.exception and self.session.options.stop_error:
@@ -1,11 +1,15 @@
+import copy
+
 from .facade import Facade
 from urllib.parse import urlparse
+from typing import Optional
 
 from .externals.reqresp import Request, Response
 from .exception import FuzzExceptBadAPI, FuzzExceptBadOptions
 from .mixins import FuzzRequestUrlMixing
 
 from .helpers.obj_dic import DotDict
+from .helpers.metrics import ContentMetrics, compute_content_metrics
 
 
 class Headers:
@@ -136,6 +140,8 @@ class FuzzRequest(FuzzRequestUrlMixing):
         self._proxy = None
         self.retries = 0
         self.ip = None
+        # Set while the request is sent as HEAD to check whether the GET response would be filtered anyway
+        self.head_probe = False
         # Original url retains the URL that has been specified for fuzzing, such as http://example.com/FUZZ
         self.fuzzing_url = ""
 
@@ -229,6 +235,27 @@ class FuzzRequest(FuzzRequestUrlMixing):
     def content(self, content):
         self._request.content = content
 
+    @property
+    def raw_content_bytes(self) -> bytes:
+        """
+        The body as received, without decoding it
+        """
+        return self._request.response.raw_content_bytes if self._request.response else b""
+
+    @property
+    def content_metrics(self) -> ContentMetrics:
+        """
+        Returns the size metrics of the response content
+        """
+        if not self._request.response:
+            return compute_content_metrics("")
+        metrics = getattr(self._request.response, "content_metrics", None)
+        if metrics is None:
+            metrics = compute_content_metrics(self.content)
+            # Parsing another response into the object resets them
+            self._request.response.content_metrics = metrics
+        return metrics
+
     @property
     def code(self):
         """
@@ -248,6 +275,14 @@ class FuzzRequest(FuzzRequestUrlMixing):
     def reqtime(self, time):
         self._request.totaltime = time
 
+    @property
+    def timings(self) -> Optional[dict[str, float]]:
+        return self._request.timings
+
+    @timings.setter
+    def timings(self, timings: Optional[dict[str, float]]):
+        self._request.timings = timings
+
     @property
     def date(self):
         return self._request.date
@@ -271,6 +306,15 @@ class FuzzRequest(FuzzRequestUrlMixing):
 
         return self._request
 
+    def copy_without_response(self) -> "FuzzRequest":
+        """
+        Shallow copy of the request for sending it again, which does not carry over the response of this one
+        """
+        fuzz_request = copy.copy(self)
+        fuzz_request._request = copy.copy(self._request)
+        fuzz_request._request.response = None
+        return fuzz_request
+
     def to_cache_key(self):
         key = self._request.url_without_variables
         cleaned_key = FuzzRequestUrlMixing.strip_redundant_parts(key)
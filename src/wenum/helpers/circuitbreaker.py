@@ -0,0 +1,172 @@
+import datetime
+import email.utils
+import logging
+import time
+from collections import deque
+from typing import Callable, Hashable, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+RECOVERING = "recovering"
+
+
+def parse_retry_after(value: Optional[str], now: Optional[datetime.datetime] = None) -> Optional[float]:
+    """
+    Seconds to wait according to a Retry-After header, which is either an amount of seconds or an HTTP date.
+    None if the value is missing or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_date.tzinfo is None:
+        retry_date = retry_date.replace(tzinfo=datetime.timezone.utc)
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    return max((retry_date - now).total_seconds(), 0)
+
+
+class HostCircuit:
+    """
+    State of the circuit of a single host
+    """
+
+    def __init__(self, window: int):
+        self.state = CLOSED
+        # Whether the recent transfers failed (throttled or errored) or not
+        self.outcomes: deque[bool] = deque(maxlen=window)
+        # Amount of times the circuit opened since the host last recovered
+        self.trips = 0
+        # Point in time until which no requests are sent while open
+        self.open_until = 0.0
+        self.in_flight = 0
+        # Amount of requests that may be active at the same time while recovering, and the successful responses
+        # received at that limit
+        self.allowed = 1
+        self.successes = 0
+
+
+class CircuitBreaker:
+    """
+    Pauses sending requests to a host that throttles (429/503 responses, Retry-After headers) or fails. The circuit of
+    a host opens once min_failures of the last window transfers, and at least failure_ratio of them, failed, or
+    right away on a Retry-After header. It stays open for the Retry-After time, or for open_time seconds doubled on
+    every trip in a row (up to max_open_time). Afterwards, a single probe request is sent (half-open). If it succeeds,
+    the amount of parallel requests doubles with each round of successful responses until max_parallel is reached
+    and the circuit closes. A failure on the way opens it again.
+
+    Callers check with allows whether a request may be sent, report it with started and its outcome with record.
+    """
+
+    def __init__(self, max_parallel: int, window: int = 20, min_failures: int = 5, failure_ratio: float = 0.5,
+                 open_time: float = 10, max_open_time: float = 300, clock: Callable[[], float] = time.monotonic):
+        self.max_parallel = max_parallel
+        self.window = window
+        self.min_failures = min_failures
+        self.failure_ratio = failure_ratio
+        self.open_time = open_time
+        self.max_open_time = max_open_time
+        self.clock = clock
+        self.circuits: dict[Hashable, HostCircuit] = {}
+        # Amount of times a circuit opened
+        self.opened = 0
+
+        self.logger = logging.getLogger("debug_log")
+
+    def _get_circuit(self, key: Hashable) -> HostCircuit:
+        circuit = self.circuits.get(key)
+        if circuit is None:
+            circuit = HostCircuit(self.window)
+            self.circuits[key] = circuit
+        return circuit
+
+    def allows(self, key: Hashable) -> bool:
+        """
+        Whether a request to the host may be sent now
+        """
+        circuit = self._get_circuit(key)
+        if circuit.state == OPEN:
+            if self.clock() < circuit.open_until:
+                return False
+            circuit.state = HALF_OPEN
+            self.logger.debug(f"Circuit of {key} half-open, sending a probe request")
+        if circuit.state == HALF_OPEN:
+            return circuit.in_flight == 0
+        if circuit.state == RECOVERING:
+            return circuit.in_flight < circuit.allowed
+        return True
+
+    def started(self, key: Hashable) -> None:
+        self._get_circuit(key).in_flight += 1
+
+    def record(self, key: Hashable, failed: bool, retry_after: Optional[float] = None) -> None:
+        """
+        Record the outcome of a request to the host. failed is set for throttled or errored requests, retry_after
+        holds the seconds the host asked to wait, if it did
+        """
+        circuit = self._get_circuit(key)
+        circuit.in_flight = max(circuit.in_flight - 1, 0)
+
+        if circuit.state == OPEN:
+            # A request sent before the circuit opened
+            if retry_after is not None:
+                circuit.open_until = max(circuit.open_until, self.clock() + min(retry_after, self.max_open_time))
+        elif failed and circuit.state in (HALF_OPEN, RECOVERING):
+            self._open(key, circuit, retry_after)
+        elif circuit.state == HALF_OPEN:
+            circuit.state = RECOVERING
+            circuit.allowed = min(2, self.max_parallel)
+            circuit.successes = 0
+            self._check_recovered(key, circuit)
+        elif circuit.state == RECOVERING:
+            circuit.successes += 1
+            if circuit.successes >= circuit.allowed:
+                circuit.allowed *= 2
+                circuit.successes = 0
+            self._check_recovered(key, circuit)
+        else:
+            circuit.outcomes.append(failed)
+            if failed and retry_after is not None:
+                self._open(key, circuit, retry_after)
+                return
+            failures = sum(circuit.outcomes)
+            if failures >= self.min_failures and failures >= self.failure_ratio * len(circuit.outcomes):
+                self._open(key, circuit, retry_after)
+
+    def _open(self, key: Hashable, circuit: HostCircuit, retry_after: Optional[float]) -> None:
+        circuit.trips += 1
+        if retry_after is not None:
+            open_time = min(retry_after, self.max_open_time)
+        else:
+            open_time = min(self.open_time * 2 ** (circuit.trips - 1), self.max_open_time)
+        circuit.state = OPEN
+        circuit.open_until = self.clock() + open_time
+        circuit.outcomes.clear()
+        self.opened += 1
+        self.logger.debug(f"Circuit of {key} opened, pausing its requests for {open_time:.1f}s")
+
+    def _check_recovered(self, key: Hashable, circuit: HostCircuit) -> None:
+        if circuit.allowed >= self.max_parallel:
+            circuit.state = CLOSED
+            circuit.trips = 0
+            self.logger.debug(f"Circuit of {key} closed, the host recovered")
+
+    def delay(self) -> Optional[float]:
+        """
+        Seconds until the next open circuit allows a probe request. None if no circuit is open
+        """
+        delays = [circuit.open_until - self.clock() for circuit in self.circuits.values() if circuit.state == OPEN]
+        if not delays:
+            return None
+        return max(min(delays), 0)
+
+    def paused(self) -> int:
+        """
+        Amount of hosts whose circuit is not closed
+        """
+        return sum(1 for circuit in list(self.circuits.values()) if circuit.state != CLOSED)
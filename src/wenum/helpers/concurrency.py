@@ -0,0 +1,126 @@
+import logging
+import math
+from threading import Lock
+from typing import Optional
+
+# Curl error code for timeouts, see https://curl.haxx.se/libcurl/c/libcurl-errors.html
+CURLE_OPERATION_TIMEDOUT = 28
+# Status codes a server answers with when it is overloaded or does not want to serve as many requests
+THROTTLE_STATUS_CODES = (429, 503)
+
+
+class AIMDController:
+    """
+    Additive increase, multiplicative decrease controller for the amount of concurrently active requests.
+
+    Completed transfers are reported through record_response and record_error. Once a window of samples is full,
+    the limit is reevaluated: It is halved if the timeout rate, the ratio of 429/503 responses or the p95 latency
+    (compared to the best p95 seen so far) suggest the target is struggling, and increased by one otherwise.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1, initial_limit: Optional[int] = None,
+                 window: int = 20, latency_factor: float = 2.0, error_ratio: float = 0.05,
+                 decrease_factor: float = 0.5):
+        self.max_limit = max_limit
+        self.min_limit = min(min_limit, max_limit)
+        if initial_limit is None:
+            initial_limit = max(self.min_limit, max_limit // 4)
+        self._limit = float(min(max(initial_limit, self.min_limit), max_limit))
+        self.window = window
+        self.latency_factor = latency_factor
+        self.error_ratio = error_ratio
+        self.decrease_factor = decrease_factor
+
+        # Lowest p95 latency of a healthy window. Used as the reference to detect a slowing target
+        self.baseline_p95: Optional[float] = None
+
+        self._latencies: list[float] = []
+        self._timeouts = 0
+        self._throttled = 0
+        self._samples = 0
+
+        self._mutex = Lock()
+        self.logger = logging.getLogger("debug_log")
+
+    @property
+    def limit(self) -> int:
+        """
+        Amount of requests that may currently be active at the same time
+        """
+        return int(self._limit)
+
+    def record_response(self, latency: float, status_code: int) -> None:
+        """
+        Record a completed transfer with its total time in seconds and the HTTP status code
+        """
+        with self._mutex:
+            self._latencies.append(latency)
+            if status_code in THROTTLE_STATUS_CODES:
+                self._throttled += 1
+            self._samples += 1
+            self._evaluate()
+
+    def record_error(self, errno: int) -> None:
+        """
+        Record a transfer that failed with the curl error code errno
+        """
+        with self._mutex:
+            if errno == CURLE_OPERATION_TIMEDOUT:
+                self._timeouts += 1
+            self._samples += 1
+            self._evaluate()
+
+    @staticmethod
+    def _percentile(values: list[float], percentile: float) -> float:
+        ordered = sorted(values)
+        index = max(math.ceil(percentile / 100 * len(ordered)) - 1, 0)
+        return ordered[index]
+
+    def _evaluate(self) -> None:
+        """
+        Adjust the limit if the current window is complete. Expects the mutex to be held
+        """
+        if self._samples < self.window:
+            return
+
+        timeout_ratio = self._timeouts / self._samples
+        throttle_ratio = self._throttled / self._samples
+        p95 = self._percentile(self._latencies, 95) if self._latencies else None
+
+        reason = None
+        if timeout_ratio > self.error_ratio:
+            reason = f"timeout ratio {timeout_ratio:.2f}"
+        elif throttle_ratio > self.error_ratio:
+            reason = f"429/503 ratio {throttle_ratio:.2f}"
+        elif p95 is not None and self.baseline_p95 is not None and p95 > self.baseline_p95 * self.latency_factor:
+            reason = f"p95 latency {p95:.3f}s exceeds {self.latency_factor} times the baseline of " \
+                     f"{self.baseline_p95:.3f}s"
+
+        previous = self.limit
+        if reason and p95 is not None and previous <= self.min_limit and timeout_ratio <= self.error_ratio \
+                and throttle_ratio <= self.error_ratio:
+            # The target is slow even with the lowest concurrency, so it is not caused by our load. Accept the new
+            # latency as the reference instead of staying at the minimum forever
+            self.logger.debug(f"Adaptive concurrency: Resetting p95 latency baseline from {self.baseline_p95:.3f}s "
+                              f"to {p95:.3f}s")
+            self.baseline_p95 = p95
+            reason = None
+        if reason:
+            self._limit = max(self._limit * self.decrease_factor, self.min_limit)
+            self.logger.debug(f"Adaptive concurrency: Decreasing limit from {previous} to {self.limit} due to "
+                              f"{reason}")
+        else:
+            if p95 is not None and (self.baseline_p95 is None or p95 < self.baseline_p95):
+                self.baseline_p95 = p95
+            self._limit = min(self._limit + 1, self.max_limit)
+            p95_text = f"{p95:.3f}s" if p95 is not None else "n/a"
+            action = f"Increasing limit from {previous} to {self.limit}" if self.limit > previous \
+                else f"Keeping limit at {self.limit}"
+            self.logger.debug(f"Adaptive concurrency: {action} "
+                              f"(p95 latency {p95_text}, timeout ratio {timeout_ratio:.2f}, "
+                              f"429/503 ratio {throttle_ratio:.2f})")
+
+        self._latencies = []
+        self._timeouts = 0
+        self._throttled = 0
+        self._samples = 0
@@ -0,0 +1,64 @@
+import socket
+import time
+from threading import Lock
+from typing import Callable, Optional
+
+# Seconds a successful resolution is reused
+DEFAULT_TTL = 300
+# Seconds a failed resolution is remembered
+DEFAULT_NEGATIVE_TTL = 60
+
+
+def resolve_host(hostname: str) -> Optional[str]:
+    """
+    Resolve hostname to an IPv4 address. Returns None if it does not resolve
+    """
+    try:
+        return socket.gethostbyname(hostname)
+    # gaierror for unknown hosts, UnicodeError for names that can not be IDNA encoded
+    except (OSError, UnicodeError):
+        return None
+
+
+class DNSCache:
+    """
+    Thread-safe cache of host name resolutions with a time to live. Host names that do not resolve are cached as
+    well (with negative_ttl), so that they do not hit the system resolver over and over again.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL, negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+                 resolver: Callable[[str], Optional[str]] = resolve_host,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.resolver = resolver
+        self.clock = clock
+        # Maps the lowercase host name to the resolved address (or None) and the point in time it expires
+        self._entries: dict[str, tuple[Optional[str], float]] = {}
+        self._mutex = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def resolve(self, hostname: str) -> Optional[str]:
+        """
+        Return the cached address of hostname, resolving it if it is unknown or expired. None if it does not resolve
+        """
+        key = hostname.lower()
+        now = self.clock()
+        with self._mutex:
+            entry = self._entries.get(key)
+            if entry and entry[1] > now:
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        # Resolving outside the lock, so that a slow lookup does not block lookups of other hosts
+        address = self.resolver(key)
+        ttl = self.ttl if address is not None else self.negative_ttl
+        with self._mutex:
+            self._entries[key] = (address, self.clock() + ttl)
+        return address
+
+    def clear(self) -> None:
+        with self._mutex:
+            self._entries.clear()
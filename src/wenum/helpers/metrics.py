@@ -0,0 +1,125 @@
+import codecs
+import hashlib
+from collections import namedtuple
+from io import BytesIO
+from typing import Optional
+
+from ..externals.reqresp.HeaderParser import parse_header_block
+from ..externals.reqresp.Response import get_encoding_from_headers
+
+# Size metrics of a response body as shown in the output and used by the filters
+ContentMetrics = namedtuple("ContentMetrics", ["chars", "lines", "words", "md5"])
+
+# Metrics of responses without content
+EMPTY_CONTENT_METRICS = ContentMetrics(chars=0, lines=0, words=0, md5="")
+
+
+def compute_content_metrics(content: str) -> ContentMetrics:
+    """
+    Calculate the metrics of a decoded response body
+    """
+    return ContentMetrics(
+        chars=len(content),
+        lines=content.count("\n"),
+        # Splitting on whitespace counts the same words as matching \S+, without a regex
+        words=len(content.split()),
+        md5=hashlib.md5(content.encode("utf-8", errors="ignore")).hexdigest(),
+    )
+
+
+class ContentMetricsAccumulator:
+    """
+    Calculates the ContentMetrics of a body chunk by chunk while it is being received, decoding it with encoding.
+    The result equals compute_content_metrics on the completely decoded body.
+    """
+
+    def __init__(self, encoding: str):
+        self.decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        self.md5 = hashlib.md5()
+        self.chars = 0
+        self.lines = 0
+        self.words = 0
+        # Whether the text so far ended within a word, which the next chunk may continue
+        self.in_word = False
+
+    def update(self, chunk: bytes, final: bool = False) -> None:
+        text = self.decoder.decode(chunk, final)
+        if not text:
+            return
+        self.md5.update(text.encode("utf-8", errors="ignore"))
+        self.chars += len(text)
+        self.lines += text.count("\n")
+        self.words += len(text.split())
+        if self.in_word and not text[0].isspace():
+            self.words -= 1
+        self.in_word = not text[-1].isspace()
+
+    def finish(self) -> ContentMetrics:
+        self.update(b"", final=True)
+        return ContentMetrics(chars=self.chars, lines=self.lines, words=self.words, md5=self.md5.hexdigest())
+
+
+class StreamingBody:
+    """
+    Replaces the BytesIO buffering the body of a curl transfer. Its write method is meant to be set as the
+    WRITEFUNCTION. The metrics are calculated while the body arrives, and if keep_bytes is set, only that many
+    bytes of the body are kept in memory.
+
+    Compressed bodies and unknown charsets can not be measured while streaming. They are kept completely, and the
+    metrics are left to be computed from the parsed response. If decoded is set, libcurl decompresses the body before
+    passing it on, so the Content-Encoding does not matter.
+    """
+
+    def __init__(self, header_buffer: BytesIO, keep_bytes: Optional[int] = None, decoded: bool = False):
+        self.header_buffer = header_buffer
+        self.keep_bytes = keep_bytes
+        self.decoded = decoded
+        self.buffer = BytesIO()
+        self.accumulator: Optional[ContentMetricsAccumulator] = None
+        # Set with the first chunk of the body, as all the headers have been received by then
+        self.started = False
+        self.truncated = False
+
+    def _start(self) -> None:
+        self.started = True
+        headers = parse_header_block(self.header_buffer.getvalue().decode("utf-8", errors="surrogateescape"))[3]
+        if not self.decoded and \
+                any(value.lower() not in ("", "identity") for value in headers.getall("Content-Encoding")):
+            return
+        encoding = get_encoding_from_headers(headers) or "utf-8"
+        try:
+            self.accumulator = ContentMetricsAccumulator(encoding)
+        except LookupError:
+            pass
+
+    def write(self, chunk: bytes) -> None:
+        if not self.started:
+            self._start()
+        if self.accumulator is None:
+            self.buffer.write(chunk)
+            return
+
+        self.accumulator.update(chunk)
+        if self.keep_bytes is None:
+            self.buffer.write(chunk)
+            return
+        remaining = self.keep_bytes - self.buffer.tell()
+        if remaining > 0:
+            self.buffer.write(chunk[:remaining])
+        if len(chunk) > remaining:
+            self.truncated = True
+
+    def getvalue(self) -> bytes:
+        return self.buffer.getvalue()
+
+    def content_metrics(self) -> Optional[ContentMetrics]:
+        """
+        The metrics of the whole body, or None if they could not be calculated while streaming
+        """
+        if not self.started:
+            # No body has been received
+            return EMPTY_CONTENT_METRICS
+        if self.accumulator is None:
+            return None
+        return self.accumulator.finish()
+
@@ -0,0 +1,160 @@
+import logging
+import random
+import time
+from threading import Lock
+from typing import Callable, Optional
+
+# Curl errors that indicate a problem with the proxy rather than with the target.
+# See https://curl.haxx.se/libcurl/c/libcurl-errors.html
+PROXY_ERRNOS = {
+    5,  # Couldn't resolve proxy
+    7,  # Failed to connect() to host or proxy
+    28,  # Operation timeout
+    97,  # Proxy handshake error
+}
+
+
+class ProxyStats:
+    """
+    Observed health of a single proxy
+    """
+
+    def __init__(self, proxy: str):
+        self.proxy = proxy
+        # Exponentially weighted moving average of the total time of the transfers in seconds. None until the first
+        # successful transfer
+        self.latency: Optional[float] = None
+        self.successes = 0
+        self.errors = 0
+        self.consecutive_errors = 0
+        # Amount of times the proxy has been ejected since it last worked
+        self.ejections = 0
+        # Point in time until which the proxy is ejected. None if it is in rotation
+        self.ejected_until: Optional[float] = None
+        # Whether a probe request through the ejected proxy is currently active
+        self.probing = False
+
+
+class ProxyBalancer:
+    """
+    Distributes requests across the proxies, weighted by their observed throughput (the inverse of their average
+    latency). A proxy failing max_errors times in a row with a proxy related error is ejected for eject_time seconds,
+    doubled on every ejection in a row up to max_eject_time. Once that time passed, a single probe request is routed
+    through it, which either reinstates the proxy or ejects it again.
+    """
+
+    def __init__(self, proxies: list[str], max_errors: int = 3, eject_time: float = 30, max_eject_time: float = 300,
+                 smoothing: float = 0.3, clock: Callable[[], float] = time.monotonic,
+                 rand: Callable[[], float] = random.random):
+        self.stats = {proxy: ProxyStats(proxy) for proxy in proxies}
+        self.max_errors = max_errors
+        self.eject_time = eject_time
+        self.max_eject_time = max_eject_time
+        self.smoothing = smoothing
+        self.clock = clock
+        self.rand = rand
+
+        self._mutex = Lock()
+        self.logger = logging.getLogger("debug_log")
+
+    def __len__(self) -> int:
+        return len(self.stats)
+
+    def choose(self) -> str:
+        """
+        Return the proxy the next request should be sent through
+        """
+        with self._mutex:
+            now = self.clock()
+            active = []
+            for stats in self.stats.values():
+                if stats.ejected_until is None:
+                    active.append(stats)
+                elif stats.ejected_until <= now and not stats.probing:
+                    stats.probing = True
+                    self.logger.debug(f"Probing ejected proxy {stats.proxy}")
+                    return stats.proxy
+
+            if not active:
+                # Every proxy is ejected. Use the one that will be probed next rather than failing the request
+                return min(self.stats.values(), key=lambda proxy_stats: proxy_stats.ejected_until).proxy
+
+            weights = self._weights(active)
+            threshold = self.rand() * sum(weights)
+            for stats, weight in zip(active, weights):
+                threshold -= weight
+                if threshold < 0:
+                    return stats.proxy
+            return active[-1].proxy
+
+    @staticmethod
+    def _weights(active: list[ProxyStats]) -> list[float]:
+        """
+        Throughput estimate of each proxy. Proxies without a latency sample yet get the average of the others, so that
+        they receive traffic and get measured
+        """
+        latencies = [stats.latency for stats in active if stats.latency is not None]
+        default_latency = sum(latencies) / len(latencies) if latencies else 1
+        return [1 / max(stats.latency if stats.latency is not None else default_latency, 0.001) for stats in active]
+
+    def record_success(self, proxy: str, latency: float) -> None:
+        """
+        Record a completed transfer through the proxy with its total time in seconds
+        """
+        with self._mutex:
+            stats = self.stats[proxy]
+            stats.successes += 1
+            stats.consecutive_errors = 0
+            if stats.latency is None:
+                stats.latency = latency
+            else:
+                stats.latency += self.smoothing * (latency - stats.latency)
+            self._reinstate(stats)
+
+    def record_error(self, proxy: str, errno: int) -> None:
+        """
+        Record a transfer through the proxy that failed with the curl error code errno
+        """
+        with self._mutex:
+            stats = self.stats[proxy]
+            if errno not in PROXY_ERRNOS:
+                # The proxy relayed the request, the target is the one failing
+                stats.consecutive_errors = 0
+                self._reinstate(stats)
+                return
+            stats.errors += 1
+            stats.consecutive_errors += 1
+            if stats.probing or (stats.ejected_until is None and stats.consecutive_errors >= self.max_errors):
+                stats.ejections += 1
+                eject_time = min(self.eject_time * 2 ** (stats.ejections - 1), self.max_eject_time)
+                stats.ejected_until = self.clock() + eject_time
+                stats.probing = False
+                self.logger.debug(f"Ejecting proxy {proxy} for {eject_time}s after {stats.consecutive_errors} "
+                                  f"failed requests in a row (last pycurl error {errno})")
+
+    def _reinstate(self, stats: ProxyStats) -> None:
+        if stats.ejected_until is not None:
+            self.logger.debug(f"Proxy {stats.proxy} is working again, reinstating it")
+            stats.ejected_until = None
+            stats.ejections = 0
+        stats.probing = False
+
+    def available(self) -> int:
+        """
+        Amount of proxies that are currently not ejected
+        """
+        with self._mutex:
+            return sum(1 for stats in self.stats.values() if stats.ejected_until is None)
+
+    def summary(self) -> list[str]:
+        """
+        One line per proxy describing its observed health
+        """
+        lines = []
+        with self._mutex:
+            for stats in self.stats.values():
+                latency = f"{stats.latency:.3f}s" if stats.latency is not None else "-"
+                state = "ejected" if stats.ejected_until is not None else "active"
+                lines.append(f"{stats.proxy}: {state}, {stats.successes} successful, {stats.errors} failed, "
+                             f"average latency {latency}")
+        return lines
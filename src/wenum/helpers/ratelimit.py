@@ -0,0 +1,81 @@
+import time
+from typing import Callable, Hashable, Optional
+
+# Tolerance for floating point errors while adding up fractions of tokens, which would otherwise delay requests
+EPSILON = 1e-9
+
+
+class TokenBucket:
+    """
+    Token bucket allowing rate requests per second on average, and up to burst requests at once.
+
+    Never blocks. Callers ask with try_acquire whether a request may be sent now, and with delay how long they would
+    have to wait for the next token.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.tokens = float(burst)
+        self.last_refill = clock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        elapsed = max(now - self.last_refill, 0)
+        self.tokens = min(self.tokens + elapsed * self.rate, self.burst)
+        self.last_refill = now
+
+    def try_acquire(self) -> bool:
+        """
+        Take a token if one is available. Returns True if the request may be sent
+        """
+        self._refill()
+        if self.tokens >= 1 - EPSILON:
+            self.tokens = max(self.tokens - 1, 0)
+            return True
+        return False
+
+    def delay(self) -> float:
+        """
+        Seconds until the next token is available. 0 if one is available right now
+        """
+        self._refill()
+        if self.tokens >= 1 - EPSILON:
+            return 0
+        return (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """
+    Hands out token buckets, either a single global one or one per key (e.g. the host of a request)
+    """
+
+    def __init__(self, rate: float, burst: int = 1, per_key: bool = False,
+                 clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.per_key = per_key
+        self.clock = clock
+        self.buckets: dict[Optional[Hashable], TokenBucket] = {}
+
+    def _get_bucket(self, key: Optional[Hashable]) -> TokenBucket:
+        if not self.per_key:
+            key = None
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(self.rate, self.burst, self.clock)
+            self.buckets[key] = bucket
+        return bucket
+
+    def try_acquire(self, key: Optional[Hashable] = None) -> bool:
+        """
+        Returns True and consumes a token if a request for key may be sent now
+        """
+        return self._get_bucket(key).try_acquire()
+
+    def delay(self, key: Optional[Hashable] = None) -> float:
+        """
+        Seconds until a request for key may be sent
+        """
+        return self._get_bucket(key).delay()
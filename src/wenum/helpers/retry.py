@@ -0,0 +1,95 @@
+import heapq
+import itertools
+import random
+import time
+from collections import namedtuple
+from typing import Any, Callable, Optional
+
+# Exponential backoff of a class of errors. The delay before the n-th retry is drawn uniformly from
+# [0, min(max_delay, base_delay * 2 ** (n - 1))] ("full jitter"), so that retries of many failed requests spread out
+# instead of hitting the target at the same time again
+BackoffPolicy = namedtuple("BackoffPolicy", ["base_delay", "max_delay"])
+
+# See https://curl.haxx.se/libcurl/c/libcurl-errors.html
+ERRNO_CLASSES = {
+    35: "tls",  # SSL/TLS handshake failed
+    18: "transfer",  # Partial file. The transfer was shorter or larger than expected
+    52: "transfer",  # Nothing was returned from the server
+    55: "transfer",  # Failed sending network data
+    56: "transfer",  # Failure with receiving network data
+}
+
+RETRY_POLICIES = {
+    # A failing handshake often means an overloaded TLS terminator, give it more time
+    "tls": BackoffPolicy(base_delay=1, max_delay=30),
+    # Dropped connections mostly recover quickly
+    "transfer": BackoffPolicy(base_delay=0.25, max_delay=15),
+    "default": BackoffPolicy(base_delay=0.5, max_delay=30),
+}
+
+
+def backoff_delay(errno: int, attempt: int, rand: Callable[[float, float], float] = random.uniform) -> float:
+    """
+    Seconds to wait before the attempt-th retry (starting at 1) of a request that failed with the curl errno
+    """
+    policy = RETRY_POLICIES[ERRNO_CLASSES.get(errno, "default")]
+    return rand(0, min(policy.max_delay, policy.base_delay * 2 ** (attempt - 1)))
+
+
+class RetryBudget:
+    """
+    Run-wide limit of retries, to avoid retry storms against a target that is failing anyway. Allows min_retries plus
+    the percentage of the sent requests, e.g. 20 allows one retry per five requests.
+    """
+
+    def __init__(self, percentage: int, min_retries: int = 10):
+        self.ratio = percentage / 100
+        self.min_retries = min_retries
+        self.spent = 0
+        # Amount of retries that have been refused
+        self.exhausted = 0
+
+    def try_spend(self, requests: int) -> bool:
+        """
+        Returns True and counts the retry if the budget allows it after the amount of requests sent so far
+        """
+        if self.spent >= self.min_retries + self.ratio * requests:
+            self.exhausted += 1
+            return False
+        self.spent += 1
+        return True
+
+
+class RetryScheduler:
+    """
+    Heap of items that are due at a later point in time. Never blocks. Callers take the due items with pop_due, and
+    ask with delay how long they can wait until the next one is due.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self.heap: list[tuple[float, int, Any]] = []
+        # Keeps items due at the same time in insertion order, and avoids comparing the items themselves
+        self.counter = itertools.count()
+
+    def schedule(self, item: Any, delay: float) -> None:
+        heapq.heappush(self.heap, (self.clock() + delay, next(self.counter), item))
+
+    def pop_due(self) -> Optional[Any]:
+        """
+        Remove and return the item that has been due the longest. None if no item is due
+        """
+        if not self.heap or self.heap[0][0] > self.clock():
+            return None
+        return heapq.heappop(self.heap)[2]
+
+    def delay(self) -> Optional[float]:
+        """
+        Seconds until the next item is due. None if nothing is scheduled
+        """
+        if not self.heap:
+            return None
+        return max(self.heap[0][0] - self.clock(), 0)
+
+    def __len__(self) -> int:
+        return len(self.heap)
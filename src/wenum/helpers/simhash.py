@@ -0,0 +1,55 @@
+import hashlib
+from collections import Counter
+
+FINGERPRINT_BITS = 64
+# Each bit of the fingerprint gets a lane of this many bits within one large integer counting the votes for it, so
+# that the votes of a token are added to all lanes with a single addition
+LANE_BITS = 32
+LANE_MASK = (1 << LANE_BITS) - 1
+
+
+def _spread_table(byte_index: int) -> list[int]:
+    """
+    Maps each value of the byte_index-th byte of a token hash to its bits, moved into their lanes
+    """
+    table = []
+    for value in range(256):
+        spread = 0
+        for bit in range(8):
+            if value >> bit & 1:
+                spread |= 1 << ((byte_index * 8 + bit) * LANE_BITS)
+        table.append(spread)
+    return table
+
+
+SPREAD_TABLES = [_spread_table(byte_index) for byte_index in range(FINGERPRINT_BITS // 8)]
+
+
+def simhash(content: str) -> int:
+    """
+    Locality-sensitive fingerprint of a text. Texts sharing most of their words get fingerprints differing in few
+    bits, e.g. pages which only differ by an echoed path or a timestamp
+    """
+    votes = 0
+    total = 0
+    for token, count in Counter(content.split()).items():
+        token_hash = hashlib.blake2b(token.encode("utf-8", errors="ignore"), digest_size=8).digest()
+        spread = 0
+        for byte_index, value in enumerate(token_hash):
+            spread += SPREAD_TABLES[byte_index][value]
+        votes += spread * count
+        total += count
+
+    # A bit is set if the majority of the tokens have it set
+    fingerprint = 0
+    for bit in range(FINGERPRINT_BITS):
+        if 2 * (votes >> (bit * LANE_BITS) & LANE_MASK) > total:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(first: int, second: int) -> int:
+    """
+    Amount of bits two fingerprints differ in
+    """
+    return (first ^ second).bit_count()
@@ -0,0 +1,112 @@
+import bisect
+from typing import Optional
+
+import pycurl
+
+# Points in time libcurl records for every transfer, in seconds since its start.
+# See https://curl.se/libcurl/c/curl_easy_getinfo.html#TIMES
+CURL_TIMES = {
+    "namelookup": pycurl.NAMELOOKUP_TIME,
+    "connect": pycurl.CONNECT_TIME,
+    "appconnect": pycurl.APPCONNECT_TIME,
+    "pretransfer": pycurl.PRETRANSFER_TIME,
+    "starttransfer": pycurl.STARTTRANSFER_TIME,
+    "total": pycurl.TOTAL_TIME,
+}
+
+# Upper bounds of the histogram buckets in seconds. The last bucket holds everything slower
+BUCKET_BOUNDS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def read_timings(curl_h: pycurl.Curl) -> dict[str, float]:
+    """
+    Read the points in time of the finished transfer from the curl handle
+    """
+    return {name: curl_h.getinfo(info) for name, info in CURL_TIMES.items()}
+
+
+def phase_durations(timings: dict[str, float]) -> dict[str, float]:
+    """
+    Split the points in time of a transfer into the time spent in each phase: Resolving the name (namelookup), the
+    TCP connect (connect), the TLS handshake (appconnect), the remaining setup before sending (pretransfer), waiting for
+    the first byte of the response (starttransfer) and the whole transfer (total). Phases skipped because the
+    connection has been reused or TLS is not used last 0 seconds.
+    """
+    tcp_done = max(timings["connect"], timings["namelookup"])
+    tls_done = max(timings["appconnect"], tcp_done)
+    return {
+        "namelookup": timings["namelookup"],
+        "connect": tcp_done - timings["namelookup"],
+        "appconnect": tls_done - tcp_done,
+        "pretransfer": max(timings["pretransfer"] - tls_done, 0),
+        "starttransfer": max(timings["starttransfer"] - timings["pretransfer"], 0),
+        "total": timings["total"],
+    }
+
+
+class LatencyHistogram:
+    """
+    Counts of durations in fixed buckets, cheap to update and to merge regardless of the amount of samples
+    """
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def add(self, duration: float) -> None:
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS, duration)] += 1
+        self.count += 1
+        self.sum += duration
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """
+        Upper bound of the bucket the percentile falls into. None if the slowest bucket, which has no upper bound
+        """
+        threshold = percentile / 100 * self.count
+        seen = 0
+        for bound, amount in zip(BUCKET_BOUNDS, self.buckets):
+            seen += amount
+            if seen >= threshold:
+                return bound
+        return None
+
+    def to_dict(self) -> dict:
+        buckets = {f"<={bound}": amount for bound, amount in zip(BUCKET_BOUNDS, self.buckets)}
+        buckets[f">{BUCKET_BOUNDS[-1]}"] = self.buckets[-1]
+        return {"count": self.count, "mean": round(self.mean, 6), "buckets": buckets}
+
+
+class TimingHistograms:
+    """
+    One histogram per transfer phase
+    """
+
+    def __init__(self):
+        self.phases = {name: LatencyHistogram() for name in CURL_TIMES}
+
+    def add(self, timings: dict[str, float]) -> None:
+        for name, duration in phase_durations(timings).items():
+            self.phases[name].add(duration)
+
+    @property
+    def count(self) -> int:
+        return self.phases["total"].count
+
+    def summary(self) -> str:
+        """
+        Single line with the mean and the p95 bucket of each phase
+        """
+        parts = []
+        for name, histogram in self.phases.items():
+            p95 = histogram.percentile(95)
+            p95_text = f"<={p95}s" if p95 is not None else f">{BUCKET_BOUNDS[-1]}s"
+            parts.append(f"{name} {histogram.mean * 1000:.1f}ms (p95 {p95_text})")
+        return ", ".join(parts)
+
+    def to_dict(self) -> dict:
+        return {name: histogram.to_dict() for name, histogram in self.phases.items()}
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import logging
+import selectors
+import socket
 import time
 from typing import TYPE_CHECKING, Optional
 from urllib.parse import urlparse
 
-from .myqueues import FuzzPriorityQueue
+from .myqueues import AgingPriorityQueue
 from queue import PriorityQueue
 
 
@@ -15,7 +17,6 @@ import pycurl
 from io import BytesIO
 from threading import Thread, Lock, Event
 import itertools
-from queue import Queue
 import datetime
 import pytz as pytz
 
@@ -23,6 +24,14 @@ from .exception import FuzzExceptBadOptions, FuzzExceptNetError
 from .fuzzobjects import FuzzResult, FuzzItem, FuzzType
 
 from .factories.reqresp_factory import ReqRespRequestFactory
+from .helpers.circuitbreaker import CircuitBreaker, parse_retry_after
+from .helpers.concurrency import AIMDController, THROTTLE_STATUS_CODES
+from .helpers.ratelimit import RateLimiter
+from .helpers.metrics import StreamingBody
+from .helpers.proxies import PROXY_ERRNOS, ProxyBalancer
+from .helpers.retry import RetryBudget, RetryScheduler, backoff_delay
+from .transport import Transport
+from .externals.reqresp.HeaderParser import HeaderMultiDict
 
 # See https://curl.haxx.se/libcurl/c/libcurl-errors.html
 UNRECOVERABLE_PYCURL_EXCEPTIONS = [
@@ -39,13 +48,26 @@ UNRECOVERABLE_PYCURL_EXCEPTIONS = [
 
 MAX_AGE = datetime.datetime.now(pytz.utc) - datetime.timedelta(days=30)
 
+# Servers answering HEAD requests with these codes may still answer GET requests normally
+HEAD_UNSUPPORTED_CODES = [405, 501]
 
-class HttpPool:
+# Priority points a queued request gains per second of waiting. Seeds are 10 points apart, so a request overtakes
+# the ones of the next seed after waiting for 5 seconds
+REQUEST_AGING = 2
+
+
+class HttpPool(Transport):
+    """
+    Transport sending the requests with libcurl. A single thread drives all transfers through a CurlMulti
+    """
     newid = itertools.count(0)
 
     def __init__(self, session: FuzzSession):
         # Amount of total requests that have been queued. This is not a "remaining" requests counter
         self.queued_requests = 0
+        # Amount of internal probe requests that have been queued, e.g. of the false positive detection. They do not
+        # count towards queued_requests, which limits the requests and retries of the run
+        self.queued_probes = 0
         # Amount of total responses that have been received.
         self.processed = 0
 
@@ -55,21 +77,60 @@ class HttpPool:
 
         # CurlMulti object to which active curl handles will be added to (and removed once done)
         self.curl_multi: Optional[pycurl.CurlMulti] = None
+        # Lets the handles share DNS lookups, TLS sessions and connections
+        self.curl_share: Optional[pycurl.CurlShare] = None
+        # Amount of connections the transfers had to open, and amount of transfers that reused a connection
+        self.connections_opened = 0
+        self.connections_reused = 0
         # List of all the handle objects instances used during runtime (can be adjusted by -t option)
         self.handles: list[pycurl.Curl] = []
         # List of all the curl handles that are not actively used at the moment
         self.curlh_freelist: list[pycurl.Curl] = []
         # Queue object storing all the requests available for sending out. Maxsize avoids buffering tens of thousands of
-        # requests beforehand, which would result in gigabytes of reserved memory
-        self.request_queue: Queue = Queue(maxsize=session.options.threads)
+        # requests beforehand, which would result in gigabytes of reserved memory. Keeps the priority the requests
+        # had in the HttpQueue
+        self.request_queue: AgingPriorityQueue = AgingPriorityQueue(maxsize=session.options.threads,
+                                                                    aging=REQUEST_AGING)
         # A general default base priority with which results should be processed
         self.base_result_priority = 10
-        self.sleep = session.options.sleep
+        # Amount of bytes of the response bodies to keep. None keeps everything
+        self.body_limit: Optional[int] = session.options.body_limit * 1024 if session.options.body_limit else None
+
+        # Requests taken from the request_queue that are held back by the rate limiter or the limit per host
+        self.throttled_requests: list[FuzzResult] = []
+        # Amount of active requests per host. Only tracked if the connections per host are limited
+        self.host_load: dict[str, int] = {}
+        self.rate_limiter: Optional[RateLimiter] = None
+        if session.options.rate:
+            self.rate_limiter = RateLimiter(session.options.rate, session.options.rate_burst,
+                                            per_key=session.options.rate_per_host)
+        elif session.options.sleep:
+            # Sleeping between requests is the same as a rate of one request per sleep interval
+            self.rate_limiter = RateLimiter(1 / session.options.sleep)
+
+        # Failed requests waiting for their retry. Only accessed by the thread handling the requests
+        self.retry_scheduler = RetryScheduler()
+        self.retry_budget = RetryBudget(session.options.retry_budget)
+        # Amount of retries that have been scheduled
+        self.retries = 0
+        # Amount of HEAD probes that have been repeated as GET
+        self.escalated_probes = 0
 
         # The results will be put into this queue for the HTTPQueue to grab the items from there
         self.result_queue: PriorityQueue = PriorityQueue()
 
-        self.next_proxy = None
+        # Pauses the requests to throttling or failing hosts if enabled
+        self.circuit_breaker: Optional[CircuitBreaker] = None
+        if session.options.circuit_breaker:
+            self.circuit_breaker = CircuitBreaker(max_parallel=session.options.threads)
+
+        # Distributes the requests across the proxies, if any are given
+        self.proxy_balancer: Optional[ProxyBalancer] = None
+
+        # Controls the amount of concurrently active handles if adaptive threads are enabled
+        self.concurrency: Optional[AIMDController] = None
+        if session.options.adaptive_threads:
+            self.concurrency = AIMDController(max_limit=session.options.threads)
 
         self.thread = None
         # This event gets cleared once the thread is supposed to stop. After successfully stopping, it sets it again
@@ -77,11 +138,19 @@ class HttpPool:
         self.thread_cancelled = Event()
         self.thread_cancelled.set()
 
+        # Selector watching the sockets of the active transfers. Only used with the event loop option
+        self.selector: Optional[selectors.BaseSelector] = None
+        # Socket pair used to interrupt the selector when new requests are queued or the thread should stop
+        self.wakeup_recv: Optional[socket.socket] = None
+        self.wakeup_send: Optional[socket.socket] = None
+        # Point in time (time.monotonic()) at which libcurl wants to be called for its timeouts. None if not requested
+        self.curl_timer_deadline: Optional[float] = None
+
         self.session: FuzzSession = session
         self.cache = self.session.cache
 
         if self.session.options.proxy_list:
-            self.next_proxy = self._get_next_proxy(self.session.options.proxy_list)
+            self.proxy_balancer = ProxyBalancer(self.session.options.proxy_list)
 
     def initialize(self) -> None:
         """
@@ -89,14 +158,26 @@ class HttpPool:
         """
         # pycurl Connection pool
         self.curl_multi = pycurl.CurlMulti()
+        self.curl_share = self.create_curl_share()
         self.handles = []
 
         for i in range(self.session.options.threads):
             curl_h = pycurl.Curl()
+            curl_h.setopt(pycurl.SHARE, self.curl_share)
             self.handles.append(curl_h)
             self.curlh_freelist.append(curl_h)
 
-        self.thread = Thread(target=getattr(self, "_process_curl_handles"))
+        if self.session.options.event_loop:
+            self.selector = selectors.DefaultSelector()
+            self.wakeup_recv, self.wakeup_send = socket.socketpair()
+            self.wakeup_recv.setblocking(False)
+            self.wakeup_send.setblocking(False)
+            self.selector.register(self.wakeup_recv, selectors.EVENT_READ)
+            self.curl_multi.setopt(pycurl.M_SOCKETFUNCTION, self._curl_socket_callback)
+            self.curl_multi.setopt(pycurl.M_TIMERFUNCTION, self._curl_timer_callback)
+            self.thread = Thread(target=self._process_curl_events)
+        else:
+            self.thread = Thread(target=self._process_curl_handles)
         self.thread.daemon = True
         self.thread.start()
 
@@ -109,8 +190,50 @@ class HttpPool:
                 "Requests enqueued": self.queued_requests,
                 "Responses received": self.processed,
             }
+            if self.queued_probes:
+                stats_dict["Probe requests enqueued"] = self.queued_probes
+            stats_dict["Retries"] = self.retries
+            if self.session.options.head_first:
+                stats_dict["HEAD probes repeated as GET"] = self.escalated_probes
+            if self.retry_budget.exhausted:
+                stats_dict["Retries refused by the budget"] = self.retry_budget.exhausted
+            stats_dict["Connections opened"] = self.connections_opened
+            stats_dict["Transfers reusing a connection"] = self.connections_reused
+            if self.concurrency:
+                stats_dict["Concurrency limit"] = self.concurrency.limit
+        if self.circuit_breaker:
+            stats_dict["Circuit breaker trips"] = self.circuit_breaker.opened
+            stats_dict["Hosts paused"] = self.circuit_breaker.paused()
+        if self.proxy_balancer:
+            stats_dict["Proxies available"] = f"{self.proxy_balancer.available()}/{len(self.proxy_balancer)}"
         return stats_dict
 
+    @staticmethod
+    def create_curl_share() -> pycurl.CurlShare:
+        """
+        Create a CurlShare for the DNS cache, the TLS sessions and, if libcurl supports it, the connection cache.
+        pycurl sets up the lock functions of the share itself, so it is safe to use from several threads.
+        """
+        curl_share = pycurl.CurlShare()
+        curl_share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_DNS)
+        curl_share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_SSL_SESSION)
+        # Sharing the connection cache requires libcurl 7.57.0
+        if hasattr(pycurl, "LOCK_DATA_CONNECT"):
+            try:
+                curl_share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_CONNECT)
+            except pycurl.error:
+                pass
+        return curl_share
+
+    def _record_connections(self, num_connects: int) -> None:
+        """
+        Count the new connections a finished transfer had to open (CURLINFO_NUM_CONNECTS)
+        """
+        with self.mutex_stats:
+            self.connections_opened += num_connects
+            if not num_connects:
+                self.connections_reused += 1
+
     def iter_results(self):
         """
         Method to receive the next item from the queue which stores the results of all the requests sent
@@ -128,9 +251,11 @@ class HttpPool:
         Set up curl handle again for another request
         """
         new_curl_h = ReqRespRequestFactory.to_http_object(fuzz_result.history, curl_h)
-        new_curl_h = self._set_extra_options(new_curl_h)
+        new_curl_h = self._set_extra_options(new_curl_h, fuzz_result)
 
-        new_curl_h.response_queue = (BytesIO(), BytesIO(), fuzz_result)
+        buff_header = BytesIO()
+        new_curl_h.response_queue = (StreamingBody(buff_header, self.body_limit, bool(self.session.options.compressed)),
+                                     buff_header, fuzz_result)
         new_curl_h.setopt(pycurl.WRITEFUNCTION, new_curl_h.response_queue[0].write)
         new_curl_h.setopt(pycurl.HEADERFUNCTION, new_curl_h.response_queue[1].write)
 
@@ -143,7 +268,7 @@ class HttpPool:
         It is important that enqueue is not called by the thread handling the requests, because it can deadlock if
         the queue is full while trying to append more.
         """
-        if self.session.options.cache_dir:
+        if self.session.options.cache_dir and not fuzz_result.probe_callback:
             cached = self.cache.get_object_from_object_cache(fuzz_result)
             # If the request is cached, put it in the queue to be processes by plugins and return.
             # This does not make additional requests, but it does allow plugins to process the cached request.
@@ -152,12 +277,32 @@ class HttpPool:
                 self.result_queue.put((self.base_result_priority, cached, False))
                 return
 
-        if self.sleep:
-            time.sleep(self.sleep)
+        # Only the wordlist requests are probed. Backfeed requests have been created on purpose
+        if self.session.options.head_first and fuzz_result.item_type == FuzzType.RESULT and \
+                fuzz_result.history.method == "GET" and not fuzz_result.probe_callback:
+            fuzz_result.history.head_probe = True
+            fuzz_result.history.method = "HEAD"
 
         with self.mutex_stats:
-            self.queued_requests += 1
+            if fuzz_result.probe_callback:
+                self.queued_probes += 1
+            else:
+                self.queued_requests += 1
         self.request_queue.put(fuzz_result)
+        self.wakeup()
+
+    def wakeup(self) -> None:
+        """
+        Interrupt the event loop waiting for socket activity, e.g. because new requests are available or
+        the thread should stop. Does nothing when the event loop is not active.
+        """
+        if not self.wakeup_send:
+            return
+        try:
+            self.wakeup_send.send(b"\0")
+        # The buffer being full means a wakeup is pending anyway
+        except (BlockingIOError, OSError):
+            pass
 
     def join_threads(self):
         self.thread.join()
@@ -172,77 +317,210 @@ class HttpPool:
             self.result_queue.task_done()
         self.result_queue.join()
 
-    @staticmethod
-    def _get_next_proxy(proxy_list):
-        index = 0
-        while True:
-            yield proxy_list[index]
-            index += 1
-            index = index % len(proxy_list)
-
-    def _set_extra_options(self, curl_h):
+    def _choose_proxy(self, fuzz_result: FuzzResult) -> Optional[str]:
         """
-        Set custom proxy and request timeout
+        Pick the proxy for the request, and remember it to attribute the outcome of the request to it
         """
-        if self.next_proxy:
-            proxy = next(self.next_proxy)
+        proxy = self.proxy_balancer.choose() if self.proxy_balancer else None
+        fuzz_result.history._proxy = proxy
+        return proxy
 
-            parsed_proxy = urlparse(proxy)
+    def _record_proxy_response(self, fuzz_result: FuzzResult) -> None:
+        if self.proxy_balancer and fuzz_result.history._proxy:
+            self.proxy_balancer.record_success(fuzz_result.history._proxy, fuzz_result.history.reqtime)
 
-            if parsed_proxy.scheme.lower() == "socks5":
-                curl_h.setopt(pycurl.PROXYTYPE, pycurl.PROXYTYPE_SOCKS5)
-                curl_h.setopt(pycurl.PROXY, parsed_proxy.netloc)
-            elif parsed_proxy.scheme.lower() == "socks4":
-                curl_h.setopt(pycurl.PROXYTYPE, pycurl.PROXYTYPE_SOCKS4)
-                curl_h.setopt(pycurl.PROXY, parsed_proxy.netloc)
-            else:
-                curl_h.setopt(pycurl.PROXY, parsed_proxy.netloc)
-        else:
-            curl_h.setopt(pycurl.PROXY, "")
+    def _record_proxy_error(self, fuzz_result: FuzzResult, errno: int) -> None:
+        if self.proxy_balancer and fuzz_result.history._proxy:
+            self.proxy_balancer.record_error(fuzz_result.history._proxy, errno)
+
+    def _set_extra_options(self, curl_h, fuzz_result: FuzzResult):
+        """
+        Set custom proxy, request timeout and compression
+        """
+        proxy = self._choose_proxy(fuzz_result)
+        return self.apply_extra_options(curl_h, proxy, self.session.options.request_timeout,
+                                        bool(self.session.options.compressed))
 
-        # Do not allow for responses bigger than 200MB
-        curl_h.setopt(pycurl.MAXFILESIZE, 200000000)
-        curl_h.setopt(pycurl.TIMEOUT, self.session.options.request_timeout)
+    @staticmethod
+    def apply_extra_options(curl_h: pycurl.Curl, proxy: Optional[str], request_timeout: int,
+                            compressed: bool = False) -> pycurl.Curl:
+        """
+        Set the proxy (or none), the request timeout and whether libcurl should ask for and decode compressed
+        responses on the curl handle. Options that did not change since the previous request of the handle are not
+        set again
+        """
+        applied_options = ReqRespRequestFactory.get_applied_options(curl_h)
+        if "proxy" not in applied_options or proxy != applied_options["proxy"]:
+            if proxy:
+                parsed_proxy = urlparse(proxy)
+
+                if parsed_proxy.scheme.lower() == "socks5":
+                    curl_h.setopt(pycurl.PROXYTYPE, pycurl.PROXYTYPE_SOCKS5)
+                    curl_h.setopt(pycurl.PROXY, parsed_proxy.netloc)
+                elif parsed_proxy.scheme.lower() == "socks4":
+                    curl_h.setopt(pycurl.PROXYTYPE, pycurl.PROXYTYPE_SOCKS4)
+                    curl_h.setopt(pycurl.PROXY, parsed_proxy.netloc)
+                else:
+                    curl_h.setopt(pycurl.PROXYTYPE, pycurl.PROXYTYPE_HTTP)
+                    curl_h.setopt(pycurl.PROXY, parsed_proxy.netloc)
+            else:
+                curl_h.setopt(pycurl.PROXY, "")
+            applied_options["proxy"] = proxy
+
+        if request_timeout != applied_options.get("timeout"):
+            # Do not allow for responses bigger than 200MB
+            curl_h.setopt(pycurl.MAXFILESIZE, 200000000)
+            curl_h.setopt(pycurl.TIMEOUT, request_timeout)
+            applied_options["timeout"] = request_timeout
+
+        if compressed != applied_options.get("compressed", False):
+            if compressed:
+                # An empty string advertises every encoding the libcurl build is able to decode
+                curl_h.setopt(pycurl.ACCEPT_ENCODING, "")
+            else:
+                curl_h.unsetopt(pycurl.ACCEPT_ENCODING)
+            applied_options["compressed"] = compressed
 
         return curl_h
 
+    def _finish_head_probe(self, fuzz_result: FuzzResult) -> bool:
+        """
+        Decide based on the response of a HEAD probe whether the request has to be repeated as GET. If so, it is
+        scheduled right away. Otherwise, the result is marked as discarded, as the filter would hide it anyway.
+
+        Returns True if the request has been repeated
+        """
+        fuzz_result.history.head_probe = False
+        response = fuzz_result.history._request.response
+        if response.code not in HEAD_UNSUPPORTED_CODES and \
+                self.session.compiled_simple_filter.is_filtered_by_headers(response.code):
+            fuzz_result.discarded = True
+            return False
+
+        fuzz_result.history.method = "GET"
+        self.retry_scheduler.schedule(fuzz_result, 0)
+        with self.mutex_stats:
+            self.escalated_probes += 1
+        return True
+
     def _process_curl_handle_response(self, curl_h: pycurl.Curl) -> None:
         buff_body, buff_header, res = curl_h.response_queue
-        # Bool indicating whether the request should be queued for request again. Useful for exceptions
-        requeue = False
-
         try:
-            ReqRespRequestFactory.from_http_object(
+            response = ReqRespRequestFactory.from_http_object(
                 res.history,
                 curl_h,
                 buff_header.getvalue(),
                 buff_body.getvalue(),
             )
+            response.content_metrics = buff_body.content_metrics()
         except Exception as e:
-            self.result_queue.put((self.base_result_priority, res.update(exception=e), requeue))
+            self._handle_unparsable_response(res, e)
         else:
-            # reset type to result otherwise backfeed items will enter an infinite loop
-            self.result_queue.put((self.base_result_priority, res.update(), requeue))
+            self._handle_response(res)
+
+    def _handle_response(self, fuzz_result: FuzzResult) -> None:
+        """
+        Pass on the result whose response has been received, unless the request has to be sent again
+        """
+        if self.concurrency:
+            self.concurrency.record_response(fuzz_result.history.reqtime, fuzz_result.history.code)
+        self._record_proxy_response(fuzz_result)
+        if self._record_circuit_response(fuzz_result):
+            return
+        if fuzz_result.history.head_probe and self._finish_head_probe(fuzz_result):
+            return
+        # reset type to result otherwise backfeed items will enter an infinite loop
+        self.result_queue.put((self.base_result_priority, fuzz_result.update(), False))
+        with self.mutex_stats:
+            self.processed += 1
 
+    def _handle_unparsable_response(self, fuzz_result: FuzzResult, exception: Exception) -> None:
+        self._record_circuit_outcome(fuzz_result, failed=False)
+        self.result_queue.put((self.base_result_priority, fuzz_result.update(exception=exception), False))
         with self.mutex_stats:
             self.processed += 1
 
+    def _handle_transfer_error(self, fuzz_result: FuzzResult, errno: int, errmsg: str) -> None:
+        """
+        Retry the failed transfer if possible, and pass the result on with the error otherwise
+        """
+        if self.concurrency:
+            self.concurrency.record_error(errno)
+        self._record_proxy_error(fuzz_result, errno)
+        self._record_circuit_outcome(fuzz_result, failed=True)
+
+        if not self._process_curl_determine_retry(fuzz_result, errno):
+            self._process_curl_handle_error(fuzz_result, errno, errmsg)
+
     def _process_curl_determine_retry(self, fuzz_result: FuzzResult, errno: int) -> bool:
         """
-        Check if the request should be requeued and forward it accordingly.
+        Check if the request should be retried, and schedule it after its backoff delay accordingly.
 
         Returns True if it should, and False if not
         """
-        if errno in UNRECOVERABLE_PYCURL_EXCEPTIONS or fuzz_result.history.retries >= 3:
+        if fuzz_result.history.retries >= self.session.options.retries:
             return False
-        # Bool indicating whether the request should be queued for request again. Useful for exceptions
-        requeue = True
+        # Connection failures may be caused by the proxy. Another proxy may get the request through
+        switch_proxy = errno in PROXY_ERRNOS and self.proxy_balancer and len(self.proxy_balancer) > 1
+        if errno in UNRECOVERABLE_PYCURL_EXCEPTIONS and not switch_proxy:
+            return False
+        return self._schedule_retry(fuzz_result, f"pycurl error {errno}", errno)
 
-        fuzz_result.history.retries += 1
+    def _schedule_retry(self, fuzz_result: FuzzResult, reason: str, errno: Optional[int] = None) -> bool:
+        """
+        Schedule the retry of the request if the retry budget allows it. Failed transfers (errno set) are delayed by
+        their backoff, throttled requests are sent as soon as their host allows it
 
-        self.result_queue.put((self.base_result_priority, fuzz_result, requeue))
+        Returns True if the retry has been scheduled
+        """
+        with self.mutex_stats:
+            requests = self.queued_requests
+        if not self.retry_budget.try_spend(requests):
+            if self.retry_budget.exhausted == 1:
+                self.logger.debug("Retry budget exhausted, further failed requests are not retried for now")
+            return False
+
+        fuzz_result.history.retries += 1
+        delay = backoff_delay(errno, fuzz_result.history.retries) if errno is not None else 0
+        self.retry_scheduler.schedule(fuzz_result, delay)
+        with self.mutex_stats:
+            self.retries += 1
+        self.logger.debug(f"Retrying {fuzz_result.history.url} in {delay:.2f}s after {reason} "
+                          f"(attempt {fuzz_result.history.retries})")
         return True
 
+    @staticmethod
+    def _circuit_key(fuzz_result: FuzzResult) -> str:
+        return urlparse(fuzz_result.history.url).netloc
+
+    def _record_circuit_response(self, fuzz_result: FuzzResult) -> bool:
+        """
+        Report the response to the circuit breaker. A throttled request is retried, and sent once the circuit of its
+        host allows it.
+
+        Returns True if the request has been scheduled again
+        """
+        if not self.circuit_breaker:
+            return False
+        code = fuzz_result.history.code
+        throttled = code in THROTTLE_STATUS_CODES
+        retry_after = None
+        if throttled:
+            response = fuzz_result.history._request.response
+            retry_after = parse_retry_after(HeaderMultiDict(response.get_headers()).get("Retry-After"))
+        self.circuit_breaker.record(self._circuit_key(fuzz_result), throttled, retry_after)
+
+        if not throttled or fuzz_result.history.retries >= self.session.options.retries:
+            return False
+        return self._schedule_retry(fuzz_result, f"status code {code}")
+
+    def _record_circuit_outcome(self, fuzz_result: FuzzResult, failed: bool) -> None:
+        """
+        Report a request that did not yield a response to the circuit breaker
+        """
+        if self.circuit_breaker:
+            self.circuit_breaker.record(self._circuit_key(fuzz_result), failed)
+
     def _process_curl_handle_error(self, fuzz_result: FuzzResult, errno, errmsg):
         """
         Handle unrecoverable failed request
@@ -251,6 +529,7 @@ class HttpPool:
         requeue = False
         e = FuzzExceptNetError("Pycurl error %d: %s" % (errno, errmsg))
         fuzz_result.history.totaltime = 0
+        fuzz_result.history.timings = None
         # Clearing the response. Otherwise, if the failed request is a recursive one, it would retain the response
         # data from the one before
         fuzz_result.history._request.response = None
@@ -258,20 +537,17 @@ class HttpPool:
         with self.mutex_stats:
             self.processed += 1
 
-    def _process_curl_handles(self):
+    def _read_curl_info(self) -> None:
         """
         Check for curl objects which have terminated, and add them to the curlh_freelist
         """
-        while self.thread_cancelled.is_set():
-            while self.thread_cancelled.is_set():
-                ret, num_handles = self.curl_multi.perform()
-                if ret != pycurl.E_CALL_MULTI_PERFORM:
-                    break
-
+        while True:
             num_q, ok_list, err_list = self.curl_multi.info_read()
 
             # Deal with curl handles that have returned successfully
             for curl_h in ok_list:
+                self._update_host_load(curl_h.response_queue[2], -1)
+                self._record_connections(curl_h.getinfo(pycurl.NUM_CONNECTS))
                 self._process_curl_handle_response(curl_h)
                 self.curl_multi.remove_handle(curl_h)
                 self.curlh_freelist.append(curl_h)
@@ -279,25 +555,216 @@ class HttpPool:
             # Deal with curl handles that returned errors
             for curl_h, errno, errmsg in err_list:
                 buff_body, buff_header, res = curl_h.response_queue
-
-                if not self._process_curl_determine_retry(res, errno):
-                    self._process_curl_handle_error(res, errno, errmsg)
+                self._update_host_load(res, -1)
+                self._record_connections(curl_h.getinfo(pycurl.NUM_CONNECTS))
+                self._handle_transfer_error(res, errno, errmsg)
 
                 self.curl_multi.remove_handle(curl_h)
                 self.curlh_freelist.append(curl_h)
 
-            # Put curl handles for sending out requests
-            while self.curlh_freelist and not self.request_queue.empty():
-                curl_h = self.curlh_freelist.pop()
-                fuzzres = self.request_queue.get()
+            if not num_q:
+                break
+
+    def _rate_limit_key(self, fuzz_result: FuzzResult) -> Optional[str]:
+        if not self.session.options.rate_per_host:
+            return None
+        return urlparse(fuzz_result.history.url).netloc
+
+    def _update_host_load(self, fuzz_result: FuzzResult, delta: int) -> None:
+        """
+        Count a request to the host as started (1) or finished (-1)
+        """
+        if not self.session.options.host_threads:
+            return
+        host = urlparse(fuzz_result.history.url).netloc
+        self.host_load[host] = self.host_load.get(host, 0) + delta
+
+    def _host_at_limit(self, fuzz_result: FuzzResult) -> bool:
+        if not self.session.options.host_threads:
+            return False
+        return self.host_load.get(urlparse(fuzz_result.history.url).netloc, 0) >= self.session.options.host_threads
+
+    def _next_request(self) -> Optional[FuzzResult]:
+        """
+        Return the next request that may be sent out now, or None if there is none. Due retries go first
+        """
+        if not self.rate_limiter and not self.session.options.host_threads and not self.circuit_breaker:
+            retry = self.retry_scheduler.pop_due()
+            if retry is not None:
+                return retry
+            if self.request_queue.empty():
+                return None
+            fuzzres = self.request_queue.get()
+            self.request_queue.task_done()
+            return fuzzres
+
+        retry = self.retry_scheduler.pop_due()
+        while retry is not None:
+            self.throttled_requests.insert(0, retry)
+            retry = self.retry_scheduler.pop_due()
+        # Hold back a limited amount of requests, so that requests to other hosts can overtake throttled ones
+        while len(self.throttled_requests) < self.session.options.threads and not self.request_queue.empty():
+            self.throttled_requests.append(self.request_queue.get())
+            self.request_queue.task_done()
+
+        checked_keys = set()
+        for index, fuzzres in enumerate(self.throttled_requests):
+            if self._host_at_limit(fuzzres):
+                continue
+            if self.circuit_breaker and not self.circuit_breaker.allows(self._circuit_key(fuzzres)):
+                continue
+            key = self._rate_limit_key(fuzzres)
+            if key in checked_keys:
+                continue
+            if not self.rate_limiter or self.rate_limiter.try_acquire(key):
+                self._update_host_load(fuzzres, 1)
+                if self.circuit_breaker:
+                    self.circuit_breaker.started(self._circuit_key(fuzzres))
+                return self.throttled_requests.pop(index)
+            checked_keys.add(key)
+        return None
+
+    def _throttle_delay(self) -> Optional[float]:
+        """
+        Seconds until one of the held back requests may be sent. None if no request is held back
+        """
+        if not self.throttled_requests:
+            return None
+        return min(self.rate_limiter.delay(self._rate_limit_key(fuzzres)) for fuzzres in self.throttled_requests)
 
-                self.curl_multi.add_handle(self._prepare_curl_h(curl_h, fuzzres))
-                self.request_queue.task_done()
+    def _wait_timeout(self, timeout: float) -> float:
+        """
+        Shorten the timeout for waiting on events to when the next held back request or retry is due
+        """
+        circuit_delay = self.circuit_breaker.delay() if self.circuit_breaker and self.throttled_requests else None
+        for delay in (self._throttle_delay() if self.rate_limiter else None, self.retry_scheduler.delay(),
+                      circuit_delay):
+            if delay is not None:
+                timeout = min(timeout, delay)
+        return timeout
+
+    def _add_curl_handles(self) -> None:
+        """
+        Put curl handles for sending out requests
+        """
+        while self.curlh_freelist:
+            if self.concurrency and len(self.handles) - len(self.curlh_freelist) >= self.concurrency.limit:
+                break
+            fuzzres = self._next_request()
+            if fuzzres is None:
+                break
+            curl_h = self.curlh_freelist.pop()
+
+            self.curl_multi.add_handle(self._prepare_curl_h(curl_h, fuzzres))
+
+    def _process_curl_handles(self):
+        """
+        Main loop of the thread handling the requests. Continuously drives the transfers and polls for finished ones
+        """
+        while self.thread_cancelled.is_set():
+            while self.thread_cancelled.is_set():
+                ret, num_handles = self.curl_multi.perform()
+                if ret != pycurl.E_CALL_MULTI_PERFORM:
+                    break
+
+            self._read_curl_info()
+            self._add_curl_handles()
+        self._cleanup_curl_handles()
+
+    def _curl_socket_callback(self, event: int, fd: int, multi: pycurl.CurlMulti, data) -> None:
+        """
+        Called by libcurl whenever it wants a socket to be watched for different events, or not watched anymore
+        """
+        if event == pycurl.POLL_REMOVE:
+            try:
+                self.selector.unregister(fd)
+            except (KeyError, ValueError):
+                pass
+            return
+
+        events = 0
+        if event in (pycurl.POLL_IN, pycurl.POLL_INOUT):
+            events |= selectors.EVENT_READ
+        if event in (pycurl.POLL_OUT, pycurl.POLL_INOUT):
+            events |= selectors.EVENT_WRITE
+        if not events:
+            return
+        try:
+            self.selector.modify(fd, events)
+        except KeyError:
+            self.selector.register(fd, events)
+
+    def _curl_timer_callback(self, timeout_ms: int) -> None:
+        """
+        Called by libcurl to request being called again after timeout_ms. -1 deletes the timer
+        """
+        if timeout_ms < 0:
+            self.curl_timer_deadline = None
+        else:
+            self.curl_timer_deadline = time.monotonic() + timeout_ms / 1000
+
+    def _process_curl_events(self):
+        """
+        Main loop of the thread handling the requests when the event loop option is active. Instead of constantly
+        polling the transfers, it sleeps until either a socket has activity, libcurl's timer expires,
+        or new requests have been queued.
+        """
+        while self.thread_cancelled.is_set():
+            self._add_curl_handles()
+
+            if self.curl_timer_deadline is None:
+                # Regularly waking up is not necessary, but cheap and guards against a missed wakeup
+                timeout = 1
+            else:
+                timeout = min(max(self.curl_timer_deadline - time.monotonic(), 0), 1)
+            timeout = self._wait_timeout(timeout)
+
+            for key, mask in self.selector.select(timeout):
+                if key.fileobj is self.wakeup_recv:
+                    try:
+                        while self.wakeup_recv.recv(4096):
+                            pass
+                    except (BlockingIOError, OSError):
+                        pass
+                    continue
+                action = 0
+                if mask & selectors.EVENT_READ:
+                    action |= pycurl.CSELECT_IN
+                if mask & selectors.EVENT_WRITE:
+                    action |= pycurl.CSELECT_OUT
+                self.curl_multi.socket_action(key.fd, action)
+
+            if self.curl_timer_deadline is not None and time.monotonic() >= self.curl_timer_deadline:
+                # Reset before calling, as libcurl may set a new timer during the call
+                self.curl_timer_deadline = None
+                self.curl_multi.socket_action(pycurl.SOCKET_TIMEOUT, 0)
+
+            self._read_curl_info()
+        self._cleanup_curl_handles()
+
+        self.selector.close()
+        self.wakeup_recv.close()
+        self.wakeup_send.close()
+        self.wakeup_send = None
+
+    def _log_transfer_stats(self) -> None:
+        self.logger.debug(f"Connections opened: {self.connections_opened}, "
+                          f"transfers reusing a connection: {self.connections_reused}")
+        if self.proxy_balancer:
+            for line in self.proxy_balancer.summary():
+                self.logger.debug(f"Proxy {line}")
+
+    def _cleanup_curl_handles(self):
+        """
+        Close all curl handles and signal that the thread stopped
+        """
         # cleanup multi stack
         for c in self.handles:
             c.close()
             self.curlh_freelist.append(c)
         self.curl_multi.close()
+        self.curl_share.close()
 
+        self._log_transfer_stats()
         self.logger.debug(f"_process_curl_handles stopped")
         self.thread_cancelled.set()
@@ -112,6 +112,13 @@ def _log_runtime_stats(logger: logging.Logger, stats: FuzzStats):
 # Big subdirectories:
 {frequent_hits}
 # Total Time: {str(time_formatted)}"""
+    if stats.target_stats:
+        runtime_info += "\n\n# Targets:"
+        for target, target_stats in stats.target_stats.items():
+            runtime_info += f"\n{target}: {target_stats}"
+    timing_summary = stats.timing_summary()
+    if timing_summary:
+        runtime_info += f"\n\n# Transfer phases (mean, p95):\n{timing_summary}"
     logger.info(runtime_info)
 
 
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
     from wenum.fuzzobjects import FuzzResult
 from .plugin_api.urlutils import parse_url
-import socket
+from .helpers.dns_cache import DNSCache, resolve_host
 import itertools
 from abc import abstractmethod
 
@@ -168,12 +168,13 @@ class FuzzRequestUrlMixing:
         recursion_url = self.strip_redundant_parts(recursion_url)
         return recursion_url
 
-    def check_in_scope(self, url: str, domain_based: bool = False) -> bool:
+    def check_in_scope(self, url: str, domain_based: bool = False, dns_cache: Optional[DNSCache] = None) -> bool:
         """
         Takes a URL and compares its scope to the base URL. Compares whether they belong to the same host.
 
         By default, same IP with different domain name counts as in scope.
         If the 'domain_based' is True, different domain names are out of scope.
+        Host names are resolved through dns_cache if supplied, and with the system resolver otherwise.
 
         Returns True if the URL is in scope, and False if it is not
 
@@ -196,28 +197,21 @@ class FuzzRequestUrlMixing:
         if not target_hostname:
             return True
 
-        try:
-            # Ignore port
-            if target_hostname.find(':') != -1:
-                target_hostname = target_hostname[0:target_hostname.find(':')]
-            target_ip = socket.gethostbyname(target_hostname)
-        except:
-            target_ip = "0.0.0.0"
+        # Ignore port
+        if target_hostname.find(':') != -1:
+            target_hostname = target_hostname[0:target_hostname.find(':')]
 
+        # The same host name is always in scope, no need to resolve anything
+        if initial_hostname == target_hostname:
+            return True
         # Check for domain name match, if domain based check
         if domain_based:
-            if initial_hostname == target_hostname:
-                return True
-            else:
-                return False
-
-        try:
-            scope_ip = socket.gethostbyname(initial_hostname)
-        # Exception thrown when the host name does not resolve. Should not be in scope in such a case either
-        except socket.gaierror:
             return False
 
-        if target_ip == scope_ip or initial_hostname == target_hostname:
-            return True
-        else:
+        resolve = dns_cache.resolve if dns_cache else resolve_host
+        scope_ip = resolve(initial_hostname)
+        # The host name does not resolve. Should not be in scope in such a case either
+        if scope_ip is None:
             return False
+
+        return resolve(target_hostname) == scope_ip
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import heapq
+import itertools
 import logging
 import queue
 import time
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable
 
 from typing import Optional
 
@@ -58,6 +60,49 @@ class FuzzPriorityQueue(PriorityQueue):
 
         return item
 
+    def get_waiting(self, item_type: FuzzType, limit: int) -> list[FuzzItem]:
+        """
+        Take up to limit items of item_type from the front of the queue without blocking. Stops at the first item of
+        another type, so that the items are still taken in the order of their priority. Each of them has to be
+        marked with task_done like the ones returned by get
+        """
+        items = []
+        with self.mutex:
+            while self.queue and len(items) < limit and self.queue[0][1].item_type == item_type:
+                items.append(heapq.heappop(self.queue)[1])
+            if items:
+                self.not_full.notify(len(items))
+        return items
+
+
+class AgingPriorityQueue(queue.Queue):
+    """
+    Queue respecting the priority of FuzzItem objects, in which waiting items age: every second an item spends in
+    the queue improves its priority by the aging value. This way items of a low priority can't starve behind a
+    constant flow of items with a higher priority. Items of the same priority are returned in insertion order.
+    """
+
+    def __init__(self, maxsize=0, aging: float = 1, clock: Callable[[], float] = time.monotonic):
+        self.aging = aging
+        self.clock = clock
+        self.counter = itertools.count()
+        queue.Queue.__init__(self, maxsize)
+
+    # Overriding the storage methods of Queue, like PriorityQueue does. They are called with the queue's lock held
+    def _init(self, maxsize):
+        self.queue = []
+
+    def _qsize(self):
+        return len(self.queue)
+
+    def _put(self, item: FuzzItem):
+        # Aging is the same for every item, so instead of updating the waiting items, the priority is converted into
+        # an offset of the point in time the item is due
+        heapq.heappush(self.queue, (self.clock() + item.priority / self.aging, next(self.counter), item))
+
+    def _get(self):
+        return heapq.heappop(self.queue)[2]
+
 
 class FuzzQueue(FuzzPriorityQueue, Thread, ABC):
     def __init__(self, session: FuzzSession, queue_out=None, maxsize=0):
@@ -275,6 +320,8 @@ class MonitorQueue(FuzzQueue):
                     self.stats.pending_fuzz.dec()
                     if item.discarded:
                         self.stats.filtered.inc()
+                    self.stats.update_target_stats(item)
+                    self.stats.update_timing_stats(item)
 
                 # If no requests are left, trigger the ending routine
                 if self.stats.pending_fuzz() == 0 and self.stats.pending_seeds() == 0:
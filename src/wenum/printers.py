@@ -134,6 +134,12 @@ class JSON(BasePrinter):
             "description": fuzz_result.description,
             "plugins": plugin_dict
         }
+        # Results of several targets tell which target they belong to
+        target = stats.target_of(fuzz_result)
+        if target:
+            res_entry["target"] = target
+        if fuzz_result.history.timings:
+            res_entry["timings"] = {name: round(value, 6) for name, value in fuzz_result.history.timings.items()}
         self.result_list.append(res_entry)
         return self.result_list
 
@@ -0,0 +1,336 @@
+from __future__ import annotations
+
+import itertools
+import math
+import multiprocessing
+import queue
+import select
+from io import BytesIO
+from multiprocessing.connection import Connection
+from threading import Thread
+from typing import TYPE_CHECKING, Optional
+
+import pycurl
+
+if TYPE_CHECKING:
+    from wenum.runtime_session import FuzzSession
+from .exception import FuzzExceptResourceParseError
+from .factories.reqresp_factory import ReqRespRequestFactory
+from .fuzzobjects import FuzzResult
+from .fuzzrequest import FuzzRequest
+from .helpers.metrics import StreamingBody, compute_content_metrics
+from .httppool import HttpPool
+
+# Types of the messages sent from the workers to the main process. RESULT_OK and RESULT_ERROR messages end with
+# the amount of connections the transfer opened. RESULT_OK carries the response, its total time and its timings
+RESULT_OK = 0
+RESULT_ERROR = 1
+RESULT_EXCEPTION = 2
+# Sent by the main process itself to interrupt waiting for worker results
+WAKEUP = 3
+# Error the transfers of a worker process which died are failed with, so that they may be retried by another one
+WORKER_DIED_ERRNO = pycurl.E_ABORTED_BY_CALLBACK
+
+
+class ProcessHttpPool(HttpPool):
+    """
+    HttpPool sending the requests from several worker processes. Each worker owns a CurlMulti, parses the responses
+    and calculates their metrics, so that only the finished responses have to be handled by the main process.
+    Caching, rate limiting, retries and the adaptive concurrency stay in the main process.
+    """
+
+    def __init__(self, session: FuzzSession):
+        super().__init__(session)
+        self.processes: int = session.options.processes
+        # Amount of concurrent transfers each worker may have
+        self.handles_per_worker: int = math.ceil(session.options.threads / self.processes)
+        self.context = multiprocessing.get_context("spawn")
+
+        self.workers: list[multiprocessing.Process] = []
+        # Connections to send the jobs to the workers
+        self.job_conns: list[Connection] = []
+        # Amount of jobs currently assigned to each worker
+        self.worker_load: list[int] = []
+        # Indexes of the workers which died, and are not sent any further jobs
+        self.dead_workers: set[int] = set()
+        # Shared by all the workers to return their results
+        self.worker_results: Optional[multiprocessing.Queue] = None
+        # Maps the job id to the result object and the index of the worker sending it
+        self.pending_jobs: dict[int, tuple[FuzzResult, int]] = {}
+        self.job_ids = itertools.count()
+        # Set while the main loop waits for worker results, so that wakeup knows if it has to interrupt it
+        self.waiting = False
+
+    def initialize(self) -> None:
+        """
+        Start the worker processes and the thread exchanging data with them
+        """
+        self.worker_results = self.context.Queue()
+        for i in range(self.processes):
+            recv_conn, send_conn = self.context.Pipe(duplex=False)
+            worker = self.context.Process(target=_worker_main,
+                                          args=(recv_conn, self.worker_results, self.handles_per_worker,
+                                                self.session.options.request_timeout, self.body_limit,
+                                                bool(self.session.options.compressed)),
+                                          name=f"wenum-worker-{i}", daemon=True)
+            worker.start()
+            recv_conn.close()
+            self.workers.append(worker)
+            self.job_conns.append(send_conn)
+            self.worker_load.append(0)
+
+        self.thread = Thread(target=self._process_workers)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def job_stats(self) -> dict:
+        stats_dict = super().job_stats()
+        stats_dict["Worker processes"] = self.processes
+        return stats_dict
+
+    def wakeup(self) -> None:
+        if self.waiting and self.worker_results:
+            self.worker_results.put((WAKEUP,))
+
+    def _dispatch_requests(self) -> None:
+        """
+        Hand the available requests to the workers with the least load
+        """
+        while True:
+            if self.concurrency and len(self.pending_jobs) >= self.concurrency.limit:
+                break
+            alive_workers = [index for index in range(self.processes) if index not in self.dead_workers]
+            if not alive_workers:
+                self._fail_requests_without_workers()
+                break
+            worker_index = min(alive_workers, key=self.worker_load.__getitem__)
+            if self.worker_load[worker_index] >= self.handles_per_worker:
+                break
+            fuzzres = self._next_request()
+            if fuzzres is None:
+                break
+
+            job_id = next(self.job_ids)
+            self.pending_jobs[job_id] = (fuzzres, worker_index)
+            self.worker_load[worker_index] += 1
+
+            # Only send what the worker needs, not the response of the result this one may have been copied from
+            fuzz_request = fuzzres.history.copy_without_response()
+            proxy = self._choose_proxy(fuzzres)
+            try:
+                self.job_conns[worker_index].send((job_id, fuzz_request, proxy))
+            except OSError:
+                self._handle_dead_worker(worker_index)
+
+    def _check_workers(self) -> None:
+        """
+        Find workers which died since the last check
+        """
+        for worker_index, worker in enumerate(self.workers):
+            if worker_index not in self.dead_workers and not worker.is_alive():
+                self._handle_dead_worker(worker_index)
+
+    def _handle_dead_worker(self, worker_index: int) -> None:
+        """
+        Stop sending jobs to the worker, and fail the transfers it did not finish. They may be retried by another one
+        """
+        self.dead_workers.add(worker_index)
+        exitcode = self.workers[worker_index].exitcode
+        self.logger.warning(f"Worker process {worker_index} died with exit code {exitcode}")
+        lost_jobs = [job_id for job_id, (_, index) in self.pending_jobs.items() if index == worker_index]
+        for job_id in lost_jobs:
+            fuzz_result, _ = self.pending_jobs.pop(job_id)
+            self.worker_load[worker_index] -= 1
+            self._update_host_load(fuzz_result, -1)
+            self._handle_transfer_error(fuzz_result, WORKER_DIED_ERRNO,
+                                        f"Worker process died with exit code {exitcode}")
+
+    def _fail_requests_without_workers(self) -> None:
+        """
+        Pass on the waiting requests with an error once no worker is left to send them
+        """
+        while True:
+            fuzzres = self._next_request()
+            if fuzzres is None:
+                break
+            self._update_host_load(fuzzres, -1)
+            self._record_circuit_outcome(fuzzres, failed=True)
+            self._process_curl_handle_error(fuzzres, WORKER_DIED_ERRNO, "No worker process is left")
+
+    def _process_worker_message(self, message: tuple) -> None:
+        if message[0] == WAKEUP:
+            return
+
+        job_id = message[1]
+        if job_id not in self.pending_jobs:
+            # The worker died right after sending the result, and its jobs have already been failed
+            return
+        fuzz_result, worker_index = self.pending_jobs.pop(job_id)
+        self.worker_load[worker_index] -= 1
+        self._update_host_load(fuzz_result, -1)
+
+        if message[0] != RESULT_EXCEPTION:
+            self._record_connections(message[-1])
+
+        if message[0] == RESULT_OK:
+            response, totaltime = message[2], message[3]
+            fuzz_result.history._request.response = response
+            fuzz_result.history._request.totaltime = totaltime
+            fuzz_result.history._request.timings = message[4]
+            self._handle_response(fuzz_result)
+        elif message[0] == RESULT_EXCEPTION:
+            self._handle_unparsable_response(fuzz_result, FuzzExceptResourceParseError(message[2]))
+        else:
+            self._handle_transfer_error(fuzz_result, message[2], message[3])
+
+    def _process_workers(self):
+        """
+        Main loop of the thread distributing the requests to the workers and collecting their results
+        """
+        while self.thread_cancelled.is_set():
+            self._check_workers()
+            # Set before dispatching, so that requests queued in the meantime interrupt the wait below
+            self.waiting = True
+            self._dispatch_requests()
+
+            timeout = self._wait_timeout(1)
+
+            try:
+                message = self.worker_results.get(timeout=timeout)
+            except queue.Empty:
+                continue
+            finally:
+                self.waiting = False
+
+            self._process_worker_message(message)
+            while True:
+                try:
+                    message = self.worker_results.get_nowait()
+                except queue.Empty:
+                    break
+                self._process_worker_message(message)
+        self._cleanup_workers()
+
+    def _cleanup_workers(self):
+        """
+        Stop the workers and signal that the thread stopped
+        """
+        for job_conn in self.job_conns:
+            try:
+                job_conn.send(None)
+            except OSError:
+                pass
+            job_conn.close()
+        for worker in self.workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+        self.worker_results.close()
+
+        self._log_transfer_stats()
+        self.logger.debug(f"_process_workers stopped")
+        self.thread_cancelled.set()
+
+
+def _worker_main(job_conn: Connection, worker_results: multiprocessing.Queue, max_handles: int,
+                 request_timeout: int, body_limit: Optional[int], compressed: bool) -> None:
+    """
+    Entry point of the worker processes. Sends the requests it receives through job_conn and puts the results
+    into worker_results, until it receives None.
+    """
+    curl_multi = pycurl.CurlMulti()
+    curl_share = HttpPool.create_curl_share()
+    handles = [pycurl.Curl() for _ in range(max_handles)]
+    for curl_h in handles:
+        curl_h.setopt(pycurl.SHARE, curl_share)
+    curlh_freelist = list(handles)
+    running = True
+
+    while running:
+        # Block while idle, otherwise only take what is already there
+        while curlh_freelist and job_conn.poll(None if len(curlh_freelist) == max_handles else 0):
+            try:
+                job = job_conn.recv()
+            except EOFError:
+                job = None
+            if job is None:
+                running = False
+                break
+            curl_h = curlh_freelist.pop()
+            try:
+                _worker_add_job(curl_multi, curl_h, job, request_timeout, body_limit, compressed)
+            except Exception as e:
+                worker_results.put((RESULT_EXCEPTION, job[0], f"Error preparing the request: {e}"))
+                curl_h.fuzz_request = curl_h.buff_body = curl_h.buff_header = None
+                curlh_freelist.append(curl_h)
+        if not running:
+            break
+
+        while True:
+            ret, num_handles = curl_multi.perform()
+            if ret != pycurl.E_CALL_MULTI_PERFORM:
+                break
+
+        while True:
+            num_q, ok_list, err_list = curl_multi.info_read()
+            for curl_h in ok_list:
+                worker_results.put(_worker_response(curl_h))
+                curl_multi.remove_handle(curl_h)
+                curlh_freelist.append(curl_h)
+            for curl_h, errno, errmsg in err_list:
+                worker_results.put((RESULT_ERROR, curl_h.job_id, errno, errmsg,
+                                    curl_h.getinfo(pycurl.NUM_CONNECTS)))
+                curl_multi.remove_handle(curl_h)
+                curlh_freelist.append(curl_h)
+            if not num_q:
+                break
+
+        if len(curlh_freelist) == max_handles:
+            continue
+
+        # Wait for activity on the transfers or new jobs
+        read_fds, write_fds, except_fds = curl_multi.fdset()
+        timeout = curl_multi.timeout()
+        timeout = 1 if timeout < 0 else min(timeout / 1000, 1)
+        if curlh_freelist:
+            read_fds.append(job_conn.fileno())
+        if timeout > 0:
+            select.select(read_fds, write_fds, except_fds, timeout)
+
+    for curl_h in handles:
+        curl_h.close()
+    curl_multi.close()
+    curl_share.close()
+
+
+def _worker_add_job(curl_multi: pycurl.CurlMulti, curl_h: pycurl.Curl, job: tuple, request_timeout: int,
+                    body_limit: Optional[int], compressed: bool) -> None:
+    job_id, fuzz_request, proxy = job
+    ReqRespRequestFactory.to_http_object(fuzz_request, curl_h)
+    HttpPool.apply_extra_options(curl_h, proxy, request_timeout, compressed)
+
+    curl_h.job_id = job_id
+    curl_h.fuzz_request = fuzz_request
+    curl_h.buff_header = BytesIO()
+    curl_h.buff_body = StreamingBody(curl_h.buff_header, body_limit, compressed)
+    curl_h.setopt(pycurl.WRITEFUNCTION, curl_h.buff_body.write)
+    curl_h.setopt(pycurl.HEADERFUNCTION, curl_h.buff_header.write)
+    curl_multi.add_handle(curl_h)
+
+
+def _worker_response(curl_h: pycurl.Curl) -> tuple:
+    """
+    Parse the response of the finished transfer, and build the message for the main process
+    """
+    fuzz_request: FuzzRequest = curl_h.fuzz_request
+    try:
+        response = ReqRespRequestFactory.from_http_object(fuzz_request, curl_h, curl_h.buff_header.getvalue(),
+                                                          curl_h.buff_body.getvalue())
+        response.content_metrics = curl_h.buff_body.content_metrics() or \
+            compute_content_metrics(response.get_content())
+    except Exception as e:
+        return RESULT_EXCEPTION, curl_h.job_id, f"Error parsing the response: {e}"
+    finally:
+        curl_h.fuzz_request = curl_h.buff_body = curl_h.buff_header = None
+    return RESULT_OK, curl_h.job_id, response, fuzz_request._request.totaltime, fuzz_request._request.timings, \
+        curl_h.getinfo(pycurl.NUM_CONNECTS)
@@ -16,6 +16,11 @@ from .filters.simplefilter import FuzzResSimpleFilter
 from .core import Fuzzer
 from .iterators import BaseIterator
 from .httppool import HttpPool
+from .processpool import ProcessHttpPool
+from .asyncpool import AsyncHttpPool
+from .transport import Transport
+from .falsepositive import FalsePositiveProbes
+from .helpers.dns_cache import DNSCache
 
 from .externals.reqresp.cache import HttpCache
 from .printers import JSON, HTML, BasePrinter
@@ -38,12 +43,18 @@ class FuzzSession:
         self.compiled_filter: Optional[FuzzResFilter] = None
         self.compiled_simple_filter: Optional[FuzzResSimpleFilter] = None
         self.compiled_seed: Optional[FuzzResult] = None
+        # The initial seeds of all targets. The first one is the compiled_seed
+        self.compiled_target_seeds: list[FuzzResult] = []
         self.compiled_printer_list: list[BasePrinter] = []
         self.compiled_iterator: Optional[BaseIterator] = None
         self.current_priority_level: int = PRIORITY_STEP
 
         self.cache: HttpCache = HttpCache(cache_dir=self.options.cache_dir)
-        self.http_pool: Optional[HttpPool] = None
+        self.http_pool: Optional[Transport] = None
+        # Decides whether recursion directories are false positives, with requests sent through the http_pool
+        self.false_positive_probes: Optional[FalsePositiveProbes] = None
+        # Shared by all the scope checks, which would otherwise resolve the same hosts over and over again
+        self.dns_cache: DNSCache = DNSCache()
 
         #TODO Unused?
         self.stats = FuzzStats()
@@ -96,6 +107,8 @@ class FuzzSession:
 
     def compile_seeds(self):
         self.compiled_seed = resfactory.create("seed_from_options", self)
+        self.compiled_target_seeds = [self.compiled_seed] + [
+            resfactory.create("seed_from_target", self.compiled_seed, url) for url in self.options.url_list[1:]]
 
     def compile(self):
         """
@@ -139,7 +152,13 @@ class FuzzSession:
             raise FuzzExceptBadOptions("FUZZ words and number of payloads do not match!")
 
         if not self.http_pool:
-            self.http_pool = HttpPool(self)
+            if self.options.transport == "asyncio":
+                self.http_pool = AsyncHttpPool(self)
+            elif self.options.processes:
+                self.http_pool = ProcessHttpPool(self)
+            else:
+                self.http_pool = HttpPool(self)
+            self.false_positive_probes = FalsePositiveProbes(self.http_pool)
 
         return self
 
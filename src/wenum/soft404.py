@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import functools
+import re
+import secrets
+from threading import Lock
+from typing import TYPE_CHECKING, Callable, Optional
+
+from .fuzzobjects import FuzzResult
+from .helpers.simhash import hamming_distance, simhash
+
+if TYPE_CHECKING:
+    from .transport import Transport
+
+# Amount of random paths requested in each directory to learn how it answers paths that do not exist
+PROBES_PER_DIRECTORY = 3
+# If the fingerprints of the probes of a directory differ in more bits, its answers are too dynamic to be
+# recognized, and nothing is discarded there
+MAX_BASELINE_SPREAD = 16
+
+FUZZ_MARKER_REGEX = re.compile(r"FUZ\d*Z")
+
+# Status code and fingerprint of a response
+Baseline = tuple[int, int]
+
+
+class DirectoryBaseline:
+    """
+    How a directory answers paths that do not exist
+    """
+
+    def __init__(self, distance: int, probe_responses: list[Optional[Baseline]]):
+        self.codes: set[int] = set()
+        self.fingerprints: list[int] = []
+        # Real 404s are no soft-404s, and failed probes tell nothing
+        for probe_response in probe_responses:
+            if probe_response is None or probe_response[0] == 404:
+                continue
+            self.codes.add(probe_response[0])
+            self.fingerprints.append(probe_response[1])
+        # Calibrate the tolerance with how much the answers to the probes already differ from each other, which
+        # is how much a dynamic page of the directory changes between requests
+        spread = max((hamming_distance(first, second) for first in self.fingerprints
+                      for second in self.fingerprints), default=0)
+        if spread > MAX_BASELINE_SPREAD:
+            self.fingerprints = []
+        self.tolerance = distance + spread
+
+    def matches(self, code: int, fingerprint: int) -> bool:
+        return code in self.codes and \
+            any(hamming_distance(fingerprint, baseline) <= self.tolerance for baseline in self.fingerprints)
+
+
+class Soft404Detector:
+    """
+    Recognizes soft-404s, pages that are served for paths that do not exist but do not have the status code 404.
+    Comparing the code, lines and words fails when these pages echo the requested path or contain a timestamp, so
+    the bodies are compared by their simhash instead. Random paths of each directory are requested through the
+    transport to calibrate a baseline, and results whose fingerprint is close enough to it are soft-404s.
+
+    The probes do not block the caller: Callers register a callback with when_ready to be notified once the
+    baseline of the directory is available, like with the FalsePositiveProbes.
+    """
+
+    def __init__(self, http_pool: Transport, distance: int):
+        self.http_pool = http_pool
+        self.distance = distance
+        self.mutex = Lock()
+        # Status code and fingerprint of the probe responses of each directory. None for failed requests
+        self.responses: dict[str, list[Optional[Baseline]]] = {}
+        # Amount of probe requests of each directory which have not returned yet
+        self.pending: dict[str, int] = {}
+        self.baselines: dict[str, DirectoryBaseline] = {}
+        # Callbacks waiting for the baseline of a directory
+        self.waiting: dict[str, list[Callable[[], None]]] = {}
+
+    @staticmethod
+    def fingerprint(fuzz_result: FuzzResult) -> int:
+        return simhash(fuzz_result.history.content)
+
+    def is_soft_404(self, fuzz_result: FuzzResult) -> Optional[bool]:
+        """
+        Returns whether the result is a soft-404, or None if the baseline of its directory is not available yet. The
+        probes are sent if they have not been already. The directory is the seed the result has been generated from
+        """
+        directory = fuzz_result.seed_url
+        with self.mutex:
+            baseline = self.baselines.get(directory)
+            send_probes = baseline is None and directory not in self.responses
+            if send_probes:
+                self.responses[directory] = [None] * PROBES_PER_DIRECTORY
+                self.pending[directory] = PROBES_PER_DIRECTORY
+        if baseline is None:
+            if send_probes:
+                self._send_probes(fuzz_result)
+            return None
+        return baseline.matches(fuzz_result.code, self.fingerprint(fuzz_result))
+
+    def _send_probes(self, fuzz_result: FuzzResult) -> None:
+        directory = fuzz_result.seed_url
+        for index in range(PROBES_PER_DIRECTORY):
+            probe = FuzzResult(history=fuzz_result.history.copy_without_response())
+            probe.history.url = FUZZ_MARKER_REGEX.sub(lambda match: secrets.token_hex(8), directory)
+            probe.probe_callback = functools.partial(self._probe_done, directory, index)
+            self.http_pool.enqueue(probe)
+
+    def _probe_done(self, directory: str, index: int, probe: FuzzResult) -> None:
+        """
+        Called with the result of a probe request
+        """
+        response = None if probe.exception else (probe.code, self.fingerprint(probe))
+        with self.mutex:
+            self.responses[directory][index] = response
+            self.pending[directory] -= 1
+            if self.pending[directory] > 0:
+                return
+            self.baselines[directory] = DirectoryBaseline(self.distance, self.responses.pop(directory))
+            del self.pending[directory]
+            ready = self.waiting.pop(directory, [])
+        for callback in ready:
+            callback()
+
+    def when_ready(self, fuzz_result: FuzzResult, callback: Callable[[], None]) -> None:
+        """
+        Call callback once the baseline of the directory of the result is available. Right away if it already is.
+        The probes have to be started with is_soft_404 before
+        """
+        directory = fuzz_result.seed_url
+        with self.mutex:
+            ready = directory in self.baselines
+            if not ready:
+                self.waiting.setdefault(directory, []).append(callback)
+        if ready:
+            callback()
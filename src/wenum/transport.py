@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from queue import PriorityQueue
+from threading import Event
+from typing import TYPE_CHECKING, Iterator
+
+if TYPE_CHECKING:
+    from .fuzzobjects import FuzzResult
+
+
+class Transport(ABC):
+    """
+    Interface the HttpQueue sends the requests through and receives the results from. The requests are sent by a
+    thread of the transport, which puts the finished results into the result_queue as (priority, result, requeue).
+
+    The thread is stopped by clearing thread_cancelled and calling wakeup. The transport sets the event again once
+    the thread stopped.
+    """
+    # Amount of requests that have been queued in total, without the internal probe requests
+    queued_requests: int
+    result_queue: PriorityQueue
+    thread_cancelled: Event
+
+    @abstractmethod
+    def initialize(self) -> None:
+        """
+        Set up the transport and start the thread sending the requests
+        """
+        pass
+
+    @abstractmethod
+    def enqueue(self, fuzz_result: FuzzResult) -> None:
+        """
+        Queue the request of the result for sending. May block while the transport is busy
+        """
+        pass
+
+    @abstractmethod
+    def wakeup(self) -> None:
+        """
+        Interrupt the thread of the transport if it waits, e.g. because it should stop
+        """
+        pass
+
+    @abstractmethod
+    def iter_results(self) -> Iterator[tuple[FuzzResult, bool]]:
+        """
+        Wait for the next finished result, and yield it with whether it should be queued again
+        """
+        pass
+
+    @abstractmethod
+    def join_threads(self) -> None:
+        """
+        Wait for the stopped thread, and drop the requests and results which are left
+        """
+        pass
+
+    @abstractmethod
+    def job_stats(self) -> dict:
+        """
+        Statistics about the transfers for the runtime summary
+        """
+        pass
@@ -167,6 +167,9 @@ Filtered Requests: {(str(stats.filtered())[:8])}\n"""
         stats = self.fuzzer.stats()
         for key, value in list(stats.items()):
             message += f"{key}: {value}\n"
+        timing_summary = self.stats.timing_summary()
+        if timing_summary:
+            message += f"Transfer phases (mean, p95):\n{timing_summary}"
         message = message.rstrip("\n")
         self.fuzzer.session.console.rule("Debug stats", style="yellow")
         self.fuzzer.session.console.print(message)
@@ -10,7 +10,7 @@ import rich.console
 from wenum import __version__ as version
 
 from tomlkit import document, dumps, comment, TOMLDocument, load
-from tomlkit.items import String, Array, Integer
+from tomlkit.items import String, Array, Integer, Float
 from tomlkit.exceptions import ParseError
 
 from wenum.exception import FuzzExceptBadOptions, FuzzExceptBadFile
@@ -18,10 +18,18 @@ from wenum.exception import FuzzExceptBadOptions, FuzzExceptBadFile
 default_threads = 40
 default_request_timeout = 40
 default_plugin_threads = 3
+default_rate_burst = 1
+default_retries = 3
+default_retry_budget = 20
+default_auto_filter_threshold = 10
+default_auto_filter_expiry = 15
+default_soft_404_distance = 6
 default_method = "GET"
 default_iterator = "product"
 default_output_format = "json"
 valid_format_choices = ["json", "html", "all"]
+default_transport = "curl"
+valid_transport_choices = ["curl", "asyncio"]
 
 
 def flatten_list(list_of_lists: list[list[str]]) -> list[str]:
@@ -46,6 +54,11 @@ class Options:
         # to avoid hard-coding strings for each use case
         self.opt_name_url: str = "url"
 
+        self.url_file: Optional[str] = None
+        self.opt_name_url_file: str = "url-file"
+        # The URLs of all targets. Filled from the URL file, or only contains the URL otherwise
+        self.url_list: list[str] = []
+
         self.wordlist_list: list[str] = []
         self.opt_name_wordlist: str = "wordlist"
 
@@ -76,9 +89,51 @@ class Options:
         self.threads: Optional[int] = None
         self.opt_name_threads: str = "threads"
 
+        self.event_loop: Optional[bool] = None
+        self.opt_name_event_loop: str = "event-loop"
+
+        self.adaptive_threads: Optional[bool] = None
+        self.opt_name_adaptive_threads: str = "adaptive-threads"
+
+        self.rate: Optional[float] = None
+        self.opt_name_rate: str = "rate"
+
+        self.rate_burst: Optional[int] = None
+        self.opt_name_rate_burst: str = "rate-burst"
+
+        self.rate_per_host: Optional[bool] = None
+        self.opt_name_rate_per_host: str = "rate-per-host"
+
+        self.processes: Optional[int] = None
+        self.opt_name_processes: str = "processes"
+
+        self.transport: Optional[str] = None
+        self.opt_name_transport: str = "transport"
+
+        self.retries: Optional[int] = None
+        self.opt_name_retries: str = "retries"
+
+        self.retry_budget: Optional[int] = None
+        self.opt_name_retry_budget: str = "retry-budget"
+
+        self.head_first: Optional[bool] = None
+        self.opt_name_head_first: str = "head-first"
+
+        self.compressed: Optional[bool] = None
+        self.opt_name_compressed: str = "compressed"
+
+        self.circuit_breaker: Optional[bool] = None
+        self.opt_name_circuit_breaker: str = "circuit-breaker"
+
+        self.host_threads: Optional[int] = None
+        self.opt_name_host_threads: str = "host-threads"
+
         self.plugin_threads: Optional[int] = None
         self.opt_name_plugin_threads: str = "plugin-threads"
 
+        self.body_limit: Optional[int] = None
+        self.opt_name_body_limit: str = "body-limit"
+
         self.sleep: Optional[int] = None
         self.opt_name_sleep: str = "sleep"
 
@@ -145,6 +200,18 @@ class Options:
         self.auto_filter: Optional[bool] = None
         self.opt_name_auto_filter: str = "auto-filter"
 
+        self.auto_filter_threshold: Optional[int] = None
+        self.opt_name_auto_filter_threshold: str = "auto-filter-threshold"
+
+        self.auto_filter_expiry: Optional[int] = None
+        self.opt_name_auto_filter_expiry: str = "auto-filter-expiry"
+
+        self.soft_404: Optional[bool] = None
+        self.opt_name_soft_404: str = "soft-404"
+
+        self.soft_404_distance: Optional[int] = None
+        self.opt_name_soft_404_distance: str = "soft-404-distance"
+
         self.dump_config: Optional[str] = None
         self.opt_name_dump_config: str = "dump-config"
 
@@ -327,13 +394,71 @@ class Options:
         if parsed_args.ext:
             self.extensions = flatten_list(parsed_args.ext)
 
+        if parsed_args.event_loop:
+            self.event_loop = parsed_args.event_loop
+
+        if parsed_args.adaptive_threads:
+            self.adaptive_threads = parsed_args.adaptive_threads
+
+        if parsed_args.rate:
+            self.rate = parsed_args.rate
+
+        if parsed_args.rate_burst:
+            self.rate_burst = parsed_args.rate_burst
+
+        if parsed_args.rate_per_host:
+            self.rate_per_host = parsed_args.rate_per_host
+
+        if parsed_args.processes:
+            self.processes = parsed_args.processes
+
+        if parsed_args.body_limit:
+            self.body_limit = parsed_args.body_limit
+
+        if parsed_args.retries is not None:
+            self.retries = parsed_args.retries
+
+        if parsed_args.retry_budget is not None:
+            self.retry_budget = parsed_args.retry_budget
+
+        if parsed_args.head_first:
+            self.head_first = parsed_args.head_first
+
+        if parsed_args.url_file:
+            self.url_file = parsed_args.url_file
+
+        if parsed_args.host_threads:
+            self.host_threads = parsed_args.host_threads
+
+        if parsed_args.compressed:
+            self.compressed = parsed_args.compressed
+
+        if parsed_args.circuit_breaker:
+            self.circuit_breaker = parsed_args.circuit_breaker
+
+        if parsed_args.transport:
+            self.transport = parsed_args.transport
+
+        if parsed_args.auto_filter_threshold is not None:
+            self.auto_filter_threshold = parsed_args.auto_filter_threshold
+
+        if parsed_args.auto_filter_expiry is not None:
+            self.auto_filter_expiry = parsed_args.auto_filter_expiry
+
+        if parsed_args.soft_404:
+            self.soft_404 = parsed_args.soft_404
+
+        if parsed_args.soft_404_distance is not None:
+            self.soft_404_distance = parsed_args.soft_404_distance
+
     def get_all_opts(self) -> list[tuple]:
         """
         Returns all option parameters in a list of tuples,
         whereas tuple[0] is opt_name and tuple[1] is opt_value
         """
         all_opts = [
-            (self.opt_name_url, self.url),
+            # The URL is set to the first entry of the URL file, which should not be exported as well
+            (self.opt_name_url, None if self.url_file else self.url),
             (self.opt_name_wordlist, self.wordlist_list),
             (self.opt_name_colorless, self.colorless),
             (self.opt_name_quiet, self.quiet),
@@ -379,10 +504,52 @@ class Options:
             (self.opt_name_version, self.version),
             (self.opt_name_cache_dir, self.cache_dir),
             (self.opt_name_extensions, self.extensions),
+            (self.opt_name_event_loop, self.event_loop),
+            (self.opt_name_adaptive_threads, self.adaptive_threads),
+            (self.opt_name_rate, self.rate),
+            (self.opt_name_rate_burst, self.rate_burst),
+            (self.opt_name_rate_per_host, self.rate_per_host),
+            (self.opt_name_processes, self.processes),
+            (self.opt_name_body_limit, self.body_limit),
+            (self.opt_name_retries, self.retries),
+            (self.opt_name_retry_budget, self.retry_budget),
+            (self.opt_name_head_first, self.head_first),
+            (self.opt_name_url_file, self.url_file),
+            (self.opt_name_host_threads, self.host_threads),
+            (self.opt_name_compressed, self.compressed),
+            (self.opt_name_circuit_breaker, self.circuit_breaker),
+            (self.opt_name_transport, self.transport),
+            (self.opt_name_auto_filter_threshold, self.auto_filter_threshold),
+            (self.opt_name_auto_filter_expiry, self.auto_filter_expiry),
+            (self.opt_name_soft_404, self.soft_404),
+            (self.opt_name_soft_404_distance, self.soft_404_distance),
                     ]
 
         return all_opts
 
+    @staticmethod
+    def read_url_file(url_file: str) -> list[str]:
+        """
+        Read the target URLs from the file. Empty lines and lines starting with # are skipped
+        """
+        try:
+            with open(url_file, "r") as file:
+                lines = file.read().splitlines()
+        except OSError:
+            raise FuzzExceptBadFile(f"URL file {url_file} can not be opened. Please ensure it "
+                                    f"exists and the permissions are correct.")
+        url_list = []
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if "FUZZ" not in line:
+                line = line.rstrip("/") + "/FUZZ"
+            url_list.append(line)
+        if not url_list:
+            raise FuzzExceptBadOptions(f"URL file {url_file} does not contain any URLs.")
+        return url_list
+
     def export_config(self):
         """
         Exports the activated configuration (through CLI + optional config file) into a TOML file.
@@ -557,6 +724,63 @@ class Options:
         if self.opt_name_extensions in toml_dict:
             self.extensions += self.pop_toml_list_str(toml_dict, self.opt_name_extensions)
 
+        if self.opt_name_event_loop in toml_dict:
+            self.event_loop = self.pop_toml_bool(toml_dict, self.opt_name_event_loop)
+
+        if self.opt_name_adaptive_threads in toml_dict:
+            self.adaptive_threads = self.pop_toml_bool(toml_dict, self.opt_name_adaptive_threads)
+
+        if self.opt_name_rate in toml_dict:
+            self.rate = self.pop_toml_float(toml_dict, self.opt_name_rate)
+
+        if self.opt_name_rate_burst in toml_dict:
+            self.rate_burst = self.pop_toml_int(toml_dict, self.opt_name_rate_burst)
+
+        if self.opt_name_rate_per_host in toml_dict:
+            self.rate_per_host = self.pop_toml_bool(toml_dict, self.opt_name_rate_per_host)
+
+        if self.opt_name_processes in toml_dict:
+            self.processes = self.pop_toml_int(toml_dict, self.opt_name_processes)
+
+        if self.opt_name_body_limit in toml_dict:
+            self.body_limit = self.pop_toml_int(toml_dict, self.opt_name_body_limit)
+
+        if self.opt_name_retries in toml_dict:
+            self.retries = self.pop_toml_int(toml_dict, self.opt_name_retries)
+
+        if self.opt_name_retry_budget in toml_dict:
+            self.retry_budget = self.pop_toml_int(toml_dict, self.opt_name_retry_budget)
+
+        if self.opt_name_head_first in toml_dict:
+            self.head_first = self.pop_toml_bool(toml_dict, self.opt_name_head_first)
+
+        if self.opt_name_url_file in toml_dict:
+            self.url_file = self.pop_toml_string(toml_dict, self.opt_name_url_file)
+
+        if self.opt_name_host_threads in toml_dict:
+            self.host_threads = self.pop_toml_int(toml_dict, self.opt_name_host_threads)
+
+        if self.opt_name_compressed in toml_dict:
+            self.compressed = self.pop_toml_bool(toml_dict, self.opt_name_compressed)
+
+        if self.opt_name_circuit_breaker in toml_dict:
+            self.circuit_breaker = self.pop_toml_bool(toml_dict, self.opt_name_circuit_breaker)
+
+        if self.opt_name_transport in toml_dict:
+            self.transport = self.pop_toml_string(toml_dict, self.opt_name_transport)
+
+        if self.opt_name_auto_filter_threshold in toml_dict:
+            self.auto_filter_threshold = self.pop_toml_int(toml_dict, self.opt_name_auto_filter_threshold)
+
+        if self.opt_name_auto_filter_expiry in toml_dict:
+            self.auto_filter_expiry = self.pop_toml_int(toml_dict, self.opt_name_auto_filter_expiry)
+
+        if self.opt_name_soft_404 in toml_dict:
+            self.soft_404 = self.pop_toml_bool(toml_dict, self.opt_name_soft_404)
+
+        if self.opt_name_soft_404_distance in toml_dict:
+            self.soft_404_distance = self.pop_toml_int(toml_dict, self.opt_name_soft_404_distance)
+
         # If any keys are left
         if toml_dict:
             unknown_keys = []
@@ -629,6 +853,17 @@ class Options:
         integer = integer.unwrap()
         return integer
 
+    @staticmethod
+    def pop_toml_float(toml_dict: TOMLDocument, toml_key: str) -> float:
+        """
+        Throws an exception if the type of the toml key is not a number. Pops value from dict if it is.
+        """
+        number = toml_dict.pop(toml_key)
+        if type(number) not in (Float, Integer):
+            raise FuzzExceptBadOptions(f"\"{toml_key}\" option's value in the config file is not a number")
+        number = float(number.unwrap())
+        return number
+
     def basic_validate(self) -> None:
         """
         Check initially set opts.
@@ -645,6 +880,24 @@ class Options:
         if not self.plugin_threads:
             self.plugin_threads = default_plugin_threads
 
+        if not self.rate_burst:
+            self.rate_burst = default_rate_burst
+
+        if self.retries is None:
+            self.retries = default_retries
+
+        if self.retry_budget is None:
+            self.retry_budget = default_retry_budget
+
+        if self.auto_filter_threshold is None:
+            self.auto_filter_threshold = default_auto_filter_threshold
+
+        if self.auto_filter_expiry is None:
+            self.auto_filter_expiry = default_auto_filter_expiry
+
+        if self.soft_404_distance is None:
+            self.soft_404_distance = default_soft_404_distance
+
         if not self.method:
             self.method = default_method
 
@@ -663,9 +916,24 @@ class Options:
         else:
             self.output_format = default_output_format
 
+        if self.transport:
+            if self.transport not in valid_transport_choices:
+                raise FuzzExceptBadOptions(f"Transport does not exist")
+        else:
+            self.transport = default_transport
+
+        if self.url_file and not self.url_list:
+            if self.url:
+                raise FuzzExceptBadOptions(f"Specify either --{self.opt_name_url} or --{self.opt_name_url_file}")
+            self.url_list = self.read_url_file(self.url_file)
+            self.url = self.url_list[0]
+
         if self.url is None:
             raise FuzzExceptBadOptions(f"Specify the URL with --{self.opt_name_url}")
 
+        if not self.url_list:
+            self.url_list = [self.url]
+
         if not self.wordlist_list:
             raise FuzzExceptBadOptions("Bad usage: You must specify a wordlist.")
 
@@ -696,6 +964,47 @@ class Options:
         if self.threads < 0:
             raise FuzzExceptBadOptions("Threads can not be a negative number.")
 
+        if self.rate is not None and self.rate <= 0:
+            raise FuzzExceptBadOptions("The rate has to be a positive number.")
+
+        if self.rate_burst is not None and self.rate_burst < 1:
+            raise FuzzExceptBadOptions("The rate burst has to be at least 1.")
+
+        if self.processes is not None and self.processes < 1:
+            raise FuzzExceptBadOptions("The amount of processes has to be at least 1.")
+
+        if self.transport == "asyncio":
+            if self.processes or self.event_loop:
+                raise FuzzExceptBadOptions(f"--{self.opt_name_processes} and --{self.opt_name_event_loop} only apply "
+                                           f"to the curl transport.")
+            if any(urlparse(proxy).scheme.lower() != "http" for proxy in self.proxy_list):
+                raise FuzzExceptBadOptions("The asyncio transport only supports HTTP proxies.")
+
+        if self.retries < 0:
+            raise FuzzExceptBadOptions("The amount of retries can not be negative.")
+
+        if self.retry_budget < 0:
+            raise FuzzExceptBadOptions("The retry budget can not be negative.")
+
+        if self.auto_filter_threshold < 1:
+            raise FuzzExceptBadOptions("The auto filter threshold has to be at least 1.")
+
+        if self.auto_filter_expiry < 1:
+            raise FuzzExceptBadOptions("The auto filter has to count at least 1 response per directory.")
+
+        if not 0 <= self.soft_404_distance <= 64:
+            raise FuzzExceptBadOptions("The soft-404 distance has to be between 0 and 64 bits.")
+
+        if self.head_first and not (self.hc_list or self.sc_list):
+            raise FuzzExceptBadOptions(f"--{self.opt_name_head_first} requires a status code filter, e.g. "
+                                       f"--{self.opt_name_hc} 404.")
+
+        if self.host_threads is not None and self.host_threads < 1:
+            raise FuzzExceptBadOptions("The amount of connections per host has to be at least 1.")
+
+        if self.body_limit is not None and self.body_limit < 1:
+            raise FuzzExceptBadOptions("The body limit has to be at least 1 KB.")
+
         for header in self.header_list:
             split_header = header.split(":", maxsplit=1)
             if len(split_header) != 2:
@@ -755,6 +1064,10 @@ class Options:
         if not self.url:
             raise FuzzExceptBadOptions("A target URL needs to be specified.")
 
+        if self.soft_404 and self.dry_run:
+            raise FuzzExceptBadOptions(f"--{self.opt_name_soft_404} needs the responses, and can not be used "
+                                       f"with --{self.opt_name_dry_run}.")
+
         if self.plugins_list and self.dry_run:
             raise FuzzExceptBadOptions(
                 "Bad usage: Plugins cannot work without making any HTTP request."
@@ -778,7 +1091,7 @@ class Options:
         """Convenience function to enable one-liners when building the TOML config."""
         if value:
             # For some reason, the sleep parameter would get converted to a float by default
-            if isinstance(value, float):
+            if isinstance(value, float) and key == self.opt_name_sleep:
                 value = int(value)
             # Do not store these parameters in the config file, as they would lead to confusing behavior
             if key == self.opt_name_dump_config or key == self.opt_name_config:
@@ -869,6 +1182,80 @@ class Options:
         request_building_group.add_argument("-e", f"--{self.opt_name_extensions}", action="append",
                                             help="Specify extensions to be appended to the wordlist items e.g. \".aspx,.asmx\"", nargs="*")
 
+        request_building_group.add_argument(f"--{self.opt_name_event_loop}", action="store_true",
+                                            help="Wait for socket events instead of continuously polling the "
+                                                 "connections. Lowers the CPU usage while waiting on slow targets.")
+
+        request_building_group.add_argument(f"--{self.opt_name_adaptive_threads}", action="store_true",
+                                            help="Adapt the number of concurrent connections to the target's "
+                                                 "responsiveness. Backs off on rising latency, timeouts and 429/503 "
+                                                 "responses. The threads option becomes the upper limit.")
+
+        request_building_group.add_argument(f"--{self.opt_name_rate}", type=float,
+                                            help="Limit the amount of requests sent per second, e.g. 0.5 or 20. "
+                                                 "Requests are held back before being sent, without stalling the "
+                                                 "other processing.")
+
+        request_building_group.add_argument(f"--{self.opt_name_rate_burst}", type=int,
+                                            help=f"Amount of requests that may be sent at once before "
+                                                 f"--{self.opt_name_rate} takes effect. (default: {default_rate_burst})")
+
+        request_building_group.add_argument(f"--{self.opt_name_rate_per_host}", action="store_true",
+                                            help=f"Apply --{self.opt_name_rate} to each host separately instead of "
+                                                 f"to all requests.")
+
+        request_building_group.add_argument(f"--{self.opt_name_processes}", type=int,
+                                            help="Send the requests and parse the responses in the supplied number "
+                                                 "of worker processes instead of the main process. Allows to make "
+                                                 "use of several CPU cores. The concurrent connections are split "
+                                                 "between the workers.")
+
+        request_building_group.add_argument(f"--{self.opt_name_retries}", type=int,
+                                            help=f"Amount of times a request is retried after a recoverable "
+                                                 f"connection error. Retries are delayed with an exponential "
+                                                 f"backoff. (default: {default_retries})")
+
+        request_building_group.add_argument(f"--{self.opt_name_retry_budget}", type=int,
+                                            help=f"Limit the retries of the whole run to the supplied percentage of "
+                                                 f"the sent requests, which stops retry storms against a failing "
+                                                 f"target. (default: {default_retry_budget})")
+
+        request_building_group.add_argument(f"--{self.opt_name_head_first}", action="store_true",
+                                            help=f"Send the wordlist requests as HEAD first, and only repeat them as "
+                                                 f"GET if the status code is not hidden by the filter options (e.g. "
+                                                 f"--{self.opt_name_hc} 404). Saves downloading the bodies of "
+                                                 f"uninteresting responses. With a size filter, every request is "
+                                                 f"repeated as GET. Responses filtered this way are not processed "
+                                                 f"by plugins or recursion.")
+
+        request_building_group.add_argument(f"--{self.opt_name_url_file}",
+                                            help=f"Read the URLs of several targets from the supplied file, one per "
+                                                 f"line, and scan them in one run. /FUZZ is appended to URLs without "
+                                                 f"a FUZZ keyword. The requests alternate between the targets. Can "
+                                                 f"not be combined with --{self.opt_name_url}.")
+
+        request_building_group.add_argument(f"--{self.opt_name_host_threads}", type=int,
+                                            help="Limit the amount of concurrent connections to each host. Keeps one "
+                                                 "slow target from occupying all connections when scanning several "
+                                                 "targets.")
+
+        request_building_group.add_argument(f"--{self.opt_name_compressed}", action="store_true",
+                                            help="Request compressed responses (gzip, deflate, br, as far as libcurl "
+                                                 "supports them) and let libcurl decompress them while they arrive. "
+                                                 "Saves bandwidth on text heavy targets.")
+
+        request_building_group.add_argument(f"--{self.opt_name_circuit_breaker}", action="store_true",
+                                            help="Pause the requests to a host that answers with bursts of 429/503 "
+                                                 "responses or connection errors, or asks to wait with a Retry-After "
+                                                 "header. After the pause, a single probe request is sent, and the "
+                                                 "requests resume gradually. Throttled requests are retried.")
+
+        request_building_group.add_argument(f"--{self.opt_name_transport}", choices=valid_transport_choices,
+                                            help=f"Library sending the requests. asyncio keeps the connections alive "
+                                                 f"per host without a curl handle for each, which scales to large "
+                                                 f"amounts of --{self.opt_name_threads}. It only supports HTTP "
+                                                 f"proxies. (default: {default_transport})")
+
         filter_group = parser.add_argument_group("Filter options")
         filter_group.add_argument(f"--{self.opt_name_hc}", action="append",
                                   help=f"Hide responses matching the supplied codes "
@@ -903,7 +1290,30 @@ class Options:
                                        "processing of them (e.g. sending to plugins).")
         filter_group.add_argument(f"--{self.opt_name_auto_filter}", action="store_true",
                                   help="Filter automatically during runtime. "
-                                       "If a response occurs too often, it will get filtered out.")
+                                       "If a response occurs too often within a directory, "
+                                       "it will get filtered out there.")
+
+        filter_group.add_argument(f"--{self.opt_name_auto_filter_threshold}", type=int,
+                                  help=f"Amount of times a response has to occur within a directory before "
+                                       f"--{self.opt_name_auto_filter} hides it there. "
+                                       f"(default: {default_auto_filter_threshold})")
+
+        filter_group.add_argument(f"--{self.opt_name_auto_filter_expiry}", type=int,
+                                  help=f"Amount of different responses --{self.opt_name_auto_filter} counts per "
+                                       f"directory. If more occur, the least recently seen one is forgotten. "
+                                       f"(default: {default_auto_filter_expiry})")
+
+        filter_group.add_argument(f"--{self.opt_name_soft_404}", action="store_true",
+                                  help="Hide soft-404s, pages served for non-existing paths with another status code "
+                                       "than 404. Random paths are requested in each directory to learn how they "
+                                       "look, and similar responses are hidden even if they differ slightly, e.g. "
+                                       "because they echo the path.")
+
+        filter_group.add_argument(f"--{self.opt_name_soft_404_distance}", type=int,
+                                  help=f"Amount of bits the 64-bit fingerprint of a body may differ from a "
+                                       f"soft-404 of its directory to be hidden by --{self.opt_name_soft_404}, in "
+                                       f"addition to how much the soft-404s differ from each other. "
+                                       f"(default: {default_soft_404_distance})")
 
         response_proessing_group.add_argument("-L", f"--{self.opt_name_location}", action="store_true",
                                               help="Follow redirections by sending "
@@ -928,6 +1338,12 @@ class Options:
                                               help="Modify the amount of threads used for concurrent "
                                               f"execution of plugins. (default: {default_plugin_threads})")
 
+        response_proessing_group.add_argument(f"--{self.opt_name_body_limit}", type=int,
+                                              help="Only keep the first supplied KB of each response body for "
+                                                   "filters, plugins and the output. The size metrics (chars, lines, "
+                                                   "words, md5) still cover the whole body. Does not apply to "
+                                                   "compressed bodies.")
+
         # parser.add_argument("--list-plugins", help="List all plugins and categories")#TODO implement, though maybe this falls off with the info option
         # parser.add_argument("--plugin-args", help="Provide arguments to scripts. e.g. --plugin-args grep.regex=\"<A href=\\\"(.*?)\\\">\"", nargs="*")#TODO Maybe remove? Really no plugin utilizes this except for regex.py, and I dont know if they ever will
 
@@ -0,0 +1,57 @@
+import unittest
+from unittest.mock import MagicMock
+
+from wenum.autofilter import Autofilter
+
+
+def make_result(url: str, code: int = 200, lines: int = 5, words: int = 10, seed_url: str = ""):
+    fuzz_result = MagicMock()
+    fuzz_result.history.url = url
+    fuzz_result.seed_url = seed_url
+    fuzz_result.code = code
+    fuzz_result.lines = lines
+    fuzz_result.words = words
+    return fuzz_result
+
+
+class AutofilterTest(unittest.TestCase):
+    def setUp(self):
+        self.autofilter = Autofilter(threshold=3, expiry=2)
+
+    def feed(self, fuzz_result, times: int) -> list:
+        return [self.autofilter.observe(fuzz_result) for _ in range(times)]
+
+    def test_threshold(self):
+        fuzz_result = make_result("http://example.com/a/x")
+        self.assertEqual(self.feed(fuzz_result, 3), [None, None, (200, 5, 10)])
+        self.assertTrue(self.autofilter.is_filtered(fuzz_result))
+        self.assertFalse(self.autofilter.is_filtered(make_result("http://example.com/a/y", words=11)))
+
+    def test_per_directory(self):
+        self.feed(make_result("http://example.com/a/x"), 3)
+        self.assertTrue(self.autofilter.is_filtered(make_result("http://example.com/a/y?q=1")))
+        self.assertFalse(self.autofilter.is_filtered(make_result("http://example.com/b/x")))
+        self.assertFalse(self.autofilter.is_filtered(make_result("http://example.com/a/b/x")))
+
+    def test_seed(self):
+        self.feed(make_result("http://example.com/x.php", seed_url="http://example.com/FUZZ.php"), 3)
+        self.assertTrue(self.autofilter.is_filtered(make_result("http://example.com/y.php",
+                                                                seed_url="http://example.com/FUZZ.php")))
+        self.assertFalse(self.autofilter.is_filtered(make_result("http://example.com/y.html",
+                                                                 seed_url="http://example.com/FUZZ.html")))
+
+    def test_expiry(self):
+        first = make_result("http://example.com/a/x", words=1)
+        self.feed(first, 2)
+        # Two other signatures push out the first one before it reaches the threshold
+        self.feed(make_result("http://example.com/a/x", words=2), 1)
+        self.feed(make_result("http://example.com/a/x", words=3), 1)
+        self.assertEqual(self.feed(first, 2), [None, None])
+
+        # The first signature was seen more recently than the third one, which is pushed out instead
+        self.feed(make_result("http://example.com/a/x", words=4), 1)
+        self.assertEqual(self.feed(first, 1), [(200, 5, 1)])
+
+
+if __name__ == '__main__':
+    unittest.main()
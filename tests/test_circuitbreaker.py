@@ -0,0 +1,78 @@
+import datetime
+import unittest
+from wenum.helpers.circuitbreaker import CircuitBreaker, parse_retry_after
+
+HOST = "example.com"
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.breaker = CircuitBreaker(max_parallel=4, window=10, min_failures=3, open_time=5,
+                                      clock=lambda: self.now)
+
+    def send(self, failed: bool, retry_after: float = None):
+        self.assertTrue(self.breaker.allows(HOST))
+        self.breaker.started(HOST)
+        self.breaker.record(HOST, failed, retry_after)
+
+    def test_opens_on_failures(self):
+        self.send(True)
+        self.send(False)
+        self.send(True)
+        self.assertTrue(self.breaker.allows(HOST))
+        self.send(True)
+        self.assertFalse(self.breaker.allows(HOST))
+        self.assertEqual(self.breaker.delay(), 5)
+        self.assertEqual(self.breaker.paused(), 1)
+
+    def test_retry_after(self):
+        self.send(True, retry_after=30)
+        self.assertFalse(self.breaker.allows(HOST))
+        self.now = 29
+        self.assertFalse(self.breaker.allows(HOST))
+        self.now = 30
+        self.assertTrue(self.breaker.allows(HOST))
+
+    def test_probe_and_recovery(self):
+        self.send(True, retry_after=1)
+        self.now = 1
+        # Only a single probe request while half-open
+        self.assertTrue(self.breaker.allows(HOST))
+        self.breaker.started(HOST)
+        self.assertFalse(self.breaker.allows(HOST))
+        self.breaker.record(HOST, False)
+
+        # Two requests at once after the probe, then four, which closes the circuit
+        for _ in range(2):
+            self.assertTrue(self.breaker.allows(HOST))
+            self.breaker.started(HOST)
+        self.assertFalse(self.breaker.allows(HOST))
+        self.breaker.record(HOST, False)
+        self.breaker.record(HOST, False)
+        self.assertEqual(self.breaker.paused(), 0)
+
+    def test_failed_probe_doubles_open_time(self):
+        for _ in range(3):
+            self.send(True)
+        self.now = 5
+        self.send(True)
+        self.assertEqual(self.breaker.delay(), 10)
+
+    def test_other_hosts(self):
+        self.send(True, retry_after=10)
+        self.assertTrue(self.breaker.allows("other.example.com"))
+
+
+class RetryAfterTest(unittest.TestCase):
+    def test_parse(self):
+        self.assertEqual(parse_retry_after("120"), 120)
+        now = datetime.datetime(2015, 10, 21, 7, 27, 0, tzinfo=datetime.timezone.utc)
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT", now), 60)
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:26:00 GMT", now), 0)
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertIsNone(parse_retry_after(None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+from unittest import mock
+
+from wenum.exception import FuzzExceptIncorrectFilter
+from wenum.externals.reqresp import Response
+from wenum.filters.complexfilter import FuzzResFilter
+from wenum.fuzzobjects import FuzzResult, FPayloadManager, FuzzWord, FuzzWordType
+from wenum.fuzzrequest import FuzzRequest
+
+
+def make_result(word: str, code: int = 200, body: str = "lorem ipsum dolor\nsit amet\n") -> FuzzResult:
+    fuzz_request = FuzzRequest()
+    fuzz_request.url = f"http://example.com/{word}"
+    response = Response()
+    response.parse_curl_response(f"HTTP/1.1 {code} OK\r\nServer: test\r\n\r\n", body.encode())
+    fuzz_request._request.response = response
+    fuzz_result = FuzzResult(history=fuzz_request)
+    fuzz_result.payload_man = FPayloadManager()
+    fuzz_result.payload_man.add({"full_marker": "FUZZ", "word": "FUZZ", "index": None, "field": None},
+                                FuzzWord(word, FuzzWordType.WORD))
+    return fuzz_result
+
+
+class FuzzResFilterTest(unittest.TestCase):
+    def assertShown(self, filter_string: str, fuzz_result: FuzzResult):
+        self.assertFalse(FuzzResFilter(filter_string).is_filtered(fuzz_result))
+
+    def assertHidden(self, filter_string: str, fuzz_result: FuzzResult):
+        self.assertTrue(FuzzResFilter(filter_string).is_filtered(fuzz_result))
+
+    def test_operators(self):
+        fuzz_result = make_result("admin", code=403)
+        self.assertShown("code=403", fuzz_result)
+        self.assertShown("c!=404 and w>3 and l<=2 and h>=0", fuzz_result)
+        self.assertHidden("c<403 or chars<5", fuzz_result)
+        self.assertShown("content=~'^sit'", fuzz_result)
+        self.assertShown("url~'ADM' and content!~'foo'", fuzz_result)
+        self.assertShown("r.headers.response~'test'", fuzz_result)
+        self.assertShown("c=XXX or c=403", fuzz_result)
+
+    def test_not_and_nesting(self):
+        fuzz_result = make_result("admin", code=404)
+        self.assertHidden("not c=404", fuzz_result)
+        self.assertShown("not (c=200 or c=301) and w>1", fuzz_result)
+        self.assertHidden("(c=200 or c=301) and (w>1 or l>1)", fuzz_result)
+        self.assertShown("not (not c=404)", fuzz_result)
+
+    def test_payload(self):
+        fuzz_result = make_result("admin")
+        self.assertShown("FUZZ='admin'", fuzz_result)
+        self.assertShown("FUZZ|upper()='ADMIN' and FUZZ|r('dm','DM')='aDMin'", fuzz_result)
+        self.assertShown("FUZZ|sw('ad')", fuzz_result)
+        with self.assertRaises(FuzzExceptIncorrectFilter):
+            FuzzResFilter("FUZ2Z='admin'").is_filtered(fuzz_result)
+
+    def test_payload_field(self):
+        fuzz_result = make_result("admin")
+        fuzz_result.payload_man = FPayloadManager()
+        fuzz_result.payload_man.add({"full_marker": "FUZZ[url]", "word": "FUZZ", "index": None, "field": "url"},
+                                    FuzzWord(make_result("login"), FuzzWordType.FUZZRES))
+        self.assertShown("FUZZ[url]~'login' and FUZZ[c]=200", fuzz_result)
+
+    def test_unique(self):
+        ffilter = FuzzResFilter("content|u()")
+        self.assertFalse(ffilter.is_filtered(make_result("a")))
+        self.assertTrue(ffilter.is_filtered(make_result("b")))
+        self.assertFalse(ffilter.is_filtered(make_result("c", body="other")))
+
+    def test_assignment(self):
+        fuzz_result = make_result("admin")
+        FuzzResFilter("r.url=+'?debug=1'").is_filtered(fuzz_result)
+        self.assertEqual(fuzz_result.history.url, "http://example.com/admin?debug=1")
+
+        # Every part of the expression is evaluated, even if the outcome is already known
+        FuzzResFilter("c=404 and r.method:='HEAD'").is_filtered(fuzz_result)
+        self.assertEqual(fuzz_result.history.method, "HEAD")
+
+    def test_compiled_once(self):
+        ffilter = FuzzResFilter("c=200 and FUZZ|u()")
+        with mock.patch.object(ffilter.finalformula, "parseString") as parse_string:
+            for word in ("a", "b", "a"):
+                ffilter.is_filtered(make_result(word))
+            parse_string.assert_not_called()
+
+        # Changing the filter string compiles the new one
+        ffilter.filter_string = "c=404"
+        self.assertTrue(ffilter.is_filtered(make_result("d")))
+
+    def test_incorrect_filter(self):
+        with self.assertRaises(FuzzExceptIncorrectFilter):
+            FuzzResFilter("c=200 and")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+from wenum.helpers.concurrency import AIMDController
+
+
+def feed_window(controller: AIMDController, latency: float = 0.1, timeouts: int = 0, throttled: int = 0) -> None:
+    """
+    Fill one window with responses of the latency, a few of them replaced by timeouts and 429 responses
+    """
+    for _ in range(timeouts):
+        controller.record_error(28)
+    for _ in range(throttled):
+        controller.record_response(latency, 429)
+    for _ in range(controller.window - timeouts - throttled):
+        controller.record_response(latency, 200)
+
+
+class AIMDControllerTest(unittest.TestCase):
+    def test_increase(self):
+        controller = AIMDController(max_limit=10, initial_limit=8, window=20)
+        feed_window(controller)
+        self.assertEqual(controller.limit, 9)
+        for _ in range(3):
+            feed_window(controller)
+        self.assertEqual(controller.limit, 10)
+
+    def test_incomplete_window(self):
+        controller = AIMDController(max_limit=10, initial_limit=8, window=20)
+        for _ in range(19):
+            controller.record_error(28)
+        self.assertEqual(controller.limit, 8)
+
+    def test_timeouts(self):
+        controller = AIMDController(max_limit=20, initial_limit=16, window=20, error_ratio=0.05)
+        # A single timeout in the window is tolerated
+        feed_window(controller, timeouts=1)
+        self.assertEqual(controller.limit, 17)
+        feed_window(controller, timeouts=2)
+        self.assertEqual(controller.limit, 8)
+
+        # Other transfer errors do not count as timeouts
+        for _ in range(controller.window):
+            controller.record_error(7)
+        self.assertEqual(controller.limit, 9)
+
+    def test_throttled(self):
+        controller = AIMDController(max_limit=20, initial_limit=16, window=20, error_ratio=0.05)
+        feed_window(controller, throttled=2)
+        self.assertEqual(controller.limit, 8)
+
+        for _ in range(2):
+            controller.record_response(0.1, 503)
+        for _ in range(controller.window - 2):
+            controller.record_response(0.1, 404)
+        self.assertEqual(controller.limit, 4)
+
+    def test_latency(self):
+        controller = AIMDController(max_limit=20, initial_limit=16, window=20, latency_factor=2.0)
+        feed_window(controller, latency=0.1)
+        self.assertEqual((controller.limit, controller.baseline_p95), (17, 0.1))
+        feed_window(controller, latency=0.2)
+        self.assertEqual(controller.limit, 18)
+        feed_window(controller, latency=0.25)
+        self.assertEqual(controller.limit, 9)
+
+        # The baseline only follows faster windows
+        feed_window(controller, latency=0.05)
+        self.assertEqual((controller.limit, controller.baseline_p95), (10, 0.05))
+
+    def test_baseline_reset(self):
+        controller = AIMDController(max_limit=20, min_limit=2, initial_limit=4, window=20, latency_factor=2.0)
+        feed_window(controller, latency=0.1)
+        feed_window(controller, latency=1.0)
+        self.assertEqual(controller.limit, 2)
+
+        # The target stays slow at the lowest limit, so the slower latency becomes the baseline
+        feed_window(controller, latency=1.0)
+        self.assertEqual((controller.limit, controller.baseline_p95), (3, 1.0))
+
+        # Not if there are timeouts, which suggest the target is overloaded after all
+        controller = AIMDController(max_limit=2, min_limit=2, window=20)
+        feed_window(controller, latency=0.1)
+        feed_window(controller, latency=1.0, timeouts=5)
+        self.assertEqual((controller.limit, controller.baseline_p95), (2, 0.1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+from wenum.helpers.dns_cache import DNSCache
+
+
+class FakeResolver:
+    def __init__(self, addresses: dict):
+        self.addresses = addresses
+        self.calls = []
+
+    def __call__(self, hostname: str):
+        self.calls.append(hostname)
+        return self.addresses.get(hostname)
+
+
+class DNSCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.resolver = FakeResolver({"example.com": "93.184.215.14"})
+        self.cache = DNSCache(ttl=300, negative_ttl=60, resolver=self.resolver, clock=lambda: self.now)
+
+    def test_ttl(self):
+        for _ in range(3):
+            self.assertEqual(self.cache.resolve("example.com"), "93.184.215.14")
+        self.assertEqual(self.resolver.calls, ["example.com"])
+
+        self.now += 301
+        self.assertEqual(self.cache.resolve("EXAMPLE.com"), "93.184.215.14")
+        self.assertEqual(len(self.resolver.calls), 2)
+
+    def test_negative_caching(self):
+        self.assertIsNone(self.cache.resolve("nxdomain.example"))
+        self.now += 59
+        self.assertIsNone(self.cache.resolve("nxdomain.example"))
+        self.assertEqual(len(self.resolver.calls), 1)
+
+        self.now += 2
+        self.resolver.addresses["nxdomain.example"] = "10.0.0.1"
+        self.assertEqual(self.cache.resolve("nxdomain.example"), "10.0.0.1")
+        self.assertEqual(len(self.resolver.calls), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+from unittest.mock import MagicMock
+
+from wenum.externals.reqresp import Response
+from wenum.falsepositive import FalsePositiveProbes
+from wenum.fuzzrequest import FuzzRequest
+
+
+class FakeHttpPool:
+    def __init__(self):
+        self.enqueued = []
+
+    def enqueue(self, fuzz_result):
+        self.enqueued.append(fuzz_result)
+
+
+def make_seed(url: str, code: int = 200, words: int = 10):
+    seed = MagicMock()
+    seed.history = FuzzRequest()
+    seed.history.url = url
+    seed.history._request.response = Response()
+    seed.code = code
+    seed.words = words
+    return seed
+
+
+def make_probe(code: int, words: int):
+    probe = MagicMock()
+    probe.exception = None
+    probe.code = code
+    probe.words = words
+    return probe
+
+
+class CompareTest(unittest.TestCase):
+    def test_identical_junk_response(self):
+        self.assertTrue(FalsePositiveProbes.compare(200, 10, [(200, 10), (200, 10)]))
+
+    def test_different_code(self):
+        self.assertFalse(FalsePositiveProbes.compare(200, 10, [(404, 10), (404, 10)]))
+
+    def test_dynamic_content(self):
+        # Both junk responses differ from each other, so the directory answers anything with dynamic content
+        self.assertTrue(FalsePositiveProbes.compare(200, 10, [(200, 12), (200, 14)]))
+        self.assertFalse(FalsePositiveProbes.compare(200, 10, [(200, 12), (200, 12)]))
+
+    def test_failed_probes(self):
+        self.assertFalse(FalsePositiveProbes.compare(200, 10, [None, None]))
+        self.assertFalse(FalsePositiveProbes.compare(200, 10, [(200, 12), None]))
+
+
+class ProbesTest(unittest.TestCase):
+    def setUp(self):
+        self.http_pool = FakeHttpPool()
+        self.probes = FalsePositiveProbes(self.http_pool)
+
+    def answer(self, code: int, words: int):
+        for probe in self.http_pool.enqueued:
+            probe.probe_callback(make_probe(code, words))
+        self.http_pool.enqueued = []
+
+    def test_probes_sent_once(self):
+        seed = make_seed("http://example.com/a/FUZZ")
+        self.assertIsNone(self.probes.is_false_positive(seed))
+        self.assertIsNone(self.probes.is_false_positive(seed))
+        self.assertEqual(len(self.http_pool.enqueued), 2)
+        self.assertEqual({probe.history.url for probe in self.http_pool.enqueued},
+                         {"http://example.com/a/thisdoesnotexist123", "http://example.com/a/thisalsodoesnotexist123"})
+        # Only the request is copied, without the response of the seed
+        self.assertTrue(all(probe.history._request.response is None for probe in self.http_pool.enqueued))
+        self.assertEqual(seed.history.url, "http://example.com/a/FUZZ")
+        self.assertIsNotNone(seed.history._request.response)
+
+        self.answer(200, 10)
+        self.assertTrue(self.probes.is_false_positive(seed))
+        self.assertEqual(len(self.http_pool.enqueued), 0)
+
+    def test_when_ready(self):
+        first_seed = make_seed("http://example.com/a/FUZZ")
+        second_seed = make_seed("http://example.com/b/FUZZ")
+        self.probes.is_false_positive(first_seed)
+        calls = []
+        self.probes.when_ready([first_seed, second_seed], lambda: calls.append(True))
+
+        self.probes.is_false_positive(second_seed)
+        self.answer(404, 5)
+        self.assertEqual(calls, [True])
+
+        self.probes.when_ready([first_seed], lambda: calls.append(True))
+        self.assertEqual(len(calls), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
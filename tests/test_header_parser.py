@@ -0,0 +1,54 @@
+import unittest
+from wenum.externals.reqresp import Response
+from wenum.externals.reqresp.HeaderParser import HeaderMultiDict, parse_header_block
+
+
+class HeaderParserTest(unittest.TestCase):
+    def test_single_block(self):
+        protocol, code, message, headers = parse_header_block(
+            "HTTP/1.1 404 Not Found\r\nServer: nginx\r\nSet-Cookie: a=1\r\nset-cookie: b=2\r\n\r\n")
+        self.assertEqual((protocol, code, message), ("HTTP/1.1", 404, "Not Found"))
+        self.assertEqual(headers["server"], "nginx")
+        self.assertEqual(headers.getall("SET-COOKIE"), ["a=1", "b=2"])
+        self.assertEqual(headers.items(), [("Server", "nginx"), ("Set-Cookie", "a=1"), ("set-cookie", "b=2")])
+
+    def test_multiple_status_blocks(self):
+        protocol, code, message, headers = parse_header_block(
+            "HTTP/1.1 200 Connection established\r\n\r\n"
+            "HTTP/1.1 100 Continue\r\n\r\n"
+            "HTTP/2 302 \r\nLocation: /login\r\n\r\n")
+        self.assertEqual((protocol, code, message), ("HTTP/2", 302, ""))
+        self.assertEqual(headers.items(), [("Location", "/login")])
+
+    def test_folded_headers(self):
+        protocol, code, message, headers = parse_header_block(
+            "HTTP/1.0 200 OK\r\nX-Long: first\r\n  second\r\n\tthird\r\nServer: test\r\n\r\n")
+        self.assertEqual(headers["X-Long"], "first second third")
+        self.assertEqual(headers["Server"], "test")
+
+    def test_no_status_line(self):
+        protocol, code, message, headers = parse_header_block("")
+        self.assertEqual((protocol, code), ("unknown", 0))
+        self.assertEqual(len(headers), 0)
+
+    def test_multidict(self):
+        headers = HeaderMultiDict([("Content-Type", "text/html")])
+        self.assertIn("content-type", headers)
+        self.assertNotIn("Server", headers)
+        self.assertIsNone(headers.get("Server"))
+        with self.assertRaises(KeyError):
+            headers["Server"]
+
+    def test_matches_text_parser(self):
+        raw_header = "HTTP/1.1 100 Continue\r\n\r\nHTTP/1.1 200 OK\r\nContent-Type: text/html; charset=utf-8\r\n" \
+                     "Transfer-Encoding: chunked\r\nSet-Cookie: a=1\r\nSet-Cookie: b=2\r\n\r\n"
+        old = Response()
+        old.parse_response(raw_header, rawbody=b"body")
+        new = Response()
+        new.parse_curl_response(raw_header, b"body")
+        self.assertEqual((old.protocol, old.code, old.get_headers(), old.get_content()),
+                         (new.protocol, new.code, new.get_headers(), new.get_content()))
+
+
+if __name__ == '__main__':
+    unittest.main()
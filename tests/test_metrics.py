@@ -0,0 +1,117 @@
+import unittest
+from io import BytesIO
+from unittest import mock
+from wenum.externals.reqresp import Response
+from wenum.fuzzobjects import FuzzResult
+from wenum.fuzzrequest import FuzzRequest
+from wenum.helpers.metrics import ContentMetrics, ContentMetricsAccumulator, StreamingBody, compute_content_metrics
+
+
+class ContentMetricsAccumulatorTest(unittest.TestCase):
+    BODY = "Grüße aus  Stuttgart\n\n<html>\t<body> one two\r\nthree ünïcödé words €\n".encode("utf-8") * 50
+
+    def _accumulate(self, body: bytes, chunk_size: int, encoding: str = "utf-8") -> ContentMetrics:
+        accumulator = ContentMetricsAccumulator(encoding)
+        for i in range(0, len(body), chunk_size):
+            accumulator.update(body[i:i + chunk_size])
+        return accumulator.finish()
+
+    def test_matches_full_computation(self):
+        expected = compute_content_metrics(self.BODY.decode("utf-8"))
+        # Chunk sizes splitting words, whitespace runs and multibyte characters
+        for chunk_size in (1, 2, 3, 7, 64, len(self.BODY)):
+            self.assertEqual(self._accumulate(self.BODY, chunk_size), expected, msg=f"chunk size {chunk_size}")
+
+    def test_invalid_bytes(self):
+        body = b"abc \xff\xfe def\n\xc3" * 10
+        expected = compute_content_metrics(body.decode("utf-8", errors="replace"))
+        for chunk_size in (1, 5, len(body)):
+            self.assertEqual(self._accumulate(body, chunk_size), expected)
+
+    def test_other_encoding(self):
+        body = "Grüße\n".encode("iso-8859-1")
+        expected = compute_content_metrics(body.decode("iso-8859-1"))
+        self.assertEqual(self._accumulate(body, 1, "iso-8859-1"), expected)
+
+
+class StreamingBodyTest(unittest.TestCase):
+    def _stream(self, raw_header: bytes, body: bytes, keep_bytes=None, decoded=False) -> StreamingBody:
+        header_buffer = BytesIO(raw_header)
+        header_buffer.seek(0, 2)
+        streaming_body = StreamingBody(header_buffer, keep_bytes, decoded)
+        for i in range(0, len(body), 10):
+            streaming_body.write(body[i:i + 10])
+        return streaming_body
+
+    def test_keep_bytes(self):
+        body = b"word " * 1000
+        streaming_body = self._stream(b"HTTP/1.1 200 OK\r\nContent-Type: text/plain; charset=utf-8\r\n\r\n", body,
+                                      keep_bytes=1024)
+        self.assertEqual(streaming_body.getvalue(), body[:1024])
+        self.assertTrue(streaming_body.truncated)
+        self.assertEqual(streaming_body.content_metrics(), compute_content_metrics(body.decode()))
+
+    def test_charset_of_last_header_block(self):
+        body = "Grüße".encode("iso-8859-1")
+        streaming_body = self._stream(b"HTTP/1.1 100 Continue\r\n\r\nHTTP/1.1 200 OK\r\n"
+                                      b"Content-Type: text/html; charset=iso-8859-1\r\n\r\n", body)
+        self.assertEqual(streaming_body.content_metrics().chars, 5)
+
+    def test_compressed_body_is_kept(self):
+        streaming_body = self._stream(b"HTTP/1.1 200 OK\r\nContent-Encoding: gzip\r\n\r\n", b"\x1f\x8b" * 100,
+                                      keep_bytes=10)
+        self.assertEqual(len(streaming_body.getvalue()), 200)
+        self.assertIsNone(streaming_body.content_metrics())
+
+    def test_body_decoded_by_curl(self):
+        body = b"word " * 100
+        streaming_body = self._stream(b"HTTP/1.1 200 OK\r\nContent-Encoding: gzip\r\n\r\n", body, keep_bytes=10,
+                                      decoded=True)
+        self.assertEqual(streaming_body.getvalue(), body[:10])
+        self.assertEqual(streaming_body.content_metrics(), compute_content_metrics(body.decode()))
+
+
+class ComputeContentMetricsTest(unittest.TestCase):
+    def test_words(self):
+        self.assertEqual(compute_content_metrics("  one\ttwo\u3000three\n\nfour ").words, 4)
+        self.assertEqual(compute_content_metrics("").words, 0)
+
+
+class FuzzResultMetricsTest(unittest.TestCase):
+    def _respond(self, fuzz_request: FuzzRequest, body: bytes):
+        response = Response()
+        response.parse_curl_response("HTTP/1.1 200 OK\r\n\r\n", body)
+        fuzz_request._request.response = response
+
+    def test_lazy(self):
+        fuzz_request = FuzzRequest()
+        fuzz_request.url = "http://example.com/"
+        self._respond(fuzz_request, b"one two\nthree")
+        with mock.patch("wenum.fuzzrequest.compute_content_metrics", wraps=compute_content_metrics) as compute:
+            fuzz_result = FuzzResult(history=fuzz_request)
+            compute.assert_not_called()
+            self.assertEqual((fuzz_result.chars, fuzz_result.lines, fuzz_result.words), (13, 1, 3))
+            self.assertEqual(fuzz_result.md5, compute_content_metrics("one two\nthree").md5)
+            self.assertEqual(compute.call_count, 1)
+
+    def test_update(self):
+        fuzz_request = FuzzRequest()
+        fuzz_request.url = "http://example.com/"
+        self._respond(fuzz_request, b"one two")
+        fuzz_result = FuzzResult(history=fuzz_request)
+        self.assertEqual(fuzz_result.words, 2)
+
+        self._respond(fuzz_request, b"")
+        self.assertEqual(fuzz_result.words, 2)
+        fuzz_result.update()
+        self.assertEqual((fuzz_result.words, fuzz_result.md5), (0, ""))
+
+    def test_set(self):
+        fuzz_result = FuzzResult(history=FuzzRequest())
+        fuzz_result.lines = 4
+        fuzz_result.words = 12
+        self.assertEqual((fuzz_result.chars, fuzz_result.lines, fuzz_result.words), (0, 4, 12))
+
+
+if __name__ == '__main__':
+    unittest.main()
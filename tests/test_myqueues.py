@@ -0,0 +1,63 @@
+import unittest
+from wenum.fuzzobjects import FuzzItem, FuzzType
+from wenum.myqueues import AgingPriorityQueue, FuzzPriorityQueue
+
+
+def make_item(priority: int, name: str) -> FuzzItem:
+    item = FuzzItem(FuzzType.RESULT)
+    item.priority = priority
+    item.name = name
+    return item
+
+
+class AgingPriorityQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.queue = AgingPriorityQueue(aging=2, clock=lambda: self.now)
+
+    def get_names(self) -> list[str]:
+        names = []
+        while not self.queue.empty():
+            names.append(self.queue.get().name)
+            self.queue.task_done()
+        return names
+
+    def test_priority(self):
+        self.queue.put(make_item(20, "second seed"))
+        self.queue.put(make_item(10, "first seed"))
+        self.queue.put(make_item(10, "first seed again"))
+        self.assertEqual(self.get_names(), ["first seed", "first seed again", "second seed"])
+
+    def test_aging(self):
+        self.queue.put(make_item(20, "old"))
+        self.now += 4
+        self.queue.put(make_item(10, "young"))
+        self.now += 2
+        self.queue.put(make_item(10, "new"))
+        self.assertEqual(self.get_names(), ["young", "old", "new"])
+
+    def test_maxsize(self):
+        queue = AgingPriorityQueue(maxsize=1)
+        queue.put(make_item(10, "first"))
+        self.assertTrue(queue.full())
+
+
+class FuzzPriorityQueueTest(unittest.TestCase):
+    def test_get_waiting(self):
+        queue = FuzzPriorityQueue()
+        for priority, name in ((10, "first"), (10, "second"), (10, "third"), (30, "last")):
+            queue.put(make_item(priority, name))
+        end_seed = FuzzItem(FuzzType.ENDSEED)
+        end_seed.priority = 20
+        queue.put(end_seed)
+
+        self.assertEqual([item.name for item in queue.get_waiting(FuzzType.RESULT, 2)], ["first", "second"])
+        # Results behind an item of another type stay in the queue
+        self.assertEqual([item.name for item in queue.get_waiting(FuzzType.RESULT, 10)], ["third"])
+        self.assertEqual(queue.get_waiting(FuzzType.RESULT, 10), [])
+        self.assertIs(queue.get(), end_seed)
+        self.assertEqual(queue.qsize(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from wenum.helpers.proxies import ProxyBalancer
+
+
+class ProxyBalancerTest(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.random = 0.0
+        self.balancer = ProxyBalancer(["socks5://a:1080", "socks5://b:1080"], max_errors=2, eject_time=10,
+                                      clock=lambda: self.now, rand=lambda: self.random)
+
+    def test_weighted_by_latency(self):
+        self.balancer.record_success("socks5://a:1080", 0.1)
+        self.balancer.record_success("socks5://b:1080", 0.3)
+        # a has three times the throughput of b, so it gets 75% of the requests
+        self.random = 0.74
+        self.assertEqual(self.balancer.choose(), "socks5://a:1080")
+        self.random = 0.76
+        self.assertEqual(self.balancer.choose(), "socks5://b:1080")
+
+    def test_ejection_and_probe(self):
+        self.balancer.record_error("socks5://a:1080", 7)
+        self.assertEqual(self.balancer.available(), 2)
+        self.balancer.record_error("socks5://a:1080", 7)
+        self.assertEqual(self.balancer.available(), 1)
+        for self.random in (0, 0.5, 0.99):
+            self.assertEqual(self.balancer.choose(), "socks5://b:1080")
+
+        # After the ejection time, a single probe request goes through the proxy
+        self.now = 10
+        self.assertEqual(self.balancer.choose(), "socks5://a:1080")
+        self.assertEqual(self.balancer.choose(), "socks5://b:1080")
+
+        # The failing probe doubles the ejection time
+        self.balancer.record_error("socks5://a:1080", 28)
+        self.now = 29
+        self.assertEqual(self.balancer.choose(), "socks5://b:1080")
+        self.now = 30
+        self.assertEqual(self.balancer.choose(), "socks5://a:1080")
+        self.balancer.record_success("socks5://a:1080", 0.2)
+        self.assertEqual(self.balancer.available(), 2)
+
+    def test_target_errors(self):
+        # Errors the target is responsible for do not count against the proxy
+        for _ in range(5):
+            self.balancer.record_error("socks5://a:1080", 52)
+        self.assertEqual(self.balancer.available(), 2)
+
+    def test_all_ejected(self):
+        for proxy in ["socks5://b:1080", "socks5://a:1080"]:
+            self.balancer.record_error(proxy, 5)
+            self.balancer.record_error(proxy, 5)
+            self.now += 1
+        self.assertEqual(self.balancer.available(), 0)
+        self.assertEqual(self.balancer.choose(), "socks5://b:1080")
+
+
+if __name__ == '__main__':
+    unittest.main()
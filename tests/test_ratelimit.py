@@ -0,0 +1,93 @@
+import unittest
+from wenum.helpers.ratelimit import TokenBucket, RateLimiter
+
+
+class FakeClock:
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class TokenBucketTest(unittest.TestCase):
+    def test_rate(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, burst=1, clock=clock)
+
+        self.assertTrue(bucket.try_acquire())
+        self.assertFalse(bucket.try_acquire())
+        self.assertAlmostEqual(bucket.delay(), 0.5)
+
+        clock.advance(0.25)
+        self.assertFalse(bucket.try_acquire())
+        self.assertAlmostEqual(bucket.delay(), 0.25)
+
+        clock.advance(0.25)
+        self.assertEqual(bucket.delay(), 0)
+        self.assertTrue(bucket.try_acquire())
+        self.assertFalse(bucket.try_acquire())
+
+    def test_fractional_rate(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=0.5, burst=1, clock=clock)
+
+        self.assertTrue(bucket.try_acquire())
+        clock.advance(1.9)
+        self.assertFalse(bucket.try_acquire())
+        clock.advance(0.1)
+        self.assertTrue(bucket.try_acquire())
+
+    def test_burst(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1, burst=3, clock=clock)
+
+        for _ in range(3):
+            self.assertTrue(bucket.try_acquire())
+        self.assertFalse(bucket.try_acquire())
+
+        # Idling longer than needed does not allow for more than the burst size
+        clock.advance(100)
+        for _ in range(3):
+            self.assertTrue(bucket.try_acquire())
+        self.assertFalse(bucket.try_acquire())
+
+    def test_sustained_rate(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, burst=1, clock=clock)
+
+        sent = 0
+        for _ in range(1000):
+            if bucket.try_acquire():
+                sent += 1
+            clock.advance(0.01)
+        # One request every 0.1 seconds, starting with the initial token at 0
+        self.assertEqual(sent, 100)
+
+
+class RateLimiterTest(unittest.TestCase):
+    def test_global(self):
+        clock = FakeClock()
+        limiter = RateLimiter(rate=1, clock=clock)
+
+        self.assertTrue(limiter.try_acquire("a.example.com"))
+        self.assertFalse(limiter.try_acquire("b.example.com"))
+        clock.advance(1)
+        self.assertTrue(limiter.try_acquire("b.example.com"))
+
+    def test_per_key(self):
+        clock = FakeClock()
+        limiter = RateLimiter(rate=1, per_key=True, clock=clock)
+
+        self.assertTrue(limiter.try_acquire("a.example.com"))
+        self.assertTrue(limiter.try_acquire("b.example.com"))
+        self.assertFalse(limiter.try_acquire("a.example.com"))
+        self.assertAlmostEqual(limiter.delay("a.example.com"), 1)
+        self.assertEqual(limiter.delay("c.example.com"), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
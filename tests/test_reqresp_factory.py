@@ -0,0 +1,46 @@
+import unittest
+import pycurl
+from wenum.factories.reqresp_factory import ReqRespRequestFactory
+from wenum.fuzzrequest import FuzzRequest
+from wenum.httppool import HttpPool
+
+
+def make_request(method: str, data: str = None) -> FuzzRequest:
+    fuzz_request = FuzzRequest()
+    fuzz_request.url = "http://127.0.0.1/FUZZ"
+    fuzz_request.method = method
+    if data:
+        fuzz_request.params.post = data
+    return fuzz_request
+
+
+class HandlePreparationTest(unittest.TestCase):
+    def setUp(self):
+        self.curl_h = pycurl.Curl()
+
+    def tearDown(self):
+        self.curl_h.close()
+
+    def test_applied_options(self):
+        ReqRespRequestFactory.to_http_object(make_request("GET"), self.curl_h)
+        HttpPool.apply_extra_options(self.curl_h, None, 40)
+        applied_options = self.curl_h.applied_options
+        self.assertTrue(applied_options["baseline"])
+        self.assertEqual(applied_options["method"], "GET")
+        self.assertEqual((applied_options["proxy"], applied_options["timeout"]), (None, 40))
+        headers = applied_options["headers"]
+
+        ReqRespRequestFactory.to_http_object(make_request("GET"), self.curl_h)
+        self.assertIs(self.curl_h.applied_options["headers"], headers)
+
+    def test_post_resets_method(self):
+        ReqRespRequestFactory.to_http_object(make_request("POST", "a=1"), self.curl_h)
+        # The method has to be set again for the next request, as the post data changed it
+        self.assertIsNone(self.curl_h.applied_options["method"])
+
+        ReqRespRequestFactory.to_http_object(make_request("GET"), self.curl_h)
+        self.assertEqual(self.curl_h.applied_options["method"], "GET")
+
+
+if __name__ == '__main__':
+    unittest.main()
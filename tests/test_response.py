@@ -0,0 +1,31 @@
+import unittest
+
+from wenum.externals.reqresp import Response
+from wenum.fuzzrequest import FuzzRequest
+
+BODY = "café lorem ipsum".encode("latin-1")
+
+
+class RawContentTest(unittest.TestCase):
+    def setUp(self):
+        self.fuzz_request = FuzzRequest()
+        self.fuzz_request.url = "http://example.com/"
+        response = Response()
+        response.parse_curl_response("HTTP/1.1 200 OK\r\nContent-Type: text/plain; charset=latin-1\r\n\r\n", BODY)
+        self.fuzz_request._request.response = response
+
+    def test_raw_content_bytes(self):
+        response = self.fuzz_request._request.response
+        self.assertEqual(self.fuzz_request.raw_content_bytes, BODY)
+        # The body has not been decoded for it
+        self.assertIsNone(response._Response__content)
+
+        self.assertEqual(self.fuzz_request.content, "café lorem ipsum")
+        self.assertEqual(self.fuzz_request.raw_content_bytes, BODY)
+
+    def test_without_response(self):
+        self.assertEqual(FuzzRequest().raw_content_bytes, b"")
+
+
+if __name__ == '__main__':
+    unittest.main()
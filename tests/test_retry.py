@@ -0,0 +1,55 @@
+import unittest
+from wenum.helpers.retry import RetryBudget, RetryScheduler, backoff_delay
+
+
+class RetrySchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.scheduler = RetryScheduler(clock=lambda: self.now)
+
+    def test_order(self):
+        self.scheduler.schedule("late", 2)
+        self.scheduler.schedule("early", 1)
+        self.scheduler.schedule("also early", 1)
+        self.assertIsNone(self.scheduler.pop_due())
+        self.assertEqual(self.scheduler.delay(), 1)
+
+        self.now = 1.5
+        self.assertEqual(self.scheduler.pop_due(), "early")
+        self.assertEqual(self.scheduler.pop_due(), "also early")
+        self.assertIsNone(self.scheduler.pop_due())
+        self.assertEqual(self.scheduler.delay(), 0.5)
+
+        self.now = 3
+        self.assertEqual(self.scheduler.delay(), 0)
+        self.assertEqual(self.scheduler.pop_due(), "late")
+        self.assertIsNone(self.scheduler.delay())
+        self.assertEqual(len(self.scheduler), 0)
+
+
+class BackoffTest(unittest.TestCase):
+    def test_exponential(self):
+        upper_bound = lambda low, high: high
+        self.assertEqual([backoff_delay(56, attempt, upper_bound) for attempt in range(1, 5)], [0.25, 0.5, 1, 2])
+        self.assertEqual(backoff_delay(35, 1, upper_bound), 1)
+        self.assertEqual(backoff_delay(35, 10, upper_bound), 30)
+        self.assertEqual(backoff_delay(1000, 2, upper_bound), 1)
+
+    def test_jitter(self):
+        for _ in range(100):
+            self.assertTrue(0 <= backoff_delay(52, 3) <= 1)
+
+
+class RetryBudgetTest(unittest.TestCase):
+    def test_budget(self):
+        budget = RetryBudget(percentage=10, min_retries=2)
+        self.assertTrue(budget.try_spend(0))
+        self.assertTrue(budget.try_spend(0))
+        self.assertFalse(budget.try_spend(0))
+        self.assertTrue(budget.try_spend(10))
+        self.assertFalse(budget.try_spend(10))
+        self.assertEqual((budget.spent, budget.exhausted), (3, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import re
+import unittest
+from unittest.mock import MagicMock, PropertyMock
+
+from wenum.filters.simplefilter import FuzzResSimpleFilter
+
+
+def make_result(code: int, lines: int = 1, words: int = 1, chars: int = 1, content: str = ""):
+    fuzz_result = MagicMock()
+    fuzz_result.code = code
+    fuzz_result.lines = lines
+    fuzz_result.words = words
+    fuzz_result.chars = chars
+    fuzz_result.history.content = content
+    return fuzz_result
+
+
+class HeadProbeFilterTest(unittest.TestCase):
+    def test_hide(self):
+        ffilter = FuzzResSimpleFilter()
+        ffilter.hide_identifier = True
+        ffilter.codes = [404]
+        ffilter.lines = [10]
+        self.assertTrue(ffilter.is_filtered_by_headers(404))
+        self.assertFalse(ffilter.is_filtered_by_headers(200))
+
+    def test_show(self):
+        ffilter = FuzzResSimpleFilter()
+        ffilter.show_identifier = True
+        ffilter.codes = [200]
+        self.assertTrue(ffilter.is_filtered_by_headers(404))
+        self.assertFalse(ffilter.is_filtered_by_headers(200))
+
+        # Whether the lines match is unknown without the body
+        ffilter.lines = [10]
+        self.assertFalse(ffilter.is_filtered_by_headers(404))
+
+    def test_size(self):
+        # The Content-Length of a HEAD response can't be compared with the characters of the body
+        for show in (True, False):
+            ffilter = FuzzResSimpleFilter()
+            ffilter.show_identifier = show
+            ffilter.hide_identifier = not show
+            ffilter.codes = [404]
+            ffilter.size = [335]
+            self.assertFalse(ffilter.is_filtered_by_headers(404))
+            self.assertFalse(ffilter.is_filtered_by_headers(200))
+
+    def test_regex_only(self):
+        ffilter = FuzzResSimpleFilter()
+        ffilter.hide_regex = True
+        self.assertFalse(ffilter.is_filtered_by_headers(404))
+
+
+class IsFilteredTest(unittest.TestCase):
+    def setUp(self):
+        self.results = [make_result(404), make_result(200, words=7), make_result(200, content="secret"),
+                        make_result(301, chars=335), make_result(200, lines=3)]
+
+    def test_hide(self):
+        ffilter = FuzzResSimpleFilter()
+        ffilter.hide_identifier = True
+        ffilter.codes = [404, 404]
+        ffilter.words = [7]
+        ffilter.size = [335]
+        self.assertEqual(ffilter.codes, frozenset([404]))
+        self.assertEqual([ffilter.is_filtered(result) for result in self.results], [True, True, False, True, False])
+
+    def test_show_and_regex(self):
+        ffilter = FuzzResSimpleFilter()
+        ffilter.show_identifier = True
+        ffilter.codes = [200]
+        ffilter.hide_regex = True
+        ffilter.regex = re.compile("secret")
+        self.assertEqual([ffilter.is_filtered(result) for result in self.results], [True, False, True, True, False])
+
+    def test_short_circuit(self):
+        ffilter = FuzzResSimpleFilter()
+        ffilter.hide_identifier = True
+        ffilter.codes = [404]
+        ffilter.show_regex = True
+        ffilter.regex = re.compile("secret")
+        fuzz_result = make_result(404)
+        content = PropertyMock(return_value="")
+        type(fuzz_result.history).content = content
+        words = PropertyMock(return_value=1)
+        type(fuzz_result).words = words
+        self.assertTrue(ffilter.is_filtered(fuzz_result))
+        # Neither the body nor the metrics without an identifier are looked at
+        content.assert_not_called()
+        words.assert_not_called()
+
+    def test_filter_many(self):
+        ffilter = FuzzResSimpleFilter()
+        ffilter.show_identifier = True
+        ffilter.codes = [200]
+        ffilter.size = [335]
+        ffilter.hide_regex = True
+        ffilter.regex = re.compile("secret")
+        expected = [ffilter.is_filtered(result) for result in self.results]
+        self.assertEqual(ffilter.filter_many(self.results), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+from unittest.mock import MagicMock
+
+from wenum.externals.reqresp import Response
+from wenum.fuzzrequest import FuzzRequest
+from wenum.helpers.simhash import hamming_distance, simhash
+from wenum.soft404 import PROBES_PER_DIRECTORY, DirectoryBaseline, Soft404Detector
+
+NOT_FOUND_PAGE = ("<html><head><title>Not Found</title></head><body><h1>Oops</h1><p>The page {} could not be found "
+                  "on this server. Please check the URL or go back to the <a href='/'>homepage</a>. Generated at "
+                  "{}</p></body></html>")
+LOGIN_PAGE = "<html><head><title>Login</title></head><body>Please sign in with your account credentials</body></html>"
+
+
+class FakeHttpPool:
+    def __init__(self):
+        self.enqueued = []
+
+    def enqueue(self, fuzz_result):
+        self.enqueued.append(fuzz_result)
+
+
+def make_result(content: str, code: int = 200, seed_url: str = "http://example.com/a/FUZZ"):
+    fuzz_result = MagicMock()
+    fuzz_result.exception = None
+    fuzz_result.seed_url = seed_url
+    fuzz_result.code = code
+    fuzz_result.history = FuzzRequest()
+    fuzz_result.history.url = seed_url.replace("FUZZ", "word")
+    response = Response()
+    response.parse_curl_response(f"HTTP/1.1 {code} OK\r\n\r\n", content.encode())
+    fuzz_result.history._request.response = response
+    return fuzz_result
+
+
+class SimhashTest(unittest.TestCase):
+    def test_similar(self):
+        first = simhash(NOT_FOUND_PAGE.format("/admin/backup", "12:00:01"))
+        second = simhash(NOT_FOUND_PAGE.format("/x", "13:22:59"))
+        self.assertLessEqual(hamming_distance(first, second), 12)
+        self.assertGreater(hamming_distance(first, simhash(LOGIN_PAGE)), 20)
+
+    def test_deterministic(self):
+        self.assertEqual(simhash(LOGIN_PAGE), simhash(LOGIN_PAGE))
+        self.assertEqual(simhash(""), 0)
+        self.assertEqual(simhash("a b a"), simhash("a a b"))
+
+
+class DirectoryBaselineTest(unittest.TestCase):
+    def test_tolerance(self):
+        baseline = DirectoryBaseline(2, [(200, 0b0000), (200, 0b0011), None])
+        self.assertEqual(baseline.tolerance, 4)
+        self.assertTrue(baseline.matches(200, 0b1111))
+        self.assertFalse(baseline.matches(200, 0b11111100))
+        self.assertFalse(baseline.matches(302, 0b0000))
+
+    def test_not_found(self):
+        baseline = DirectoryBaseline(2, [(404, 0), (404, 0), (404, 0)])
+        self.assertFalse(baseline.matches(404, 0))
+
+    def test_too_dynamic(self):
+        baseline = DirectoryBaseline(2, [(200, 0), (200, 2 ** 64 - 1)])
+        self.assertFalse(baseline.matches(200, 0))
+
+
+class Soft404DetectorTest(unittest.TestCase):
+    def setUp(self):
+        self.http_pool = FakeHttpPool()
+        self.detector = Soft404Detector(self.http_pool, 6)
+
+    def answer(self):
+        for index, probe in enumerate(self.http_pool.enqueued):
+            probe.probe_callback(make_result(NOT_FOUND_PAGE.format(probe.history.url, index)))
+        self.http_pool.enqueued = []
+
+    def test_calibration(self):
+        missing = make_result(NOT_FOUND_PAGE.format("/a/backup", "now"))
+        self.assertIsNone(self.detector.is_soft_404(missing))
+        self.assertIsNone(self.detector.is_soft_404(missing))
+        self.assertEqual(len(self.http_pool.enqueued), PROBES_PER_DIRECTORY)
+        self.assertEqual(len({probe.history.url for probe in self.http_pool.enqueued}), PROBES_PER_DIRECTORY)
+        self.assertTrue(all(probe.history.url.startswith("http://example.com/a/") and "FUZZ" not in
+                            probe.history.url for probe in self.http_pool.enqueued))
+        # Only the request is copied, without the response of the result
+        self.assertTrue(all(probe.history._request.response is None for probe in self.http_pool.enqueued))
+        self.assertEqual(missing.history.url, "http://example.com/a/word")
+
+        calls = []
+        self.detector.when_ready(missing, lambda: calls.append(True))
+        self.answer()
+        self.assertEqual(calls, [True])
+        self.assertTrue(self.detector.is_soft_404(missing))
+        self.assertFalse(self.detector.is_soft_404(make_result(LOGIN_PAGE)))
+
+        self.detector.when_ready(missing, lambda: calls.append(True))
+        self.assertEqual(len(calls), 2)
+
+    def test_per_directory(self):
+        self.detector.is_soft_404(make_result(""))
+        self.answer()
+        other = make_result(NOT_FOUND_PAGE.format("/b/backup", "now"), seed_url="http://example.com/b/FUZZ")
+        self.assertIsNone(self.detector.is_soft_404(other))
+        self.assertEqual(len(self.http_pool.enqueued), PROBES_PER_DIRECTORY)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+from wenum.helpers.timing import LatencyHistogram, TimingHistograms, phase_durations
+
+
+def make_timings(namelookup, connect, appconnect, pretransfer, starttransfer, total) -> dict[str, float]:
+    return {"namelookup": namelookup, "connect": connect, "appconnect": appconnect, "pretransfer": pretransfer,
+            "starttransfer": starttransfer, "total": total}
+
+
+class PhaseDurationsTest(unittest.TestCase):
+    def test_tls(self):
+        durations = phase_durations(make_timings(0.01, 0.03, 0.08, 0.085, 0.285, 0.3))
+        expected = {"namelookup": 0.01, "connect": 0.02, "appconnect": 0.05, "pretransfer": 0.005,
+                    "starttransfer": 0.2, "total": 0.3}
+        for name, duration in expected.items():
+            self.assertAlmostEqual(durations[name], duration)
+
+    def test_reused_connection(self):
+        # A reused connection skips the name lookup and the handshakes, which libcurl reports as 0
+        durations = phase_durations(make_timings(0, 0, 0, 0.001, 0.05, 0.06))
+        self.assertEqual((durations["connect"], durations["appconnect"]), (0, 0))
+        self.assertAlmostEqual(durations["pretransfer"], 0.001)
+        self.assertAlmostEqual(durations["starttransfer"], 0.049)
+
+
+class LatencyHistogramTest(unittest.TestCase):
+    def test_percentile(self):
+        histogram = LatencyHistogram()
+        for _ in range(90):
+            histogram.add(0.02)
+        for _ in range(10):
+            histogram.add(3)
+        self.assertEqual(histogram.percentile(50), 0.025)
+        self.assertEqual(histogram.percentile(95), 5)
+        self.assertAlmostEqual(histogram.mean, 0.318)
+
+        histogram.add(60)
+        self.assertIsNone(histogram.percentile(100))
+        self.assertEqual(histogram.to_dict()["buckets"][">10"], 1)
+
+    def test_phases(self):
+        histograms = TimingHistograms()
+        histograms.add(make_timings(0.01, 0.03, 0, 0.03, 0.1, 0.2))
+        self.assertEqual(histograms.count, 1)
+        self.assertEqual(histograms.phases["appconnect"].percentile(100), 0.001)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,316 @@
+import asyncio
+import base64
+import gzip
+import threading
+import time
+import types
+import unittest
+from wenum.asyncpool import AsyncHttpPool
+from wenum.fuzzobjects import FuzzResult
+from wenum.fuzzrequest import FuzzRequest
+from wenum.httppool import HttpPool
+from wenum.processpool import ProcessHttpPool
+from wenum.user_opts import Options
+
+FOUND_BODY = b"lorem ipsum dolor sit amet\n" * 100
+# Credentials of the proxy URL the stand-in server is used as a proxy with. Both have to be unquoted
+PROXY_CREDENTIALS = "user%40corp:pa%3Ass"
+PROXY_AUTHORIZATION = "Basic " + base64.b64encode(b"user@corp:pa:ss").decode()
+
+
+class AsyncStandInServer:
+    """
+    Local asyncio HTTP server the transports are tested against, running in its own thread. Counts the connections
+    it accepted, which shows whether the clients keep them alive
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.connections = 0
+        self.server = self.loop.run_until_complete(asyncio.start_server(self.handle, "127.0.0.1", 0))
+        self.url = f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.shutdown(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+    async def shutdown(self):
+        self.server.close()
+        handlers = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in handlers:
+            task.cancel()
+        await asyncio.gather(*handlers, return_exceptions=True)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break
+                request_line, *header_lines = head.decode().split("\r\n")
+                method, path, _ = request_line.split(" ")
+                headers = dict(line.split(": ", 1) for line in header_lines if line)
+                body = await reader.readexactly(int(headers.get("Content-Length", 0)))
+                if not await self.respond(writer, method, path, headers, body):
+                    break
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def respond(writer: asyncio.StreamWriter, method: str, path: str, headers: dict, body: bytes) -> bool:
+        """
+        Answer the request and return whether the connection stays open
+        """
+        if method == "CONNECT":
+            # Used as a proxy, the server opens the tunnel, but does not speak TLS through it
+            if headers.get("Proxy-Authorization") == PROXY_AUTHORIZATION:
+                writer.write(b"HTTP/1.1 200 Connection established\r\n\r\n")
+            else:
+                writer.write(b"HTTP/1.1 407 Proxy Authentication Required\r\nContent-Length: 0\r\n\r\n")
+            await writer.drain()
+            return False
+        elif path.startswith("http://"):
+            content = f"{path} {headers.get('Proxy-Authorization')}".encode()
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (len(content), content))
+        elif path == "/found":
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/plain\r\nContent-Length: %d\r\n\r\n" % len(FOUND_BODY))
+            if method != "HEAD":
+                writer.write(FOUND_BODY)
+        elif path == "/echo":
+            content = f"{method} {headers.get('X-Test')} {headers.get('Host')} ".encode() + body
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (len(content), content))
+        elif path == "/chunked":
+            writer.write(b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n")
+            for chunk in (b"first ", b"second ", b"third"):
+                writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            writer.write(b"0\r\n\r\n")
+        elif path == "/gzip":
+            content = gzip.compress(FOUND_BODY)
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Encoding: gzip\r\nContent-Length: %d\r\n\r\n%s" %
+                         (len(content), content))
+        elif path == "/close":
+            # Without a Content-Length, the body ends with the connection
+            writer.write(b"HTTP/1.1 200 OK\r\nConnection: close\r\n\r\nuntil the end")
+            await writer.drain()
+            return False
+        elif path == "/throttled":
+            writer.write(b"HTTP/1.1 429 Too Many Requests\r\nRetry-After: 1\r\nContent-Length: 0\r\n\r\n")
+        elif path == "/slow":
+            await asyncio.sleep(5)
+            return False
+        elif path == "/reset":
+            return False
+        else:
+            writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 9\r\n\r\nnot found")
+        await writer.drain()
+        return True
+
+
+def make_session(**options) -> types.SimpleNamespace:
+    session_options = Options()
+    session_options.threads = 4
+    session_options.request_timeout = 2
+    session_options.retries = 0
+    session_options.retry_budget = 20
+    for name, value in options.items():
+        setattr(session_options, name, value)
+    return types.SimpleNamespace(options=session_options, cache=None, compiled_simple_filter=None)
+
+
+class TransportTests:
+    """
+    Test cases every transport has to pass. Subclasses set the transport class
+    """
+    transport_class = None
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = AsyncStandInServer()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def start(self, **options):
+        self.transport = self.transport_class(make_session(**options))
+        self.transport.initialize()
+        self.addCleanup(self.stop)
+
+    def stop(self):
+        self.transport.thread_cancelled.clear()
+        self.transport.wakeup()
+        self.transport.thread_cancelled.wait()
+        self.transport.join_threads()
+
+    def fetch(self, *paths: str, method: str = "GET", data: str = None, headers: dict = None,
+              base_url: str = None) -> list[FuzzResult]:
+        """
+        Send requests to the paths and return the results in the order of the paths
+        """
+        for path in paths:
+            fuzz_request = FuzzRequest()
+            fuzz_request.url = (base_url or self.server.url) + path
+            fuzz_request.method = method
+            if data is not None:
+                fuzz_request.params.post = data
+            if headers:
+                fuzz_request.headers.request = headers
+            self.transport.enqueue(FuzzResult(history=fuzz_request))
+        results = []
+        while len(results) < len(paths):
+            fuzz_result, requeue = next(self.transport.iter_results())
+            self.assertFalse(requeue)
+            results.append(fuzz_result)
+        results.sort(key=lambda fuzz_result: paths.index(fuzz_result.history.urlparse.path))
+        return results
+
+    def test_response(self):
+        self.start()
+        found, missing = self.fetch("/found", "/missing")
+        self.assertEqual((found.code, found.history.content.encode()), (200, FOUND_BODY))
+        self.assertEqual(found.words, 500)
+        self.assertEqual((missing.code, missing.history.content), (404, "not found"))
+        self.assertEqual(set(found.history.timings), {"namelookup", "connect", "appconnect", "pretransfer",
+                                                       "starttransfer", "total"})
+        self.assertEqual(self.transport.job_stats()["Responses received"], 2)
+
+    def test_keep_alive(self):
+        self.start(threads=1)
+        connections = self.server.connections
+        self.fetch("/found", "/missing", "/found")
+        self.assertEqual(self.server.connections - connections, 1)
+        self.assertEqual(self.transport.job_stats()["Transfers reusing a connection"], 2)
+
+    def test_request(self):
+        self.start()
+        posted, = self.fetch("/echo", method="POST", data="a=1", headers={"X-Test": "value"})
+        self.assertEqual(posted.history.content, f"POST value {self.server.url[7:]} a=1")
+        head, = self.fetch("/found", method="HEAD")
+        self.assertEqual((head.code, head.history.content), (200, ""))
+
+    def test_framing(self):
+        self.start()
+        chunked, closed = self.fetch("/chunked", "/close")
+        self.assertEqual(chunked.history.content, "first second third")
+        self.assertEqual(closed.history.content, "until the end")
+
+    def test_compressed(self):
+        self.start(compressed=True)
+        compressed, = self.fetch("/gzip")
+        self.assertEqual(compressed.history.content.encode(), FOUND_BODY)
+
+    def test_body_limit(self):
+        self.start(body_limit=1)
+        found, = self.fetch("/found")
+        self.assertEqual(len(found.history.content), 1024)
+        self.assertEqual(found.chars, len(FOUND_BODY))
+
+    def test_errors(self):
+        self.start(request_timeout=1)
+        slow, reset = self.fetch("/slow", "/reset")
+        self.assertIn("error 28", str(slow.exception))
+        self.assertIn("error 52", str(reset.exception))
+
+    def test_retry(self):
+        self.start(retries=2)
+        reset, = self.fetch("/reset")
+        self.assertEqual(reset.history.retries, 2)
+
+    def test_circuit_breaker(self):
+        self.start(retries=1, circuit_breaker=True)
+        throttled, = self.fetch("/throttled")
+        self.assertEqual((throttled.code, throttled.history.retries), (429, 1))
+        self.assertEqual(self.transport.job_stats()["Circuit breaker trips"], 2)
+
+
+    def test_probe(self):
+        self.start()
+        fuzz_request = FuzzRequest()
+        fuzz_request.url = self.server.url + "/found"
+        probe = FuzzResult(history=fuzz_request)
+        probe.probe_callback = lambda fuzz_result: None
+        self.transport.enqueue(probe)
+        found, requeue = next(self.transport.iter_results())
+        self.assertEqual(found.code, 200)
+        # Probes do not count towards the requests the run is limited to
+        self.assertEqual(self.transport.queued_requests, 0)
+        self.assertEqual(self.transport.job_stats()["Probe requests enqueued"], 1)
+
+    def test_proxy(self):
+        proxy_address = self.server.url[7:]
+        self.start(proxy_list=[f"http://{PROXY_CREDENTIALS}@{proxy_address}"])
+        proxied, = self.fetch("/echo")
+        self.assertEqual(proxied.history.content, f"{self.server.url}/echo {PROXY_AUTHORIZATION}")
+
+        # The credentials are sent along with the CONNECT as well. The tunnel is opened, but the TLS handshake fails
+        tunneled, = self.fetch("/found", base_url=f"https://{proxy_address}")
+        self.assertIn("error 35", str(tunneled.exception))
+
+    def test_proxy_without_credentials(self):
+        self.start(proxy_list=[self.server.url])
+        tunneled, = self.fetch("/found", base_url=f"https://{self.server.url[7:]}")
+        self.assertIn("407", str(tunneled.exception))
+
+
+class HttpPoolTest(TransportTests, unittest.TestCase):
+    transport_class = HttpPool
+
+
+class AsyncHttpPoolTest(TransportTests, unittest.TestCase):
+    transport_class = AsyncHttpPool
+
+    def test_proxy_default_port(self):
+        # Like libcurl, the port of HTTP proxies defaults to 1080
+        self.start(proxy_list=["http://127.0.0.1"])
+        missing, = self.fetch("/found")
+        self.assertIn("port 1080", str(missing.exception))
+
+
+class ProcessHttpPoolTest(TransportTests, unittest.TestCase):
+    transport_class = ProcessHttpPool
+
+    def start(self, **options):
+        options.setdefault("processes", 2)
+        super().start(**options)
+
+    def test_keep_alive(self):
+        self.start(threads=1, processes=1)
+        connections = self.server.connections
+        self.fetch("/found", "/missing", "/found")
+        self.assertEqual(self.server.connections - connections, 1)
+
+    def test_unsendable_request(self):
+        self.start()
+        # curl only takes ASCII methods, so preparing the transfer fails in the worker
+        unsendable, = self.fetch("/echo", method="\u00c9CHO")
+        self.assertIn("Error preparing the request", str(unsendable.exception))
+        found, = self.fetch("/found")
+        self.assertEqual(found.code, 200)
+
+    def test_dead_worker(self):
+        self.start(retries=1)
+        fuzz_request = FuzzRequest()
+        fuzz_request.url = self.server.url + "/slow"
+        self.transport.enqueue(FuzzResult(history=fuzz_request))
+        while not self.transport.pending_jobs:
+            time.sleep(0.01)
+        (_, worker_index), = self.transport.pending_jobs.values()
+        self.transport.workers[worker_index].kill()
+
+        # The transfer is retried by the other worker, and fails again because the server is too slow
+        slow, requeue = next(self.transport.iter_results())
+        self.assertEqual(slow.history.retries, 1)
+        self.assertIn("error 28", str(slow.exception))
+        self.assertEqual(self.transport.dead_workers, {worker_index})
+        found, = self.fetch("/found")
+        self.assertEqual(found.code, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
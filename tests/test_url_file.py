@@ -0,0 +1,25 @@
+import os
+import tempfile
+import unittest
+from wenum.exception import FuzzExceptBadOptions
+from wenum.user_opts import Options
+
+
+class UrlFileTest(unittest.TestCase):
+    def read(self, content: str) -> list[str]:
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as url_file:
+            url_file.write(content)
+        self.addCleanup(os.remove, url_file.name)
+        return Options.read_url_file(url_file.name)
+
+    def test_read(self):
+        self.assertEqual(self.read("http://a.example\n\n# comment\nhttps://b.example/app/\nhttp://c.example/FUZZ.php\n"),
+                         ["http://a.example/FUZZ", "https://b.example/app/FUZZ", "http://c.example/FUZZ.php"])
+
+    def test_empty(self):
+        with self.assertRaises(FuzzExceptBadOptions):
+            self.read("# nothing\n")
+
+
+if __name__ == '__main__':
+    unittest.main()